@@ -1,24 +1,83 @@
 """Execute computations asnychronously on a background thread."""
 
+from . import io
 from .aliases import AsyncGeneratorContext, AsyncIteratorContext
+from .batch_callable import batch_call
+from .broadcast import (
+    SlowSubscriberPolicy,
+    Subscriber,
+    ThreadedAsyncBroadcast,
+    broadcast,
+)
+from .buffers import ThreadedAsyncBufferIterator, iterate_buffers
+from .caching import CallCache
 from .callable import call
-from .callback_iterator import CallbackThreadedAsyncIterator, iterate_callback
+from .callback_iterator import (
+    CallbackThreadedAsyncIterator,
+    OverflowPolicy,
+    iterate_callback,
+)
 from .callback_single import single_callback
+from .cancellation import CancellationToken, current_token
+from .combinators import merge, zip
+from .executors import (
+    Backend,
+    ThreadMode,
+    configure_pool,
+    configure_process_pool,
+    get_pool,
+    get_process_pool,
+    gil_enabled,
+    shutdown_pools,
+)
 from .generator import ThreadedAsyncGenerator, generate
 from .iterator import ThreadedAsyncIterator, iterate
+from .limits import ConcurrencyLimit
+from .mapping import ThreadedAsyncMap, map
+from .partitions import ThreadedAsyncPartitions, iterate_partitions
+from .pipeline import ThreadedAsyncPipeline, pipeline
 
 __version__ = "0.3.1"
 
 
 __all__ = (
     "AsyncGeneratorContext",
+    "Backend",
     "AsyncIteratorContext",
+    "CallCache",
     "CallbackThreadedAsyncIterator",
+    "CancellationToken",
+    "ConcurrencyLimit",
+    "OverflowPolicy",
+    "SlowSubscriberPolicy",
+    "Subscriber",
+    "ThreadedAsyncBroadcast",
+    "ThreadedAsyncBufferIterator",
     "ThreadedAsyncGenerator",
+    "ThreadMode",
     "ThreadedAsyncIterator",
+    "ThreadedAsyncMap",
+    "ThreadedAsyncPartitions",
+    "ThreadedAsyncPipeline",
+    "batch_call",
+    "broadcast",
     "call",
+    "configure_pool",
+    "configure_process_pool",
+    "current_token",
     "generate",
+    "get_pool",
+    "get_process_pool",
+    "gil_enabled",
+    "io",
     "iterate",
+    "iterate_buffers",
     "iterate_callback",
+    "iterate_partitions",
+    "map",
+    "merge",
+    "pipeline",
+    "shutdown_pools",
     "single_callback",
+    "zip",
 )
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncGenerator, AsyncIterator
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator, Iterable
 from contextlib import AbstractAsyncContextManager
-from typing import TypeVar
+from typing import Optional, TypeVar
 
 _YieldT = TypeVar("_YieldT", covariant=True)
 _SendT = TypeVar("_SendT")
+_T = TypeVar("_T")
 
 
 class AsyncIteratorContext(
@@ -15,9 +17,108 @@ class AsyncIteratorContext(
 ):
     """Interface for thread-safe use of an AsyncIterator via an AsyncContextManager."""
 
+    async def batches(
+        self, max_items: int, max_latency: Optional[float] = None
+    ) -> AsyncIterator[list[_YieldT]]:
+        """Iterates over the stream in lists of up to max_items items.
+
+        Args:
+            max_items: Maximum number of items per batch.
+            max_latency: Maximum seconds to wait for a batch to fill once its first item
+                has arrived. Defaults to None (wait for max_items or the end of the stream).
+
+        Yields:
+            Non-empty lists of items in stream order.
+        """
+        async for batch in _abatches(self, max_items, max_latency):
+            yield batch
+
 
 class AsyncGeneratorContext(
     AsyncGenerator[_YieldT, _SendT],
     AbstractAsyncContextManager[AsyncGenerator[_YieldT, _SendT]],
 ):
     """Interface for thread-safe use of an AsyncGenerator via an AsyncContextManager."""
+
+    async def batches(
+        self, max_items: int, max_latency: Optional[float] = None
+    ) -> AsyncIterator[list[_YieldT]]:
+        """Iterates over the generator in lists of up to max_items items.
+
+        Args:
+            max_items: Maximum number of items per batch.
+            max_latency: Maximum seconds to wait for a batch to fill once its first item
+                has arrived. Defaults to None (wait for max_items or the end of the stream).
+
+        Yields:
+            Non-empty lists of items in stream order.
+        """
+        async for batch in _abatches(self, max_items, max_latency):
+            yield batch
+
+    async def asend_many(
+        self, values: Iterable[_SendT], *, window: Optional[int] = None
+    ) -> list[_YieldT]:
+        """Sends each value to the generator in turn and collects the yielded items.
+
+        Args:
+            values: Values to send.
+            window: Maximum number of sends in flight at once. Defaults to None (no-limit).
+
+        Returns:
+            One item per value, fewer if the generator stops first.
+        """
+        if window is not None and window < 1:
+            raise ValueError("window must be at least 1")
+        items: list[_YieldT] = []
+        for value in values:
+            try:
+                items.append(await self.asend(value))
+            except StopAsyncIteration:
+                break
+        return items
+
+
+async def _abatches(
+    iterator: AsyncIterator[_T], max_items: int, max_latency: Optional[float]
+) -> AsyncIterator[list[_T]]:
+    """Batches any async iterator one __anext__ at a time.
+
+    A pending __anext__ is carried over to the next batch rather than cancelled when
+    max_latency expires, so no item is lost.
+    """
+    if max_items < 1:
+        raise ValueError("max_items must be at least 1")
+    loop = asyncio.get_running_loop()
+    pending: Optional[asyncio.Future[_T]] = None
+    try:
+        while True:
+            batch: list[_T] = []
+            error: Optional[Exception] = None
+            deadline: Optional[float] = None
+            while len(batch) < max_items:
+                if pending is None:
+                    pending = asyncio.ensure_future(iterator.__anext__())
+                timeout = None if deadline is None else max(0.0, deadline - loop.time())
+                done, _ = await asyncio.wait((pending,), timeout=timeout)
+                if not done:
+                    break
+                future, pending = pending, None
+                try:
+                    batch.append(future.result())
+                except StopAsyncIteration:
+                    if batch:
+                        yield batch
+                    return
+                except Exception as e:  # noqa: BLE001
+                    error = e
+                    break
+                if deadline is None and max_latency is not None:
+                    deadline = loop.time() + max_latency
+            if batch:
+                yield batch
+            if error is not None:
+                raise error
+    finally:
+        if pending is not None:
+            pending.cancel()
@@ -0,0 +1,217 @@
+"""Batching utilities."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import weakref
+from collections.abc import Coroutine, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Generic, Optional, TypeVar, Union, overload
+
+from athreading.executors import _executor_getter
+
+__all__ = ["batch_call"]
+
+_ArgT = TypeVar("_ArgT")
+_ResultT = TypeVar("_ResultT")
+
+
+@overload
+def batch_call(
+    fn: None = None,
+    *,
+    max_batch: int = 256,
+    max_wait: float = 0.002,
+    executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+) -> Callable[
+    [Callable[[list[_ArgT]], Sequence[_ResultT]]],
+    Callable[[_ArgT], Coroutine[None, None, _ResultT]],
+]:
+    ...
+
+
+@overload
+def batch_call(
+    fn: Callable[[list[_ArgT]], Sequence[_ResultT]],
+    *,
+    max_batch: int = 256,
+    max_wait: float = 0.002,
+    executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+) -> Callable[[_ArgT], Coroutine[None, None, _ResultT]]:
+    ...
+
+
+def batch_call(
+    fn: Optional[Callable[[list[_ArgT]], Sequence[_ResultT]]] = None,
+    *,
+    max_batch: int = 256,
+    max_wait: float = 0.002,
+    executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+) -> Union[
+    Callable[[_ArgT], Coroutine[None, None, _ResultT]],
+    Callable[
+        [Callable[[list[_ArgT]], Sequence[_ResultT]]],
+        Callable[[_ArgT], Coroutine[None, None, _ResultT]],
+    ],
+]:
+    """Decorates a thread-safe bulk function and exposes a single item asynchronous function
+    that coalesces concurrent calls into one bulk call on a worker thread.
+
+    Args:
+        fn: Synchronous function mapping a list of arguments to a sequence of results in the
+            same order. Defaults to None.
+        max_batch: Maximum number of arguments per bulk call. Defaults to 256.
+        max_wait: Maximum seconds the first call of a batch waits for more calls.
+            Defaults to 0.002.
+        executor: Defaults to asyncio default executor.
+        pool: Name of an isolated thread pool to use instead of executor, see
+            configure_pool. Defaults to None.
+
+    Returns:
+        Asynchronous function of a single argument.
+    """
+    if fn is None:
+        return _create_batch_call_decorator(
+            max_batch=max_batch, max_wait=max_wait, executor=executor, pool=pool
+        )
+    return _batch_call(
+        fn, max_batch=max_batch, max_wait=max_wait, executor=executor, pool=pool
+    )
+
+
+def _create_batch_call_decorator(
+    *,
+    max_batch: int,
+    max_wait: float,
+    executor: Optional[ThreadPoolExecutor],
+    pool: Optional[str],
+) -> Callable[
+    [Callable[[list[_ArgT]], Sequence[_ResultT]]],
+    Callable[[_ArgT], Coroutine[None, None, _ResultT]],
+]:
+    def decorator(
+        fn: Callable[[list[_ArgT]], Sequence[_ResultT]],
+    ) -> Callable[[_ArgT], Coroutine[None, None, _ResultT]]:
+        return _batch_call(
+            fn, max_batch=max_batch, max_wait=max_wait, executor=executor, pool=pool
+        )
+
+    return decorator
+
+
+def _batch_call(
+    fn: Callable[[list[_ArgT]], Sequence[_ResultT]],
+    *,
+    max_batch: int,
+    max_wait: float,
+    executor: Optional[ThreadPoolExecutor],
+    pool: Optional[str],
+) -> Callable[[_ArgT], Coroutine[None, None, _ResultT]]:
+    """Wraps a bulk callable to a single item Coroutine."""
+    if max_batch < 1:
+        raise ValueError("max_batch must be at least 1")
+    batcher = _Batcher(fn, max_batch, max_wait, _executor_getter(executor, pool))
+
+    @functools.wraps(fn)
+    async def wrapper(arg: _ArgT) -> _ResultT:
+        return await batcher.submit(arg)
+
+    return wrapper
+
+
+class _PendingBatch(Generic[_ArgT, _ResultT]):
+    def __init__(self) -> None:
+        self.args: list[_ArgT] = []
+        self.futures: list[asyncio.Future[_ResultT]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class _Batcher(Generic[_ArgT, _ResultT]):
+    """Collects calls made on each event loop into bulk calls."""
+
+    def __init__(
+        self,
+        fn: Callable[[list[_ArgT]], Sequence[_ResultT]],
+        max_batch: int,
+        max_wait: float,
+        get_executor: Callable[[], Optional[Executor]],
+    ):
+        self._fn = fn
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._get_executor = get_executor
+        self._pending: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, _PendingBatch[_ArgT, _ResultT]
+        ] = weakref.WeakKeyDictionary()
+
+    def submit(self, arg: _ArgT) -> asyncio.Future[_ResultT]:
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(loop)
+        if batch is None:
+            batch = self._pending[loop] = _PendingBatch()
+        future: asyncio.Future[_ResultT] = loop.create_future()
+        batch.args.append(arg)
+        batch.futures.append(future)
+        if len(batch.args) >= self._max_batch:
+            self._flush(loop)
+        elif batch.timer is None:
+            batch.timer = loop.call_later(self._max_wait, self._flush, loop)
+        return future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        batch = self._pending.pop(loop, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        # callers cancelled while waiting for the batch to fill are left out
+        live = [i for i, future in enumerate(batch.futures) if not future.done()]
+        if not live:
+            return
+        args = [batch.args[i] for i in live]
+        futures = [batch.futures[i] for i in live]
+        try:
+            bulk_future = loop.run_in_executor(self._get_executor(), self._fn, args)
+        except Exception as e:  # noqa: BLE001
+            _set_exception(futures, e)
+            return
+        bulk_future.add_done_callback(functools.partial(_resolve, futures))
+
+
+def _resolve(
+    futures: list[asyncio.Future[_ResultT]],
+    bulk_future: asyncio.Future[Sequence[_ResultT]],
+) -> None:
+    """Distributes the results of a bulk call to each caller."""
+    if bulk_future.cancelled():
+        for future in futures:
+            future.cancel()
+        return
+    error = bulk_future.exception()
+    if error is not None:
+        _set_exception(futures, error)
+        return
+    results = bulk_future.result()
+    if len(results) != len(futures):
+        _set_exception(
+            futures,
+            ValueError(
+                f"bulk call returned {len(results)} results for {len(futures)} arguments"
+            ),
+        )
+        return
+    for future, result in zip(futures, results):
+        if not future.done():
+            future.set_result(result)
+
+
+def _set_exception(
+    futures: list[asyncio.Future[_ResultT]], error: BaseException
+) -> None:
+    for future in futures:
+        if not future.done():
+            future.set_exception(error)
@@ -0,0 +1,273 @@
+"""Broadcast utilities."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Generic, Literal, Optional, TypeVar
+
+from athreading.executors import ThreadMode, _executor_getter
+from athreading.iterator import ThreadedAsyncIterator
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+__all__ = ["SlowSubscriberPolicy", "Subscriber", "ThreadedAsyncBroadcast", "broadcast"]
+
+_T = TypeVar("_T")
+
+SlowSubscriberPolicy = Literal["block", "drop", "disconnect"]
+
+_SLOW_SUBSCRIBER_POLICIES = ("block", "drop", "disconnect")
+
+
+def broadcast(
+    iterable: Iterable[_T],
+    subscribers: int,
+    *,
+    buffer_maxsize: int = 64,
+    slow: SlowSubscriberPolicy = "block",
+    executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    thread: ThreadMode = "pool",
+    exit_timeout: Optional[float] = None,
+) -> ThreadedAsyncBroadcast[_T]:
+    """Iterates a synchronous iterable once on a worker thread and exposes every item to
+    each of several asynchronous subscribers.
+
+    Entering the returned context starts the worker and returns one Subscriber per
+    subscriber. Items are kept once, without copies, in a buffer shared by the subscribers
+    until every subscriber has taken them. When a subscriber falls buffer_maxsize items
+    behind the fastest one, the slow policy applies: "block" makes faster subscribers wait
+    for it, "drop" skips it past the oldest items, and "disconnect" removes it so that its
+    next item raises RuntimeError.
+
+    Args:
+        iterable: Synchronous iterator or iterable.
+        subscribers: Number of subscribers.
+        buffer_maxsize: Maximum number of items a subscriber can fall behind the fastest
+            subscriber. Defaults to 64.
+        slow: What happens to a subscriber buffer_maxsize items behind. Defaults to "block".
+        executor: Defaults to None.
+        pool: Name of an isolated thread pool to use instead of executor, see
+            configure_pool. Defaults to None.
+        thread: "dedicated" runs the worker on a new daemon thread instead of an executor,
+            for long-lived feeds. Defaults to "pool".
+        exit_timeout: Maximum seconds exiting the context waits for the worker thread
+            before abandoning it with a RuntimeWarning. Without executor or pool, the
+            worker then runs on a daemon thread. Defaults to None (no-limit).
+
+    Returns:
+        Broadcast context.
+    """
+    if subscribers < 1:
+        raise ValueError("subscribers must be at least 1")
+    if buffer_maxsize < 1:
+        raise ValueError("buffer_maxsize must be at least 1")
+    if slow not in _SLOW_SUBSCRIBER_POLICIES:
+        raise ValueError(f"unknown slow subscriber policy {slow!r}")
+    return ThreadedAsyncBroadcast(
+        iterable,
+        subscribers,
+        buffer_maxsize=buffer_maxsize,
+        slow=slow,
+        executor=_executor_getter(executor, pool, thread, "broadcast")(),
+        exit_timeout=exit_timeout,
+    )
+
+
+class Subscriber(AsyncIterator[_T]):
+    """Cursor of one subscriber over the items of a ThreadedAsyncBroadcast."""
+
+    def __init__(self, feed: ThreadedAsyncBroadcast[_T]):
+        """Initializes a cursor at the start of a feed.
+
+        Args:
+            feed: Broadcast the subscriber takes items from.
+        """
+        self._feed = feed
+        self._cursor = 0
+        self.dropped = 0
+        """Number of items skipped by the "drop" policy."""
+        self.disconnected = False
+        """Whether the "disconnect" policy removed the subscriber."""
+        self.closed = False
+        """Whether the subscriber has been closed."""
+
+    async def __anext__(self) -> _T:
+        return await self._feed._next(self)
+
+    async def aclose(self) -> None:
+        """Unsubscribes, so that other subscribers no longer wait for this one."""
+        self._feed._unsubscribe(self)
+
+
+class ThreadedAsyncBroadcast(Generic[_T]):
+    """Runs a synchronous iterable on a worker thread once and exposes its items to several
+    subscribers through a shared buffer.
+    """
+
+    def __init__(
+        self,
+        iterable: Iterable[_T],
+        subscribers: int,
+        buffer_maxsize: int = 64,
+        slow: SlowSubscriberPolicy = "block",
+        executor: Optional[Executor] = None,
+        exit_timeout: Optional[float] = None,
+    ):
+        """Initilizes a ThreadedAsyncBroadcast from a synchronous iterable.
+
+        Args:
+            iterable: Synchronous iterator or iterable.
+            subscribers: Number of subscribers.
+            buffer_maxsize: Maximum number of items a subscriber can fall behind the
+                fastest subscriber. Defaults to 64.
+            slow: What happens to a subscriber buffer_maxsize items behind. Defaults to
+                "block".
+            executor: Shared thread pool instance. Defaults to ThreadPoolExecutor().
+            exit_timeout: Maximum seconds exiting the context waits for the worker thread
+                before abandoning it with a RuntimeWarning. Without executor, the worker
+                then runs on a daemon thread. Defaults to None (no-limit).
+        """
+        self._stream = ThreadedAsyncIterator(
+            iter(iterable),
+            buffer_maxsize=buffer_maxsize,
+            executor=executor,
+            exit_timeout=exit_timeout,
+        )
+        self._maxsize = buffer_maxsize
+        self._slow = slow
+        self._subscribers = tuple(Subscriber(self) for _ in range(subscribers))
+        self._active = set(self._subscribers)
+        # items from sequence number self._head on, kept until every subscriber took them
+        self._buffer: deque[_T] = deque()
+        self._head = 0
+        self._pulling = False
+        self._ended = False
+        self._error: Optional[BaseException] = None
+        self._waiters: list[asyncio.Future[None]] = []
+
+    async def __aenter__(self) -> tuple[Subscriber[_T], ...]:
+        await self._stream.__aenter__()
+        return self._subscribers
+
+    async def __aexit__(
+        self,
+        __exc_type: Optional[type[BaseException]],
+        __val: Optional[BaseException],
+        __tb: Optional[TracebackType],
+        /,
+    ) -> None:
+        for subscriber in self._subscribers:
+            subscriber.closed = True
+        self._active.clear()
+        self.__notify()
+        await self._stream.__aexit__(__exc_type, __val, __tb)
+
+    async def _next(self, subscriber: Subscriber[_T]) -> _T:
+        """Takes the next item of a subscriber, pulling from the worker when it is ahead."""
+        while True:
+            if subscriber.disconnected:
+                raise RuntimeError(
+                    f"subscriber fell {self._maxsize} items behind and was disconnected"
+                )
+            if subscriber.closed:
+                raise StopAsyncIteration
+            index = subscriber._cursor - self._head
+            if index < len(self._buffer):
+                item = self._buffer[index]
+                subscriber._cursor += 1
+                if index == 0:
+                    self.__trim()
+                return item
+            if self._ended:
+                if self._error is not None:
+                    raise self._error
+                raise StopAsyncIteration
+            if self._pulling or (
+                self._slow == "block" and len(self._buffer) >= self._maxsize
+            ):
+                await self.__wait()
+            else:
+                await self.__pull()
+                while len(self._buffer) > self._maxsize:
+                    self.__overflow()
+
+    def _unsubscribe(self, subscriber: Subscriber[_T]) -> None:
+        subscriber.closed = True
+        self._active.discard(subscriber)
+        self.__trim()
+
+    async def __pull(self) -> None:
+        """Moves at least one item from the worker into the buffer, and more while there is
+        room.
+        """
+        self._pulling = True
+        try:
+            try:
+                self._buffer.append(await self._stream.__anext__())
+            except StopAsyncIteration:
+                self._ended = True
+            except Exception as e:  # noqa: BLE001
+                self._error = e
+                self._ended = True
+            else:
+                channel = self._stream._channel
+                while len(self._buffer) < self._maxsize:
+                    try:
+                        self._buffer.append(channel.pop())
+                    except IndexError:
+                        break
+        finally:
+            self._pulling = False
+            self.__notify()
+
+    def __overflow(self) -> None:
+        """Drops the oldest item, applying the slow subscriber policy to the subscribers
+        that have not taken it.
+        """
+        self._buffer.popleft()
+        self._head += 1
+        for subscriber in list(self._active):
+            if subscriber._cursor < self._head:
+                if self._slow == "drop":
+                    subscriber._cursor = self._head
+                    subscriber.dropped += 1
+                else:
+                    subscriber.disconnected = True
+                    self._active.discard(subscriber)
+        self.__trim()
+
+    def __trim(self) -> None:
+        """Releases items every active subscriber has taken."""
+        if not self._buffer:
+            return
+        cursor = min(
+            (subscriber._cursor for subscriber in self._active),
+            default=self._head + len(self._buffer),
+        )
+        trimmed = False
+        while self._head < cursor and self._buffer:
+            self._buffer.popleft()
+            self._head += 1
+            trimmed = True
+        if trimmed:
+            self.__notify()
+
+    async def __wait(self) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def __notify(self) -> None:
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
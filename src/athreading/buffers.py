@@ -0,0 +1,364 @@
+"""Buffer iterator utilities."""
+
+from __future__ import annotations
+
+import functools
+import queue
+import sys
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, Protocol, Union
+
+from athreading.aliases import AsyncIteratorContext
+from athreading.executors import ThreadMode, _executor_getter
+from athreading.iterator import ThreadedAsyncIterator
+from athreading.limits import ConcurrencyLimit, _create_limit
+
+if sys.version_info >= (3, 12):
+    from typing import ParamSpec, overload, override
+else:  # pragma: not covered
+    from typing_extensions import ParamSpec, overload, override
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+_ParamsT = ParamSpec("_ParamsT")
+
+_DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+class SupportsReadinto(Protocol):
+    """Blocking reader filling a buffer, such as a binary file or socket file."""
+
+    def readinto(self, __buffer: bytearray) -> Optional[int]:
+        """Reads into buffer, returning the number of bytes read, or 0 at the end.
+
+        Non-blocking readers returning None while no data is available are not supported.
+        """
+
+
+@overload
+def iterate_buffers(
+    fn: None = None,
+    *,
+    buffer_size: int = _DEFAULT_BUFFER_SIZE,
+    pool_size: int = 4,
+    executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    thread: ThreadMode = "pool",
+    max_concurrency: Optional[int] = None,
+    exit_timeout: Optional[float] = None,
+) -> Callable[
+    [Callable[_ParamsT, SupportsReadinto]],
+    Callable[_ParamsT, AsyncIteratorContext[memoryview]],
+]:
+    ...
+
+
+@overload
+def iterate_buffers(
+    fn: Callable[_ParamsT, SupportsReadinto],
+    *,
+    buffer_size: int = _DEFAULT_BUFFER_SIZE,
+    pool_size: int = 4,
+    executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    thread: ThreadMode = "pool",
+    max_concurrency: Optional[int] = None,
+    exit_timeout: Optional[float] = None,
+) -> Callable[_ParamsT, AsyncIteratorContext[memoryview]]:
+    ...
+
+
+def iterate_buffers(
+    fn: Optional[Callable[_ParamsT, SupportsReadinto]] = None,
+    *,
+    buffer_size: int = _DEFAULT_BUFFER_SIZE,
+    pool_size: int = 4,
+    executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    thread: ThreadMode = "pool",
+    max_concurrency: Optional[int] = None,
+    exit_timeout: Optional[float] = None,
+) -> Union[
+    Callable[_ParamsT, AsyncIteratorContext[memoryview]],
+    Callable[
+        [Callable[_ParamsT, SupportsReadinto]],
+        Callable[_ParamsT, AsyncIteratorContext[memoryview]],
+    ],
+]:
+    """Decorates a function returning a blocking reader and exposes an AsyncIterator of
+    memoryviews read into a fixed pool of buffers.
+
+    The worker thread reads into buffers taken from the pool and yields a memoryview of the
+    bytes read. Each view is released and its buffer returned to the pool when the next
+    item or batch is requested, so views must be copied to be kept. Reading stops when the
+    pool is empty, which bounds memory use to pool_size * buffer_size bytes and puts
+    backpressure on the reader. The reader is closed when the stream ends.
+
+    Args:
+        fn: Function returning a reader with a blocking readinto method, a non-blocking
+            reader fails the stream with ValueError when it has no data. Defaults to None.
+        buffer_size: Size in bytes of each pooled buffer. Defaults to 65536.
+        pool_size: Number of pooled buffers, the worker reads ahead into all but the one
+            held by the consumer. Defaults to 4.
+        executor: Defaults to None.
+        pool: Name of an isolated thread pool to use instead of executor, see
+            configure_pool. Defaults to None.
+        thread: "dedicated" runs the worker on a new daemon thread named after fn instead of
+            an executor, for long-lived streams. Defaults to "pool".
+        max_concurrency: Maximum number of streams holding a worker thread at once, further
+            streams wait on the event loop when entered. Defaults to None (no-limit).
+        exit_timeout: Maximum seconds exiting the context waits for the worker thread
+            before abandoning it with a RuntimeWarning. Without executor or pool, the
+            worker then runs on a daemon thread. Defaults to None (no-limit).
+
+    Returns:
+        Decorated reader function with lazy argument evaluation.
+    """
+    if buffer_size < 1:
+        raise ValueError("buffer_size must be at least 1")
+    if pool_size < 1:
+        raise ValueError("pool_size must be at least 1")
+    return (
+        _create_iterate_buffers_decorator(
+            buffer_size=buffer_size,
+            pool_size=pool_size,
+            executor=executor,
+            pool=pool,
+            thread=thread,
+            max_concurrency=max_concurrency,
+            exit_timeout=exit_timeout,
+        )
+        if fn is None
+        else _create_iterate_buffers_wrapper(
+            fn,
+            buffer_size=buffer_size,
+            pool_size=pool_size,
+            executor=executor,
+            pool=pool,
+            thread=thread,
+            max_concurrency=max_concurrency,
+            exit_timeout=exit_timeout,
+        )
+    )
+
+
+def _create_iterate_buffers_wrapper(
+    fn: Callable[_ParamsT, SupportsReadinto],
+    *,
+    buffer_size: int,
+    pool_size: int,
+    executor: Optional[ThreadPoolExecutor],
+    pool: Optional[str],
+    thread: ThreadMode,
+    max_concurrency: Optional[int],
+    exit_timeout: Optional[float],
+) -> Callable[_ParamsT, AsyncIteratorContext[memoryview]]:
+    get_executor = _executor_getter(
+        executor, pool, thread, getattr(fn, "__name__", "dedicated")
+    )
+    limit = _create_limit(max_concurrency)
+
+    @functools.wraps(fn)
+    def wrapper(
+        *args: _ParamsT.args, **kwargs: _ParamsT.kwargs
+    ) -> AsyncIteratorContext[memoryview]:
+        return ThreadedAsyncBufferIterator(
+            fn(*args, **kwargs),
+            buffer_size=buffer_size,
+            pool_size=pool_size,
+            executor=get_executor(),
+            limit=limit,
+            exit_timeout=exit_timeout,
+        )
+
+    return wrapper
+
+
+def _create_iterate_buffers_decorator(
+    buffer_size: int,
+    pool_size: int,
+    executor: Optional[ThreadPoolExecutor],
+    pool: Optional[str],
+    thread: ThreadMode,
+    max_concurrency: Optional[int],
+    exit_timeout: Optional[float],
+) -> Callable[
+    [Callable[_ParamsT, SupportsReadinto]],
+    Callable[_ParamsT, AsyncIteratorContext[memoryview]],
+]:
+    def decorator(
+        fn: Callable[_ParamsT, SupportsReadinto],
+    ) -> Callable[_ParamsT, AsyncIteratorContext[memoryview]]:
+        return _create_iterate_buffers_wrapper(
+            fn,
+            buffer_size=buffer_size,
+            pool_size=pool_size,
+            executor=executor,
+            pool=pool,
+            thread=thread,
+            max_concurrency=max_concurrency,
+            exit_timeout=exit_timeout,
+        )
+
+    return decorator
+
+
+class _BufferPool:
+    """Free buffers, returned by the event loop and taken by the worker thread."""
+
+    def __init__(self, buffer_size: int, pool_size: int):
+        self._free: queue.SimpleQueue[Optional[bytearray]] = queue.SimpleQueue()
+        for _ in range(pool_size):
+            self._free.put(bytearray(buffer_size))
+
+    def take(self) -> Optional[bytearray]:
+        """Takes a free buffer, blocking until one is returned.
+
+        Returns:
+            The buffer, or None once the pool is closed.
+        """
+        return self._free.get()
+
+    def give(self, buffer: bytearray) -> None:
+        """Returns a buffer to the pool."""
+        self._free.put(buffer)
+
+    def close(self) -> None:
+        """Releases the worker thread from waiting for a buffer."""
+        self._free.put(None)
+
+
+class _BufferReader(Iterator[memoryview]):
+    """Iterator of views of pooled buffers filled by a reader."""
+
+    def __init__(self, reader: SupportsReadinto, buffers: _BufferPool):
+        self._reader = reader
+        self._buffers = buffers
+
+    def __next__(self) -> memoryview:
+        buffer = self._buffers.take()
+        if buffer is None:
+            raise StopIteration
+        try:
+            size = self._reader.readinto(buffer)
+        except BaseException:
+            self._buffers.give(buffer)
+            raise
+        if size is None:
+            self._buffers.give(buffer)
+            raise ValueError("readinto returned None, the reader must be blocking")
+        if not size:
+            self._buffers.give(buffer)
+            raise StopIteration
+        view = memoryview(buffer)
+        return view if size == len(buffer) else view[:size]
+
+    def close(self) -> None:
+        close: Optional[Callable[[], None]] = getattr(self._reader, "close", None)
+        if close is not None:
+            close()
+
+
+class ThreadedAsyncBufferIterator(ThreadedAsyncIterator[memoryview]):
+    """Reads into a fixed pool of buffers with an executor and exposes an
+    AsyncIteratorContext of memoryviews.
+    """
+
+    def __init__(
+        self,
+        reader: SupportsReadinto,
+        buffer_size: int = _DEFAULT_BUFFER_SIZE,
+        pool_size: int = 4,
+        executor: Optional[Executor] = None,
+        limit: Optional[ConcurrencyLimit] = None,
+        exit_timeout: Optional[float] = None,
+    ):
+        """Initializes a ThreadedAsyncBufferIterator from a blocking reader.
+
+        Args:
+            reader: Reader with a blocking readinto method, closed when the stream ends.
+            buffer_size: Size in bytes of each pooled buffer. Defaults to 65536.
+            pool_size: Number of pooled buffers. Defaults to 4.
+            executor: Shared thread pool instance. Defaults to ThreadPoolExecutor().
+            limit: Concurrency limit held from entering the context until the worker thread
+                is released. Defaults to None.
+            exit_timeout: Maximum seconds exiting the context waits for the worker thread
+                before abandoning it with a RuntimeWarning. Without executor, the worker
+                then runs on a daemon thread. Defaults to None (no-limit).
+        """
+        self._buffers = _BufferPool(buffer_size, pool_size)
+        self._source = _BufferReader(reader, self._buffers)
+        self._pool_size = pool_size
+        self._held: list[memoryview] = []
+        super().__init__(
+            self._source,
+            executor=executor,
+            limit=limit,
+            interrupt=self._buffers.close,
+            exit_timeout=exit_timeout,
+        )
+
+    @override
+    async def __aexit__(
+        self,
+        __exc_type: Optional[type[BaseException]],
+        __val: Optional[BaseException],
+        __tb: Optional[TracebackType],
+        /,
+    ) -> None:
+        self.__recycle()
+        try:
+            await super().__aexit__(__exc_type, __val, __tb)
+        finally:
+            if self._worker_future is not None and self._worker_future.done():
+                self._source.close()
+
+    @override
+    async def __anext__(self) -> memoryview:
+        self.__recycle()
+        view = await super().__anext__()
+        self._held.append(view)
+        return view
+
+    @override
+    async def batches(
+        self, max_items: int, max_latency: Optional[float] = None
+    ) -> AsyncIterator[list[memoryview]]:
+        """Iterates over the stream in lists of up to max_items views.
+
+        Views of a batch are released when the next batch is requested, and a batch never
+        holds more views than there are pooled buffers.
+
+        Args:
+            max_items: Maximum number of items per batch, capped at pool_size.
+            max_latency: Maximum seconds to wait for a batch to fill once its first item
+                has arrived. Defaults to None (wait for max_items or the end of the stream).
+
+        Yields:
+            Non-empty lists of items in stream order.
+        """
+        self.__recycle()
+        async for batch in super().batches(
+            min(max_items, self._pool_size), max_latency
+        ):
+            self._held.extend(batch)
+            yield batch
+            self.__recycle()
+
+    def __recycle(self) -> None:
+        """Releases the views handed to the consumer and returns their buffers."""
+        for view in self._held:
+            buffer = view.obj
+            assert isinstance(buffer, bytearray)
+            try:
+                view.release()
+                # resizing fails while views sliced from the released view still export it
+                buffer.append(0)
+            except BufferError:
+                buffer = bytearray(len(buffer))
+            else:
+                del buffer[-1]
+            self._buffers.give(buffer)
+        self._held.clear()
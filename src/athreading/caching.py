@@ -0,0 +1,162 @@
+"""Caching utilities."""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import dataclasses
+import functools
+import threading
+import time
+import weakref
+from collections.abc import Coroutine, Hashable, Mapping
+from typing import Callable, Optional
+
+__all__ = ["CallCache"]
+
+
+@dataclasses.dataclass(frozen=True)
+class _CacheEntry:
+    value: object
+    stored_at: float
+
+
+class CallCache:
+    """Bounded LRU cache of call results with optional expiry.
+
+    Concurrent awaits of a key that is not cached share a single executor call, and only
+    successful results are stored. A cache may be shared by several functions and event
+    loops, in which case they share its maxsize.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = 128,
+        ttl: Optional[float] = None,
+        stale_ttl: Optional[float] = None,
+    ):
+        """Initializes a CallCache.
+
+        Args:
+            maxsize: Maximum number of cached results, least recently used results are
+                evicted first. Defaults to 128, None is unbounded.
+            ttl: Seconds a result is fresh for. Defaults to None (never expires).
+            stale_ttl: Seconds after ttl during which an expired result is still returned
+                while a worker thread refreshes it. Defaults to None (no stale results).
+        """
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if stale_ttl is not None and (ttl is None or stale_ttl <= 0):
+            raise ValueError("stale_ttl must be positive and requires ttl")
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict[
+            Hashable, _CacheEntry
+        ] = collections.OrderedDict()
+        self._inflight: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[Hashable, asyncio.Task[object]]
+        ] = weakref.WeakKeyDictionary()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self) -> Optional[int]:
+        """Maximum number of cached results."""
+        return self._maxsize
+
+    @property
+    def hits(self) -> int:
+        """Number of calls answered from the cache, including stale results."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of calls not answered from the cache, including shared in-flight calls."""
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Removes every cached result and resets the hit and miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __lookup(self, key: Hashable) -> tuple[Optional[_CacheEntry], bool]:
+        """Finds a cached result.
+
+        Returns:
+            The entry or None on a miss, and whether the entry is stale.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.stored_at
+                if self._ttl is None or age < self._ttl:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry, False
+                if self._stale_ttl is not None and age < self._ttl + self._stale_ttl:
+                    self._hits += 1
+                    return entry, True
+                del self._entries[key]
+            self._misses += 1
+            return None, False
+
+    def __store(self, key: Hashable, value: object) -> None:
+        with self._lock:
+            self._entries[key] = _CacheEntry(value, time.monotonic())
+            self._entries.move_to_end(key)
+            if self._maxsize is not None and len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def __start(
+        self, key: Hashable, fetch: Callable[[], Coroutine[None, None, object]]
+    ) -> asyncio.Task[object]:
+        """Starts fetch for key unless a fetch is already in flight on this event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            inflight = self._inflight.get(loop)
+            if inflight is None:
+                inflight = self._inflight[loop] = {}
+        task = inflight.get(key)
+        if task is None:
+            task = inflight[key] = loop.create_task(fetch())
+            task.add_done_callback(functools.partial(self.__complete, inflight, key))
+        return task
+
+    def __complete(
+        self,
+        inflight: dict[Hashable, asyncio.Task[object]],
+        key: Hashable,
+        task: asyncio.Task[object],
+    ) -> None:
+        del inflight[key]
+        # also retrieves the exception of background refreshes
+        if not task.cancelled() and task.exception() is None:
+            self.__store(key, task.result())
+
+    async def _aget(
+        self, key: Hashable, fetch: Callable[[], Coroutine[None, None, object]]
+    ) -> object:
+        """Gets the result for key, calling fetch on a miss or a stale hit."""
+        entry, stale = self.__lookup(key)
+        if entry is None:
+            # one cancelled caller must not cancel the call shared with other callers
+            return await asyncio.shield(self.__start(key, fetch))
+        if stale:
+            self.__start(key, fetch)
+        return entry.value
+
+
+def _make_key(
+    fn: object, args: tuple[object, ...], kwargs: Mapping[str, object]
+) -> Hashable:
+    return (fn, args, tuple(kwargs.items())) if kwargs else (fn, args)
@@ -7,7 +7,13 @@ import functools
 import sys
 from collections.abc import Coroutine
 from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, Optional, TypeVar, Union, overload
+from typing import Callable, Optional, TypeVar, Union, cast, overload
+
+from athreading.caching import CallCache, _make_key
+from athreading.cancellation import CancellationToken, _bind_token
+from athreading.executors import Backend, _executor_getter, get_process_pool
+from athreading.limits import _create_limit
+from athreading.processes import _mark_wrapper, _reference, _submit
 
 if sys.version_info >= (3, 10):
     from typing import ParamSpec
@@ -24,6 +30,11 @@ def call(
     fn: None = None,
     *,
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    cache: Optional[CallCache] = None,
+    cancellable: bool = False,
+    backend: Backend = "thread",
 ) -> Callable[
     [Callable[ParamsT, ReturnT]], Callable[ParamsT, Coroutine[None, None, ReturnT]]
 ]:
@@ -33,6 +44,13 @@ def call(
 @overload
 def call(
     fn: Callable[ParamsT, ReturnT],
+    *,
+    executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    cache: Optional[CallCache] = None,
+    cancellable: bool = False,
+    backend: Backend = "thread",
 ) -> Callable[ParamsT, Coroutine[None, None, ReturnT]]:
     ...
 
@@ -41,6 +59,11 @@ def call(
     fn: Optional[Callable[ParamsT, ReturnT]] = None,
     *,
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    cache: Optional[CallCache] = None,
+    cancellable: bool = False,
+    backend: Backend = "thread",
 ) -> Union[
     Callable[ParamsT, Coroutine[None, None, ReturnT]],
     Callable[
@@ -53,24 +76,65 @@ def call(
     Args:
         fn: thread-safe synchronous function. Defaults to None.
         executor: Defaults to asyncio default executor.
+        pool: Name of an isolated thread pool to use instead of executor, see
+            configure_pool. Defaults to None.
+        max_concurrency: Maximum number of calls holding a worker thread at once, further
+            calls wait on the event loop. Defaults to None (no-limit).
+        cache: Cache of results keyed by the hashable call arguments, concurrent calls with
+            equal arguments share one worker thread call. Defaults to None (no caching).
+        cancellable: Whether to give each call a CancellationToken, read with
+            current_token, that is cancelled when the awaiting coroutine is cancelled or
+            times out. Defaults to False.
+        backend: "process" runs fn in a pre-started process pool, see
+            configure_process_pool, for CPU-bound work. fn must be importable by name and
+            its arguments and result picklable, except large buffers which are passed through
+            shared memory. Defaults to "thread".
 
     Returns:
         Thread-safe asynchronous function.
     """
     if fn is None:
-        return _create_call_decorator(executor=executor)
-    return _call(fn, executor=executor)
+        return _create_call_decorator(
+            executor=executor,
+            pool=pool,
+            max_concurrency=max_concurrency,
+            cache=cache,
+            cancellable=cancellable,
+            backend=backend,
+        )
+    return _call(
+        fn,
+        executor=executor,
+        pool=pool,
+        max_concurrency=max_concurrency,
+        cache=cache,
+        cancellable=cancellable,
+        backend=backend,
+    )
 
 
 def _create_call_decorator(
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    cache: Optional[CallCache] = None,
+    cancellable: bool = False,
+    backend: Backend = "thread",
 ) -> Callable[
     [Callable[ParamsT, ReturnT]], Callable[ParamsT, Coroutine[None, None, ReturnT]]
 ]:
     def decorator(
         fn: Callable[ParamsT, ReturnT],
     ) -> Callable[ParamsT, Coroutine[None, None, ReturnT]]:
-        return _call(fn, executor=executor)
+        return _call(
+            fn,
+            executor=executor,
+            pool=pool,
+            max_concurrency=max_concurrency,
+            cache=cache,
+            cancellable=cancellable,
+            backend=backend,
+        )
 
     return decorator
 
@@ -79,13 +143,71 @@ def _call(
     fn: Callable[ParamsT, ReturnT],
     *,
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    cache: Optional[CallCache] = None,
+    cancellable: bool = False,
+    backend: Backend = "thread",
 ) -> Callable[ParamsT, Coroutine[None, None, ReturnT]]:
     """Wraps a callable to a Coroutine for calling using a ThreadPoolExecutor."""
+    get_executor = _executor_getter(executor, pool)
+    limit = _create_limit(max_concurrency)
+    process_fn: Optional[object] = None
+    if backend == "process":
+        if executor is not None or pool is not None or cancellable:
+            raise ValueError(
+                "executor, pool and cancellable are not used with backend='process'"
+            )
+        process_fn = _reference(fn)
+    elif backend != "thread":
+        raise ValueError(f"backend must be 'thread' or 'process', got {backend!r}")
+
+    def start(
+        loop: asyncio.AbstractEventLoop, func: Callable[[], ReturnT]
+    ) -> asyncio.Future[ReturnT]:
+        if process_fn is None:
+            return loop.run_in_executor(get_executor(), func)
+        # processes receive the arguments rather than the unpicklable partial of fn
+        assert isinstance(func, functools.partial)
+        future = _submit(get_process_pool(), process_fn, func.args, func.keywords)
+        return cast("asyncio.Future[ReturnT]", asyncio.wrap_future(future, loop=loop))
 
     @functools.wraps(fn)
     async def wrapper(*args: ParamsT.args, **kwargs: ParamsT.kwargs) -> ReturnT:
-        return await asyncio.get_running_loop().run_in_executor(
-            executor, functools.partial(fn, *args, **kwargs)
-        )
+        loop = asyncio.get_running_loop()
+        func: Callable[[], ReturnT] = functools.partial(fn, *args, **kwargs)
+        token: Optional[CancellationToken] = None
+        if cancellable:
+            token = CancellationToken()
+            func = _bind_token(func, token)
+        try:
+            if limit is None:
+                return await start(loop, func)
+            await limit.acquire()
+            try:
+                future = start(loop, func)
+            except BaseException:
+                limit.release()
+                raise
+            limit._release_when_done(future)
+            # a cancelled caller keeps its slot until the worker thread is released
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if token is not None:
+                token.cancel()
+            raise
+
+    if process_fn is not None:
+        _mark_wrapper(wrapper)
+    if cache is None:
+        return wrapper
 
-    return wrapper
+    @functools.wraps(fn)
+    async def cached_wrapper(*args: ParamsT.args, **kwargs: ParamsT.kwargs) -> ReturnT:
+        key = _make_key(fn, args, kwargs)
+        value = await cache._aget(key, lambda: wrapper(*args, **kwargs))
+        return cast(ReturnT, value)
+
+    if process_fn is not None:
+        _mark_wrapper(cached_wrapper)
+    return cached_wrapper
@@ -5,22 +5,24 @@ from __future__ import annotations
 import asyncio
 import functools
 import sys
-import threading
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor, ThreadPoolExecutor
 from contextlib import suppress
-from typing import TYPE_CHECKING, Optional, TypeVar, Union
+from typing import TYPE_CHECKING, Optional, TypeVar, Union, cast
 
 from athreading.aliases import AsyncIteratorContext
+from athreading.channels import OverflowPolicy, _Channel
+from athreading.executors import ThreadMode, _executor_getter
+from athreading.limits import ConcurrencyLimit, _create_limit
 
 if sys.version_info >= (3, 12):
-    from typing import Concatenate, ParamSpec, overload
+    from typing import Concatenate, Never, ParamSpec, overload, override
 else:  # pragma: not covered
-    from typing_extensions import Concatenate, ParamSpec, overload
+    from typing_extensions import Concatenate, Never, ParamSpec, overload, override
 
 if TYPE_CHECKING:
     from types import TracebackType
 
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable, Hashable
 
 _ParamsT = ParamSpec("_ParamsT")
 _YieldT_co = TypeVar("_YieldT_co", covariant=True)
@@ -33,7 +35,13 @@ CallableWithCallback = Callable[Concatenate[Callable[[_YieldT], None], _ParamsT]
 def iterate_callback(
     fn: None = None,
     *,
+    buffer_maxsize: Optional[int] = None,
+    overflow: OverflowPolicy = "block",
+    conflate_key: Optional[Callable[[Never], Hashable]] = None,
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    thread: ThreadMode = "pool",
+    max_concurrency: Optional[int] = None,
 ) -> Callable[
     [CallableWithCallback[_YieldT_co, _ParamsT]],
     Callable[_ParamsT, AsyncIteratorContext[_YieldT_co]],
@@ -45,7 +53,13 @@ def iterate_callback(
 def iterate_callback(
     fn: CallableWithCallback[_YieldT_co, _ParamsT],
     *,
+    buffer_maxsize: Optional[int] = None,
+    overflow: OverflowPolicy = "block",
+    conflate_key: Optional[Callable[[Never], Hashable]] = None,
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    thread: ThreadMode = "pool",
+    max_concurrency: Optional[int] = None,
 ) -> Callable[_ParamsT, AsyncIteratorContext[_YieldT_co]]:
     ...
 
@@ -53,7 +67,13 @@ def iterate_callback(
 def iterate_callback(
     fn: Optional[CallableWithCallback[_YieldT_co, _ParamsT]] = None,
     *,
+    buffer_maxsize: Optional[int] = None,
+    overflow: OverflowPolicy = "block",
+    conflate_key: Optional[Callable[[Never], Hashable]] = None,
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    thread: ThreadMode = "pool",
+    max_concurrency: Optional[int] = None,
 ) -> Union[
     Callable[_ParamsT, AsyncIteratorContext[_YieldT_co]],
     Callable[
@@ -67,29 +87,78 @@ def iterate_callback(
     Args:
         fn: Function accepting a callback.
         Defaults to None.
+        buffer_maxsize: Maximum number of items buffered before the overflow policy applies.
+            Defaults to None (no-limit).
+        overflow: What the callback does with a value while the buffer is full. "block"
+            blocks the producing thread and puts backpressure on the source, "drop_oldest"
+            evicts the oldest buffered value, "drop_newest" discards the new value and
+            "conflate" keeps only the latest value per conflate_key. Defaults to "block".
+        conflate_key: Key of values conflated by the "conflate" policy. Defaults to None
+            (keep only the latest value).
         executor: Shared thread pool instance. Defaults to None (new threadpool).
+        pool: Name of an isolated thread pool to use instead of executor, see
+            configure_pool. Defaults to None.
+        thread: "dedicated" runs the worker on a new daemon thread named after fn instead of
+            an executor, for long-lived streams. Defaults to "pool".
+        max_concurrency: Maximum number of streams holding a worker thread at once, further
+            streams wait on the event loop when entered. Defaults to None (no-limit).
 
     Returns:
         Decorated iterator function with lazy argument evaluation.
     """
     return (
-        _create_iterate_decorator(executor=executor)
+        _create_iterate_decorator(
+            buffer_maxsize=buffer_maxsize,
+            overflow=overflow,
+            conflate_key=conflate_key,
+            executor=executor,
+            pool=pool,
+            thread=thread,
+            max_concurrency=max_concurrency,
+        )
         if fn is None
-        else _create_iterate_wrapper(fn, executor=executor)
+        else _create_iterate_wrapper(
+            fn,
+            buffer_maxsize=buffer_maxsize,
+            overflow=overflow,
+            conflate_key=conflate_key,
+            executor=executor,
+            pool=pool,
+            thread=thread,
+            max_concurrency=max_concurrency,
+        )
     )
 
 
 def _create_iterate_wrapper(
     fn: CallableWithCallback[_YieldT_co, _ParamsT],
     *,
+    buffer_maxsize: Optional[int],
+    overflow: OverflowPolicy,
+    conflate_key: Optional[Callable[[Never], Hashable]],
     executor: Optional[ThreadPoolExecutor],
+    pool: Optional[str],
+    thread: ThreadMode,
+    max_concurrency: Optional[int],
 ) -> Callable[_ParamsT, AsyncIteratorContext[_YieldT_co]]:
+    get_executor = _executor_getter(
+        executor, pool, thread, getattr(fn, "__name__", "dedicated")
+    )
+    limit = _create_limit(max_concurrency)
+
     @functools.wraps(fn)
     def wrapper(
         *args: _ParamsT.args, **kwargs: _ParamsT.kwargs
     ) -> AsyncIteratorContext[_YieldT_co]:
         return CallbackThreadedAsyncIterator(
-            lambda callback: fn(callback, *args, **kwargs), executor=executor
+            lambda callback: fn(callback, *args, **kwargs),
+            executor=get_executor(),
+            buffer_maxsize=buffer_maxsize,
+            overflow=overflow,
+            conflate_key=cast(
+                "Optional[Callable[[_YieldT_co], Hashable]]", conflate_key
+            ),
+            limit=limit,
         )
 
     return wrapper
@@ -97,7 +166,13 @@ def _create_iterate_wrapper(
 
 def _create_iterate_decorator(
     *,
+    buffer_maxsize: Optional[int],
+    overflow: OverflowPolicy,
+    conflate_key: Optional[Callable[[Never], Hashable]],
     executor: Optional[ThreadPoolExecutor],
+    pool: Optional[str],
+    thread: ThreadMode,
+    max_concurrency: Optional[int],
 ) -> Callable[
     [CallableWithCallback[_YieldT_co, _ParamsT]],
     Callable[_ParamsT, AsyncIteratorContext[_YieldT_co]],
@@ -105,7 +180,16 @@ def _create_iterate_decorator(
     def decorator(
         fn: CallableWithCallback[_YieldT_co, _ParamsT],
     ) -> Callable[_ParamsT, AsyncIteratorContext[_YieldT_co]]:
-        return _create_iterate_wrapper(fn, executor=executor)
+        return _create_iterate_wrapper(
+            fn,
+            buffer_maxsize=buffer_maxsize,
+            overflow=overflow,
+            conflate_key=conflate_key,
+            executor=executor,
+            pool=pool,
+            thread=thread,
+            max_concurrency=max_concurrency,
+        )
 
     return decorator
 
@@ -116,27 +200,63 @@ class CallbackThreadedAsyncIterator(AsyncIteratorContext[_YieldT]):
     def __init__(
         self,
         runner: Callable[[Callable[[_YieldT], None]], None],
-        executor: Optional[ThreadPoolExecutor] = None,
+        executor: Optional[Executor] = None,
+        buffer_maxsize: Optional[int] = None,
+        overflow: OverflowPolicy = "block",
+        conflate_key: Optional[Callable[[_YieldT], Hashable]] = None,
+        limit: Optional[ConcurrencyLimit] = None,
     ):
         """Initializer.
 
         Args:
             runner: Function accepting a callback.
             executor: Shared thread pool instance. Defaults to None (new threadpool).
+            buffer_maxsize: Maximum number of items buffered before the overflow policy
+                applies. Defaults to None (no-limit).
+            overflow: What the callback does with a value while the buffer is full.
+                "block" blocks the producing thread, "drop_oldest" evicts the oldest
+                buffered value, "drop_newest" discards the new value and "conflate" keeps
+                only the latest value per conflate_key. Defaults to "block".
+            conflate_key: Key of values conflated by the "conflate" policy. Defaults to None
+                (keep only the latest value).
+            limit: Concurrency limit held from entering the context until the runner thread
+                is released. Defaults to None.
         """
-        self._yield_semaphore = asyncio.Semaphore(0)
-        self._done_event = threading.Event()
-        self._queue: asyncio.Queue[
-            tuple[_YieldT, None] | tuple[None, BaseException]
-        ] = asyncio.Queue()
+        # callbacks may fire from any thread, such as a library's own I/O threads
+        self._channel: _Channel[_YieldT] = _Channel(
+            buffer_maxsize, overflow, conflate_key, multi_producer=True
+        )
         self._runner = runner
         self._executor = executor
+        self._limit = limit
         self._stream_future: Optional[asyncio.Future[None]] = None
         self._loop: Optional[asyncio.AbstractEventLoop] = None
 
+    @property
+    def dropped(self) -> int:
+        """Number of values discarded by the overflow policy."""
+        return self._channel.dropped
+
     async def __aenter__(self) -> CallbackThreadedAsyncIterator[_YieldT]:
         self._loop = asyncio.get_running_loop()
-        self._stream_future = asyncio.create_task(self.__arun())
+        self._channel.open(self._loop)
+        if self._limit is None:
+            runner_future = self._loop.run_in_executor(
+                self._executor, self.__run_threadsafe
+            )
+        else:
+            await self._limit.acquire()
+            try:
+                runner_future = self._loop.run_in_executor(
+                    self._executor, self.__run_threadsafe
+                )
+            except BaseException:
+                self._limit.release()
+                raise
+            self._limit._release_when_done(runner_future)
+            # cancelling the stream keeps the slot until the runner thread is released
+            runner_future = asyncio.shield(runner_future)
+        self._stream_future = asyncio.create_task(self.__arun(runner_future))
         return self
 
     async def __aexit__(
@@ -147,60 +267,48 @@ class CallbackThreadedAsyncIterator(AsyncIteratorContext[_YieldT]):
         /,
     ) -> None:
         assert self._stream_future is not None
-        self._done_event.set()
-        self._yield_semaphore.release()
+        self._channel.close()
         if not self._stream_future.done():
             self._stream_future.cancel()
             with suppress(asyncio.CancelledError):
                 await self._stream_future
 
     async def __anext__(self) -> _YieldT:
-        await self._yield_semaphore.acquire()
-
-        if self._done_event.is_set() and self._queue.empty():
-            raise StopAsyncIteration
-
-        value_exc = await self._queue.get()
+        return await self._channel.next()
 
-        if value_exc[1] is not None:
-            raise value_exc[1]
-        return value_exc[0]
+    @override
+    async def batches(
+        self, max_items: int, max_latency: Optional[float] = None
+    ) -> AsyncIterator[list[_YieldT]]:
+        """Iterates over the stream in lists of up to max_items items, taking every
+        buffered item at once.
 
-    def __callback_threadsafe(self, value: _YieldT) -> None:
-        assert self._loop is not None
-
-        def put_value() -> None:
-            self._queue.put_nowait((value, None))
-            self._yield_semaphore.release()
-
-        self._loop.call_soon_threadsafe(put_value)
-
-    def __callback_threadsafe_with_error(self, exc: BaseException) -> None:
-        assert self._loop is not None
-
-        def put_error() -> None:
-            self._queue.put_nowait((None, exc))
-            self._yield_semaphore.release()
-
-        self._loop.call_soon_threadsafe(put_error)
+        Args:
+            max_items: Maximum number of items per batch.
+            max_latency: Maximum seconds to wait for a batch to fill once its first item
+                has arrived. Defaults to None (wait for max_items or the end of the stream).
 
-    async def __arun(self) -> None:
+        Yields:
+            Non-empty lists of items in stream order.
+        """
+        assert self._loop is not None, "Iteration started before entering context"
+        if max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        while True:
+            batch = await self._channel.batch(max_items, max_latency)
+            if not batch:
+                return
+            yield batch
+
+    def __run_threadsafe(self) -> None:
+        # values produced after the stream is exited are dropped by the closed channel
         try:
-            assert self._loop is not None
-
-            def runner_wrapper(cb: Callable[[_YieldT], None]) -> None:
-                try:
-                    self._runner(cb)
-                except BaseException as exc:  # noqa: BLE001
-                    # Push exceptions immediately into the queue for __anext__
-                    self.__callback_threadsafe_with_error(exc)
-                    # Optionally re-raise or exit
-                    # raise
-
-            await self._loop.run_in_executor(
-                self._executor, runner_wrapper, self.__callback_threadsafe
-            )
+            self._runner(self._channel.put)
+        except BaseException as exc:  # noqa: BLE001
+            self._channel.finish(exc)
 
+    async def __arun(self, runner_future: asyncio.Future[None]) -> None:
+        try:
+            await runner_future
         finally:
-            self._done_event.set()
-            self._yield_semaphore.release()
+            self._channel.finish()
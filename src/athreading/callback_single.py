@@ -6,9 +6,11 @@ import asyncio
 import functools
 import sys
 from collections.abc import Awaitable
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor, ThreadPoolExecutor
 from typing import Optional, TypeVar, Union
 
+from athreading.executors import _executor_getter
+
 if sys.version_info >= (3, 11):
     from typing import Concatenate, ParamSpec, overload
 else:  # pragma: not covered
@@ -26,7 +28,10 @@ CallableWithCallback = Callable[Concatenate[Callable[[_T_co], None], _ParamsT],
 
 @overload
 def single_callback(
-    fn: None = None, *, executor: Optional[ThreadPoolExecutor] = None
+    fn: None = None,
+    *,
+    executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
 ) -> Callable[
     [CallableWithCallback[_T_co, _ParamsT]], Callable[_ParamsT, Awaitable[_T_co]]
 ]:
@@ -38,6 +43,7 @@ def single_callback(
     fn: CallableWithCallback[_T_co, _ParamsT],
     *,
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
 ) -> Callable[_ParamsT, Awaitable[_T_co]]:
     ...
 
@@ -46,6 +52,7 @@ def single_callback(
     fn: Optional[CallableWithCallback[_T_co, _ParamsT]] = None,
     *,
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
 ) -> Union[
     Callable[_ParamsT, Awaitable[_T_co]],
     Callable[
@@ -58,14 +65,16 @@ def single_callback(
     Args:
         fn: Function accepting a callback. Defaults to None.
         executor: Defaults to None.
+        pool: Name of an isolated thread pool to use instead of executor, see
+            configure_pool. Defaults to None.
 
     Returns:
         Decorated iterator function with lazy argument evaluation.
     """
     return (
-        _create_callback_decorator(executor=executor)
+        _create_callback_decorator(executor=executor, pool=pool)
         if fn is None
-        else _create_callback_wrapper(fn, executor=executor)
+        else _create_callback_wrapper(fn, executor=executor, pool=pool)
     )
 
 
@@ -73,10 +82,13 @@ def _create_callback_wrapper(
     fn: CallableWithCallback[_T_co, _ParamsT],
     *,
     executor: Optional[ThreadPoolExecutor],
+    pool: Optional[str],
 ) -> Callable[_ParamsT, Awaitable[_T_co]]:
+    get_executor = _executor_getter(executor, pool)
+
     @functools.wraps(fn)
     def wrapper(*args: _ParamsT.args, **kwargs: _ParamsT.kwargs) -> Awaitable[_T_co]:
-        return await_callback(fn, executor=executor)(*args, **kwargs)
+        return await_callback(fn, executor=get_executor())(*args, **kwargs)
 
     return wrapper
 
@@ -84,13 +96,14 @@ def _create_callback_wrapper(
 def _create_callback_decorator(
     *,
     executor: Optional[ThreadPoolExecutor],
+    pool: Optional[str],
 ) -> Callable[
     [CallableWithCallback[_T_co, _ParamsT]], Callable[_ParamsT, Awaitable[_T_co]]
 ]:
     def decorator(
         fn: CallableWithCallback[_T_co, _ParamsT],
     ) -> Callable[_ParamsT, Awaitable[_T_co]]:
-        return _create_callback_wrapper(fn, executor=executor)
+        return _create_callback_wrapper(fn, executor=executor, pool=pool)
 
     return decorator
 
@@ -98,13 +111,16 @@ def _create_callback_decorator(
 def await_callback(
     fn: CallableWithCallback[_T, _ParamsT],
     *,
-    executor: Optional[ThreadPoolExecutor] = None,
+    executor: Optional[Executor] = None,
+    pool: Optional[str] = None,
 ) -> Callable[_ParamsT, Awaitable[_T]]:
     """Transform a function where the first argument is a callback into
     an async function, returning the callback's result as an awaitable.
 
-    If executor is provided, runs `fn` in that executor.
+    If executor is provided, runs `fn` in that executor, or if pool is provided, in that
+    named pool.
     """
+    get_executor = _executor_getter(executor, pool)
 
     async def wrapper(*args: _ParamsT.args, **kwargs: _ParamsT.kwargs) -> _T:
         loop = asyncio.get_running_loop()
@@ -117,7 +133,7 @@ def await_callback(
         def run() -> None:
             fn(callback, *args, **kwargs)
 
-        await loop.run_in_executor(executor, run)
+        await loop.run_in_executor(get_executor(), run)
         return await fut
 
     return wrapper
@@ -0,0 +1,75 @@
+"""Cancellation utilities."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextvars
+import functools
+import threading
+from typing import Callable, Optional, TypeVar
+
+__all__ = ["CancellationToken", "current_token"]
+
+_T = TypeVar("_T")
+
+
+class CancellationToken:
+    """Thread-safe flag set when the coroutine awaiting a worker thread is cancelled.
+
+    Python threads cannot be interrupted, so a long-running function should check the token
+    between steps and return early to free its worker thread.
+    """
+
+    def __init__(self) -> None:
+        """Initializes a CancellationToken that is not cancelled."""
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation has been requested."""
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Requests cancellation."""
+        self._event.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until cancellation is requested, for use in place of time.sleep.
+
+        Args:
+            timeout: Maximum seconds to block. Defaults to None (no timeout).
+
+        Returns:
+            Whether cancellation has been requested.
+        """
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self) -> None:
+        """Raises if cancellation has been requested.
+
+        Raises:
+            concurrent.futures.CancelledError: If cancellation has been requested.
+        """
+        if self._event.is_set():
+            raise concurrent.futures.CancelledError()
+
+
+_current_token: contextvars.ContextVar[
+    Optional[CancellationToken]
+] = contextvars.ContextVar("athreading_current_token", default=None)
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Gets the cancellation token of the cancellable call running on this thread.
+
+    Returns:
+        The token, or None outside of a call decorated with cancellable=True.
+    """
+    return _current_token.get()
+
+
+def _bind_token(func: Callable[[], _T], token: CancellationToken) -> Callable[[], _T]:
+    """Binds func to run in a copy of the current context where token is current."""
+    context = contextvars.copy_context()
+    context.run(_current_token.set, token)
+    return functools.partial(context.run, func)
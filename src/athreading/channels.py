@@ -0,0 +1,432 @@
+"""Channel utilities."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import deque
+from collections.abc import Callable, Hashable
+from typing import Generic, Literal, Optional, TypeVar, Union
+
+from athreading.executors import gil_enabled
+
+_T = TypeVar("_T")
+
+OverflowPolicy = Literal["block", "drop_oldest", "drop_newest", "conflate"]
+
+_OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_newest", "conflate")
+
+
+def _single_key(value: object) -> None:
+    return None
+
+
+class _ConflatingBuffer(Generic[_T]):
+    """Insertion ordered buffer keeping only the latest value per key."""
+
+    def __init__(self, key: Callable[[_T], Hashable]):
+        self._key = key
+        self._values: dict[Hashable, _T] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def append(self, value: _T) -> bool:
+        """Buffer a value, returning True if it replaced an older value for its key."""
+        key = self._key(value)
+        replaced = key in self._values
+        self._values[key] = value
+        return replaced
+
+    def popleft(self) -> _T:
+        """Remove and return the value with the oldest key.
+
+        Raises:
+            IndexError: If the buffer is empty.
+        """
+        if not self._values:
+            raise IndexError("pop from an empty buffer")
+        return self._values.pop(next(iter(self._values)))
+
+
+class _Closed:
+    """Returned to the producer thread once the consumer has closed the channel."""
+
+    __slots__ = ()
+
+
+_CLOSED = _Closed()
+
+
+class _Channel(Generic[_T]):
+    """Channel from worker threads to an event loop, with a single consumer.
+
+    Items are buffered as they are, in a deque, without wrappers. While the GIL orders each
+    side's update before its check of the other side, blocking items are handed off without
+    a lock and the lock is only taken to put a thread to sleep or wake it. Drop and conflate
+    overflow policies, channels with several producer threads, and free-threaded builds,
+    take the lock for every item. Producers blocked on a full buffer resume once half of it
+    is free.
+
+    The consumer is woken at most once per wait, so a fast producer costs the event loop
+    one wakeup per batch of items rather than one per item. Values the consumer sends back
+    to the producer thread, such as a generator's sent values, travel as requests.
+    """
+
+    __slots__ = (
+        "_buffer",
+        "_maxsize",
+        "_overflow",
+        "_locked",
+        "_cond",
+        "_requests",
+        "_loop",
+        "_waiter",
+        "_consumer_waiting",
+        "_producers_waiting",
+        "_wakeup_pending",
+        "_done",
+        "_closed",
+        "_error",
+        "dropped",
+    )
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        overflow: OverflowPolicy = "block",
+        conflate_key: Optional[Callable[[_T], Hashable]] = None,
+        multi_producer: bool = False,
+    ):
+        """Initializes an empty channel.
+
+        Args:
+            maxsize: Maximum number of buffered items before the overflow policy applies.
+                Defaults to None (no-limit).
+            overflow: What put does with an item while the buffer is full. Defaults to
+                "block".
+            conflate_key: Key of items conflated by the "conflate" policy. Defaults to None
+                (keep only the latest item).
+            multi_producer: Whether items may be put from several threads at once.
+                Defaults to False.
+        """
+        if overflow not in _OVERFLOW_POLICIES:
+            raise ValueError(f"unknown overflow policy {overflow!r}")
+        if overflow in ("drop_oldest", "drop_newest") and not maxsize:
+            raise ValueError(f"overflow policy {overflow!r} requires buffer_maxsize")
+        self._buffer: Union[deque[_T], _ConflatingBuffer[_T]] = (
+            _ConflatingBuffer(conflate_key or _single_key)
+            if overflow == "conflate"
+            else deque()
+        )
+        self._maxsize = maxsize or 0
+        self._overflow = overflow
+        self._locked = multi_producer or overflow != "block" or not gil_enabled()
+        self._cond = threading.Condition(threading.Lock())
+        self._requests: deque[object] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiter: Optional[asyncio.Future[None]] = None
+        self._consumer_waiting = False
+        self._producers_waiting = 0
+        self._wakeup_pending = False
+        self._done = False
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self.dropped = 0
+        """Number of items discarded by the overflow policy."""
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def done(self) -> bool:
+        """Whether the producer has finished."""
+        return self._done
+
+    @property
+    def closed(self) -> bool:
+        """Whether the consumer has closed the channel."""
+        return self._closed
+
+    def open(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Binds the channel to the consumer's event loop, before the producer starts."""
+        self._loop = loop
+
+    def close(self) -> None:
+        """Closes the channel from the consumer side, releasing a blocked producer.
+
+        Items already buffered can still be taken.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    # producer thread
+
+    def put(self, item: _T) -> None:
+        """Buffers an item, applying the overflow policy while the buffer is full.
+
+        Items put after the consumer has closed the channel are dropped.
+        """
+        if not self._locked:
+            if self._maxsize and len(self._buffer) >= self._maxsize:
+                self.__wait_producer(self.__refilling)
+            if self._closed:
+                return
+            self._buffer.append(item)
+            if self._consumer_waiting and not self._wakeup_pending:
+                self.__schedule_wakeup()
+            return
+        with self._cond:
+            if self._overflow == "block" and self.__full():
+                self._producers_waiting += 1
+                while self.__refilling() and not self._closed:
+                    self._cond.wait()
+                self._producers_waiting -= 1
+            if self._closed:
+                return
+            if self._overflow == "conflate":
+                if self._buffer.append(item):
+                    self.dropped += 1
+                elif self.__overfull():
+                    self._buffer.popleft()
+                    self.dropped += 1
+            elif not self.__full():
+                self._buffer.append(item)
+            elif self._overflow == "drop_oldest":
+                self._buffer.popleft()
+                self._buffer.append(item)
+                self.dropped += 1
+            else:
+                self.dropped += 1
+                return
+            wake = self._consumer_waiting and not self._wakeup_pending
+            if wake:
+                self._wakeup_pending = True
+        if wake:
+            self.__call_soon(self.__wakeup)
+
+    def next_request(self) -> Union[object, _Closed]:
+        """Takes the oldest request, blocking until one is sent.
+
+        Returns:
+            The request, or _CLOSED once the consumer has closed the channel.
+        """
+        if not self._requests:
+            self.__wait_producer(self.__no_requests)
+        if self._closed:
+            return _CLOSED
+        return self._requests.popleft()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Ends the stream, after any buffered items, with an optional error."""
+        with self._cond:
+            if self._done:
+                return
+            self._error = error
+            self._done = True
+        self.__call_soon(self.__wakeup)
+
+    # event loop
+
+    def pop(self) -> _T:
+        """Takes the oldest buffered item, releasing producers blocked on a full buffer.
+
+        Raises:
+            IndexError: If the buffer is empty.
+        """
+        if not self._locked:
+            item = self._buffer.popleft()
+            if self._producers_waiting and not self.__refilling():
+                with self._cond:
+                    self._cond.notify()
+            return item
+        with self._cond:
+            item = self._buffer.popleft()
+            if self._producers_waiting and not self.__refilling():
+                self._cond.notify_all()
+        return item
+
+    def take(self) -> _T:
+        """Takes the oldest buffered item, or ends the stream once the buffer is drained.
+
+        Raises:
+            IndexError: If no item is buffered yet.
+            StopAsyncIteration: If the stream has ended.
+        """
+        try:
+            return self.pop()
+        except IndexError:
+            if self.exhausted():
+                error = self.take_error()
+                if error is not None:
+                    raise error from None
+                raise StopAsyncIteration from None
+            raise
+
+    async def next(self) -> _T:
+        """Takes the oldest item, waiting for one to be buffered.
+
+        Raises:
+            StopAsyncIteration: If the stream has ended.
+        """
+        while True:
+            try:
+                return self.take()
+            except IndexError:
+                await self.wait()
+
+    async def batch(
+        self, max_items: int, max_latency: Optional[float] = None
+    ) -> list[_T]:
+        """Takes up to max_items items, waiting for the first one and then up to
+        max_latency seconds for the rest.
+
+        Returns:
+            Items in stream order, an empty list once the stream has ended.
+        """
+        assert self._loop is not None
+        batch: list[_T] = []
+        deadline: Optional[float] = None
+        while len(batch) < max_items:
+            self.drain(batch, max_items)
+            if len(batch) >= max_items or self.exhausted():
+                break
+            if batch and max_latency is not None:
+                if deadline is None:
+                    deadline = self._loop.time() + max_latency
+                if not await self.wait(deadline - self._loop.time()):
+                    break
+            else:
+                await self.wait()
+        if not batch:
+            error = self.take_error()
+            if error is not None:
+                raise error
+        return batch
+
+    def drain(self, batch: list[_T], max_items: int) -> None:
+        """Moves buffered items into batch until it holds max_items items."""
+        while len(batch) < max_items:
+            try:
+                batch.append(self.pop())
+            except IndexError:
+                return
+
+    def request(self, value: object) -> None:
+        """Sends a request to the producer thread."""
+        if not self._locked:
+            self._requests.append(value)
+            if self._producers_waiting:
+                with self._cond:
+                    self._cond.notify()
+            return
+        with self._cond:
+            self._requests.append(value)
+            self._cond.notify()
+
+    def take_error(self) -> Optional[BaseException]:
+        """Takes the producer's error once the buffer is drained."""
+        if self._buffer:
+            return None
+        error, self._error = self._error, None
+        return error
+
+    def exhausted(self) -> bool:
+        """Whether the buffer is drained and no more items will arrive."""
+        return (self._done or self._closed) and not self._buffer
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Waits until an item is buffered or the stream ends.
+
+        Returns:
+            False if the timeout expired first.
+        """
+        assert self._loop is not None
+        ready = self.__announce_waiting()
+        try:
+            if ready:
+                return True
+            if timeout is not None and timeout <= 0:
+                return False
+            self._waiter = waiter = self._loop.create_future()
+            if timeout is None:
+                await waiter
+                return True
+            try:
+                await asyncio.wait_for(waiter, timeout)
+            except asyncio.TimeoutError:
+                return False
+            return True
+        finally:
+            self._consumer_waiting = False
+            self._waiter = None
+
+    def watch(self, waiter: asyncio.Future[None]) -> bool:
+        """Wakes a waiter shared with other channels once an item is buffered or the stream
+        ends, until unwatch is called.
+
+        Returns:
+            True if the channel is already ready, in which case waiter is not registered.
+        """
+        if self.__announce_waiting():
+            self._consumer_waiting = False
+            return True
+        self._waiter = waiter
+        return False
+
+    def unwatch(self) -> None:
+        """Stops waking the waiter registered by watch."""
+        self._consumer_waiting = False
+        self._waiter = None
+
+    def __announce_waiting(self) -> bool:
+        """Asks the producer to wake the consumer, returning whether it is already ready."""
+        if self._locked:
+            with self._cond:
+                self._consumer_waiting = True
+                return bool(self._buffer) or self._done or self._closed
+        self._consumer_waiting = True
+        return bool(self._buffer) or self._done or self._closed
+
+    def __full(self) -> bool:
+        return 0 < self._maxsize <= len(self._buffer)
+
+    def __refilling(self) -> bool:
+        """Whether a producer blocked on a full buffer should keep waiting.
+
+        It resumes once half the buffer is free, rather than once per taken item, so that
+        a full channel costs one thread switch per batch of items.
+        """
+        return len(self._buffer) > self._maxsize // 2
+
+    def __overfull(self) -> bool:
+        return 0 < self._maxsize < len(self._buffer)
+
+    def __no_requests(self) -> bool:
+        return not self._requests
+
+    def __wait_producer(self, blocked: Callable[[], bool]) -> None:
+        """Sleeps the producer thread while blocked, announcing it to the consumer."""
+        with self._cond:
+            self._producers_waiting += 1
+            while blocked() and not self._closed:
+                self._cond.wait()
+            self._producers_waiting -= 1
+
+    def __schedule_wakeup(self) -> None:
+        self._wakeup_pending = True
+        self.__call_soon(self.__wakeup)
+
+    def __call_soon(self, callback: Callable[[], None]) -> None:
+        assert self._loop is not None
+        self._loop.call_soon_threadsafe(callback)
+
+    def __wakeup(self) -> None:
+        if self._locked:
+            with self._cond:
+                self._wakeup_pending = False
+        else:
+            self._wakeup_pending = False
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
@@ -0,0 +1,277 @@
+"""Stream combinator utilities."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import sys
+from collections.abc import AsyncIterator, Sequence
+from contextlib import AbstractAsyncContextManager
+from typing import TYPE_CHECKING, Generic, Optional, TypeVar, Union
+
+from athreading.aliases import AsyncIteratorContext
+from athreading.callback_iterator import CallbackThreadedAsyncIterator
+from athreading.channels import _Channel
+from athreading.iterator import ThreadedAsyncIterator
+
+if sys.version_info >= (3, 12):
+    from typing import overload, override
+else:  # pragma: not covered
+    from typing_extensions import overload, override
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+__all__ = ["merge", "zip"]
+
+_T = TypeVar("_T")
+_T1 = TypeVar("_T1")
+_T2 = TypeVar("_T2")
+_T3 = TypeVar("_T3")
+_ItemT = TypeVar("_ItemT")
+_YieldT = TypeVar("_YieldT")
+
+_Stream = AbstractAsyncContextManager[AsyncIterator[_T]]
+
+# streams whose items are taken from their channel exactly as __anext__ would take them
+_CHANNEL_NEXT = (
+    ThreadedAsyncIterator.__anext__,
+    CallbackThreadedAsyncIterator.__anext__,
+)
+
+
+def merge(*streams: _Stream[_T]) -> AsyncIteratorContext[_T]:
+    """Merges streams into one stream of their items in arrival order.
+
+    Entering the context enters every stream. Streams with items ready are drained round
+    robin, one item each in turn, so a fast stream cannot starve the others. Streams of
+    iterate and iterate_callback are waited on through their own wakeups with one future
+    per wait for all of them, without a task per item. Other streams cost a task per item.
+
+    Args:
+        *streams: Stream contexts, such as those returned by iterate.
+
+    Returns:
+        Context of an asynchronous iterator of items, ending when every stream has ended.
+        Errors of a stream are raised in place of its next item, and end that stream only.
+    """
+    return _Merge(streams)
+
+
+@overload
+def zip(s1: _Stream[_T1], s2: _Stream[_T2], /) -> AsyncIteratorContext[tuple[_T1, _T2]]:
+    ...
+
+
+@overload
+def zip(
+    s1: _Stream[_T1], s2: _Stream[_T2], s3: _Stream[_T3], /
+) -> AsyncIteratorContext[tuple[_T1, _T2, _T3]]:
+    ...
+
+
+@overload
+def zip(*streams: _Stream[object]) -> AsyncIteratorContext[tuple[object, ...]]:
+    ...
+
+
+def zip(*streams: _Stream[object]) -> AsyncIteratorContext[tuple[object, ...]]:
+    """Zips streams into one stream of tuples holding the next item of each stream.
+
+    Entering the context enters every stream. Items of streams of iterate and
+    iterate_callback are awaited together through one future per wait, without a task per
+    item.
+
+    Args:
+        *streams: Stream contexts, such as those returned by iterate.
+
+    Returns:
+        Context of an asynchronous iterator of tuples, ending when any stream ends.
+    """
+    return _Zip(streams)
+
+
+class _ChannelSource(Generic[_T]):
+    """Takes items of a channel backed stream without awaiting its __anext__."""
+
+    def __init__(self, channel: _Channel[_T]):
+        self._channel = channel
+
+    def poll(self) -> _T:
+        """Takes the next item.
+
+        Raises:
+            IndexError: If no item is ready yet.
+            StopAsyncIteration: If the stream has ended.
+        """
+        return self._channel.take()
+
+    def watch(self, waiter: asyncio.Future[None]) -> bool:
+        return self._channel.watch(waiter)
+
+    def unwatch(self) -> None:
+        self._channel.unwatch()
+
+    def cancel(self) -> None:
+        pass
+
+
+class _TaskSource(Generic[_T]):
+    """Takes items of any async iterator through a task awaiting its __anext__."""
+
+    def __init__(self, iterator: AsyncIterator[_T]):
+        self._iterator = iterator
+        self._pending: Optional[asyncio.Future[_T]] = None
+        self._waiter: Optional[asyncio.Future[None]] = None
+
+    def poll(self) -> _T:
+        """Takes the next item, starting to await it if it is not ready.
+
+        Raises:
+            IndexError: If no item is ready yet.
+            StopAsyncIteration: If the stream has ended.
+        """
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self._iterator.__anext__())
+        if not self._pending.done():
+            raise IndexError("no item ready")
+        future, self._pending = self._pending, None
+        return future.result()
+
+    def watch(self, waiter: asyncio.Future[None]) -> bool:
+        assert self._pending is not None
+        if self._pending.done():
+            return True
+        self._waiter = waiter
+        self._pending.add_done_callback(self.__wake)
+        return False
+
+    def unwatch(self) -> None:
+        if self._pending is not None:
+            self._pending.remove_done_callback(self.__wake)
+        self._waiter = None
+
+    def cancel(self) -> None:
+        if self._pending is not None:
+            self._pending.cancel()
+
+    def __wake(self, future: asyncio.Future[_T]) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+
+_Source = Union[_ChannelSource[_T], _TaskSource[_T]]
+
+
+def _source(iterator: AsyncIterator[_T]) -> _Source[_T]:
+    if (
+        isinstance(iterator, (ThreadedAsyncIterator, CallbackThreadedAsyncIterator))
+        and type(iterator).__anext__ in _CHANNEL_NEXT
+    ):
+        return _ChannelSource(iterator._channel)
+    return _TaskSource(iterator)
+
+
+async def _wait_any(sources: Sequence[_Source[_T]]) -> None:
+    """Waits until any of the sources, which have no item ready, has an item or ends."""
+    waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+    try:
+        for source in sources:
+            if source.watch(waiter):
+                return
+        await waiter
+    finally:
+        for source in sources:
+            source.unwatch()
+
+
+class _Combinator(AsyncIteratorContext[_YieldT], Generic[_ItemT, _YieldT]):
+    """Enters streams together and exposes their items through sources."""
+
+    def __init__(self, streams: tuple[_Stream[_ItemT], ...]):
+        self._streams = streams
+        self._stack = contextlib.AsyncExitStack()
+        self._sources: list[_Source[_ItemT]] = []
+
+    @override
+    async def __aenter__(self) -> AsyncIterator[_YieldT]:
+        async with contextlib.AsyncExitStack() as stack:
+            for stream in self._streams:
+                self._sources.append(_source(await stack.enter_async_context(stream)))
+            self._stack = stack.pop_all()
+        return self
+
+    @override
+    async def __aexit__(
+        self,
+        __exc_type: Optional[type[BaseException]],
+        __val: Optional[BaseException],
+        __tb: Optional[TracebackType],
+        /,
+    ) -> None:
+        for source in self._sources:
+            source.cancel()
+        await self._stack.__aexit__(__exc_type, __val, __tb)
+
+
+class _Merge(_Combinator[_T, _T]):
+    def __init__(self, streams: tuple[_Stream[_T], ...]):
+        super().__init__(streams)
+        self._next = 0
+
+    @override
+    async def __anext__(self) -> _T:
+        sources = self._sources
+        while sources:
+            for _ in range(len(sources)):
+                index = self._next % len(sources)
+                try:
+                    item = sources[index].poll()
+                except IndexError:
+                    self._next = index + 1
+                    continue
+                except StopAsyncIteration:
+                    del sources[index]
+                    self._next = index
+                    break
+                except BaseException:
+                    del sources[index]
+                    self._next = index
+                    raise
+                self._next = index + 1
+                return item
+            else:
+                await _wait_any(sources)
+        raise StopAsyncIteration
+
+
+class _Missing:
+    __slots__ = ()
+
+
+_MISSING = _Missing()
+
+
+class _Zip(_Combinator[object, tuple[object, ...]]):
+    def __init__(self, streams: tuple[_Stream[object], ...]):
+        super().__init__(streams)
+        # items taken for the next tuple, kept across cancelled waits
+        self._items: list[object] = [_MISSING] * len(streams)
+
+    @override
+    async def __anext__(self) -> tuple[object, ...]:
+        if not self._sources:
+            raise StopAsyncIteration
+        items = self._items
+        while True:
+            waiting = []
+            for index, source in enumerate(self._sources):
+                if items[index] is _MISSING:
+                    try:
+                        items[index] = source.poll()
+                    except IndexError:
+                        waiting.append(source)
+            if not waiting:
+                self._items = [_MISSING] * len(items)
+                return tuple(items)
+            await _wait_any(waiting)
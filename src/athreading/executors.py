@@ -0,0 +1,313 @@
+"""Executor utilities."""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import functools
+import importlib
+import itertools
+import multiprocessing
+import os
+import sys
+import threading
+import warnings
+from collections.abc import Callable, Sequence
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Literal, Optional, TypeVar
+
+if sys.version_info >= (3, 12):
+    from typing import ParamSpec, override
+else:  # pragma: not covered
+    from typing_extensions import ParamSpec, override
+
+__all__ = [
+    "Backend",
+    "ThreadMode",
+    "configure_pool",
+    "configure_process_pool",
+    "get_pool",
+    "get_process_pool",
+    "gil_enabled",
+    "shutdown_pools",
+]
+
+_ParamsT = ParamSpec("_ParamsT")
+_T = TypeVar("_T")
+
+Backend = Literal["thread", "process"]
+ThreadMode = Literal["pool", "dedicated"]
+
+
+@dataclasses.dataclass(frozen=True)
+class _PoolConfig:
+    max_workers: Optional[int] = None
+    thread_name_prefix: Optional[str] = None
+
+
+@dataclasses.dataclass(frozen=True)
+class _ProcessPoolConfig:
+    max_workers: Optional[int] = None
+    preload: tuple[str, ...] = ()
+
+
+_pools_lock = threading.Lock()
+_pool_configs: dict[str, _PoolConfig] = {}
+_pools: dict[str, ThreadPoolExecutor] = {}
+_process_pool_config = _ProcessPoolConfig()
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def gil_enabled() -> bool:
+    """Whether the interpreter currently runs with the global interpreter lock.
+
+    Free-threaded builds (python3.13t and later) run worker threads in parallel, and may
+    enable the GIL again at runtime when importing an extension that does not support
+    running without it.
+
+    Returns:
+        False on a free-threaded build running without the GIL, True otherwise.
+    """
+    is_gil_enabled: Callable[[], bool] = getattr(sys, "_is_gil_enabled", lambda: True)
+    return is_gil_enabled()
+
+
+def configure_pool(
+    name: str,
+    *,
+    max_workers: Optional[int] = None,
+    thread_name_prefix: Optional[str] = None,
+) -> None:
+    """Configures a named thread pool before it is first used.
+
+    Named pools are isolated from the event loop default executor and from each other, so a
+    slow dependency cannot take every worker thread in the process.
+
+    Args:
+        name: Pool name passed to the pool argument of athreading decorators.
+        max_workers: Maximum number of pool threads. Defaults to None
+            (ThreadPoolExecutor default).
+        thread_name_prefix: Prefix of pool thread names. Defaults to None
+            ("athreading-<name>").
+
+    Raises:
+        RuntimeError: If the pool has already been created.
+    """
+    with _pools_lock:
+        if name in _pools:
+            raise RuntimeError(f"pool {name!r} is already running")
+        _pool_configs[name] = _PoolConfig(max_workers, thread_name_prefix)
+
+
+def get_pool(name: str) -> ThreadPoolExecutor:
+    """Gets a named thread pool, creating it on first use.
+
+    Args:
+        name: Pool name.
+
+    Returns:
+        The pool's executor.
+    """
+    # pools are looked up on every call, so only creating one takes the lock
+    pool = _pools.get(name)
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            config = _pool_configs.get(name, _PoolConfig())
+            pool = _pools[name] = ThreadPoolExecutor(
+                max_workers=config.max_workers,
+                thread_name_prefix=config.thread_name_prefix or f"athreading-{name}",
+            )
+        return pool
+
+
+def configure_process_pool(
+    *, max_workers: Optional[int] = None, preload: Sequence[str] = ()
+) -> None:
+    """Configures the process pool used by backend="process" before it is first used.
+
+    Args:
+        max_workers: Maximum number of worker processes. Defaults to None (number of CPUs).
+        preload: Names of modules every worker process imports when it starts, so that the
+            first calls do not pay for imports. Defaults to ().
+
+    Raises:
+        RuntimeError: If the pool has already been created.
+    """
+    global _process_pool_config
+    with _pools_lock:
+        if _process_pool is not None:
+            raise RuntimeError("process pool is already running")
+        _process_pool_config = _ProcessPoolConfig(max_workers, tuple(preload))
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Gets the process pool used by backend="process", starting it on first use.
+
+    Every worker process is started up front and imports the preload modules, keeping
+    process start up out of the latency of calls.
+
+    Returns:
+        The pool's executor.
+    """
+    global _process_pool
+    with _pools_lock:
+        if _process_pool is None:
+            config = _process_pool_config
+            max_workers = config.max_workers or os.cpu_count() or 1
+            _process_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_preload,
+                initargs=(config.preload,),
+            )
+            for _ in range(max_workers):
+                _process_pool.submit(_preload, ())
+        return _process_pool
+
+
+def _preload(modules: tuple[str, ...]) -> None:
+    for module in modules:
+        importlib.import_module(module)
+
+
+def shutdown_pools(wait: bool = True) -> None:
+    """Shuts down every named pool and the process pool created so far.
+
+    Pools are created again on next use, keeping their configuration.
+
+    Args:
+        wait: Whether to wait for pending work to finish. Defaults to True.
+    """
+    global _process_pool
+    with _pools_lock:
+        pools: list[Executor] = list(_pools.values())
+        _pools.clear()
+        if _process_pool is not None:
+            pools.append(_process_pool)
+            _process_pool = None
+    for pool in pools:
+        pool.shutdown(wait=wait)
+
+
+class _DedicatedThreadExecutor(Executor):
+    """Executor starting a new daemon thread for every submitted function."""
+
+    def __init__(self, thread_name_prefix: str):
+        self._thread_name_prefix = thread_name_prefix
+        self._counter = itertools.count()
+
+    @override
+    def submit(
+        self,
+        fn: Callable[_ParamsT, _T],
+        /,
+        *args: _ParamsT.args,
+        **kwargs: _ParamsT.kwargs,
+    ) -> Future[_T]:
+        future: Future[_T] = Future()
+
+        def run() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:  # noqa: BLE001
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+        threading.Thread(
+            target=run,
+            name=f"{self._thread_name_prefix}_{next(self._counter)}",
+            daemon=True,
+        ).start()
+        return future
+
+
+# runs workers that may be abandoned, see _stream_executor
+_ABANDONABLE_EXECUTOR = _DedicatedThreadExecutor("athreading-stream")
+
+
+def _stream_executor(
+    executor: Optional[Executor], exit_timeout: Optional[float]
+) -> Optional[Executor]:
+    """Chooses the executor of a stream worker.
+
+    A worker abandoned after exit_timeout keeps its thread busy until the source returns.
+    On the event loop's default executor that blocks asyncio.run from returning, so such
+    workers run on their own daemon threads unless an executor is given.
+    """
+    if executor is None and exit_timeout is not None:
+        return _ABANDONABLE_EXECUTOR
+    return executor
+
+
+def _executor_getter(
+    executor: Optional[Executor],
+    pool: Optional[str],
+    thread: ThreadMode = "pool",
+    name: str = "dedicated",
+) -> Callable[[], Optional[Executor]]:
+    """Validates a decorator's executor, pool and thread arguments.
+
+    Returns:
+        Function returning the executor to use, creating a named pool on first call.
+    """
+    if thread == "dedicated":
+        if executor is not None or pool is not None:
+            raise ValueError("executor and pool are not used with thread='dedicated'")
+        dedicated = _DedicatedThreadExecutor(f"athreading-{name}")
+        return lambda: dedicated
+    if thread != "pool":
+        raise ValueError(f"thread must be 'pool' or 'dedicated', got {thread!r}")
+    if pool is None:
+        return lambda: executor
+    if executor is not None:
+        raise ValueError("executor and pool are mutually exclusive")
+    return functools.partial(get_pool, pool)
+
+
+async def _join_worker(
+    worker_future: asyncio.Future[None],
+    interrupt: Optional[Callable[[], None]],
+    exit_timeout: Optional[float],
+) -> None:
+    """Waits for a stream worker that has been asked to stop.
+
+    Args:
+        worker_future: Future of the worker thread.
+        interrupt: Called first to unblock a running worker, errors the worker then raises
+            are suppressed. Defaults to None.
+        exit_timeout: Seconds to wait before abandoning the worker with a RuntimeWarning.
+            Defaults to None (wait for the worker).
+    """
+    if interrupt is not None and not worker_future.done():
+        interrupt()
+    else:
+        interrupt = None
+    if exit_timeout is not None:
+        done, _ = await asyncio.wait((worker_future,), timeout=exit_timeout)
+        if not done:
+            warnings.warn(
+                f"stream worker did not stop within {exit_timeout} seconds and was "
+                "abandoned, its thread stays busy until the source returns and keeps "
+                "a given executor from shutting down until then",
+                RuntimeWarning,
+                stacklevel=3,
+            )
+            # retrieve whatever the worker eventually raises
+            worker_future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            return
+    try:
+        await worker_future
+    except Exception:
+        if interrupt is None:
+            raise
@@ -4,20 +4,26 @@ from __future__ import annotations
 
 import asyncio
 import functools
-import queue
 import sys
-import threading
-from collections.abc import Callable, Generator
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import AsyncIterator, Callable, Generator, Iterable
+from concurrent.futures import Executor, ThreadPoolExecutor
 from types import TracebackType
-from typing import Optional, TypeVar, Union
+from typing import Optional, TypeVar, Union, cast
 
 if sys.version_info >= (3, 12):
-    from typing import ParamSpec, overload, override
+    from typing import Never, ParamSpec, overload, override
 else:  # pragma: not covered
-    from typing_extensions import ParamSpec, overload, override
+    from typing_extensions import Never, ParamSpec, overload, override
 
 from athreading.aliases import AsyncGeneratorContext
+from athreading.channels import _Channel, _Closed
+from athreading.executors import (
+    ThreadMode,
+    _executor_getter,
+    _join_worker,
+    _stream_executor,
+)
+from athreading.limits import ConcurrencyLimit, _create_limit
 
 __all__ = ["ThreadedAsyncGenerator", "generate"]
 
@@ -35,6 +41,11 @@ def generate(
     *,
     buffer_maxsize: Optional[int] = None,
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    thread: ThreadMode = "pool",
+    max_concurrency: Optional[int] = None,
+    interrupt: Optional[Callable[[Never], None]] = None,
+    exit_timeout: Optional[float] = None,
 ) -> Callable[
     [Callable[_ParamsT, Generator[_YieldT_co, _SendT_co, None]]],
     Callable[_ParamsT, AsyncGeneratorContext[_YieldT_co, _SendT_co]],
@@ -48,6 +59,11 @@ def generate(
     *,
     buffer_maxsize: Optional[int] = None,
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    thread: ThreadMode = "pool",
+    max_concurrency: Optional[int] = None,
+    interrupt: Optional[Callable[[Never], None]] = None,
+    exit_timeout: Optional[float] = None,
 ) -> Callable[_ParamsT, AsyncGeneratorContext[_YieldT_co, _SendT_co]]:
     ...
 
@@ -57,6 +73,11 @@ def generate(
     *,
     buffer_maxsize: Optional[int] = None,
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    thread: ThreadMode = "pool",
+    max_concurrency: Optional[int] = None,
+    interrupt: Optional[Callable[[Never], None]] = None,
+    exit_timeout: Optional[float] = None,
 ) -> Union[
     Callable[_ParamsT, AsyncGeneratorContext[_YieldT_co, _SendT_co]],
     Callable[
@@ -72,15 +93,43 @@ def generate(
         buffer_maxsize: Maximum buffer size for background worker to pre-emptively pull
             data into. Defaults to None (no priming).
         executor: Defaults to None.
+        pool: Name of an isolated thread pool to use instead of executor, see
+            configure_pool. Defaults to None.
+        thread: "dedicated" runs the worker on a new daemon thread named after fn instead of
+            an executor, for long-lived streams. Defaults to "pool".
+        max_concurrency: Maximum number of streams holding a worker thread at once, further
+            streams wait on the event loop when entered. Defaults to None (no-limit).
+        interrupt: Called with the generator returned by fn when the context exits before
+            the generator is exhausted, to unblock the worker thread. Defaults to None.
+        exit_timeout: Maximum seconds exiting the context waits for the worker thread
+            before abandoning it with a RuntimeWarning. An abandoned thread stays busy until
+            the source returns and keeps its executor from shutting down, so without
+            executor or pool the worker runs on its own daemon thread, which neither
+            asyncio.run nor the interpreter waits for. Defaults to None (no-limit).
 
     Returns:
         Decorated generator function with lazy argument evaluation.
     """
     return (
-        _create_generate_decorator(buffer_maxsize=buffer_maxsize, executor=executor)
+        _create_generate_decorator(
+            buffer_maxsize=buffer_maxsize,
+            executor=executor,
+            pool=pool,
+            thread=thread,
+            max_concurrency=max_concurrency,
+            interrupt=interrupt,
+            exit_timeout=exit_timeout,
+        )
         if fn is None
         else _create_generate_wrapper(
-            fn, buffer_maxsize=buffer_maxsize, executor=executor
+            fn,
+            buffer_maxsize=buffer_maxsize,
+            executor=executor,
+            pool=pool,
+            thread=thread,
+            max_concurrency=max_concurrency,
+            interrupt=interrupt,
+            exit_timeout=exit_timeout,
         )
     )
 
@@ -90,12 +139,37 @@ def _create_generate_wrapper(
     *,
     buffer_maxsize: Optional[int],
     executor: Optional[ThreadPoolExecutor],
+    pool: Optional[str],
+    thread: ThreadMode,
+    max_concurrency: Optional[int],
+    interrupt: Optional[Callable[[Never], None]],
+    exit_timeout: Optional[float],
 ) -> Callable[_ParamsT, AsyncGeneratorContext[_YieldT_co, _SendT_co]]:
+    get_executor = _executor_getter(
+        executor, pool, thread, getattr(fn, "__name__", "dedicated")
+    )
+    limit = _create_limit(max_concurrency)
+    interrupt_source = cast(
+        Optional[Callable[[Generator[_YieldT_co, _SendT_co, None]], None]], interrupt
+    )
+
     @functools.wraps(fn)
     def wrapper(
         *args: _ParamsT.args, **kwargs: _ParamsT.kwargs
     ) -> AsyncGeneratorContext[_YieldT_co, _SendT_co]:
-        return ThreadedAsyncGenerator(fn(*args, **kwargs), buffer_maxsize, executor)
+        generator = fn(*args, **kwargs)
+        return ThreadedAsyncGenerator(
+            generator,
+            buffer_maxsize,
+            get_executor(),
+            limit=limit,
+            interrupt=(
+                None
+                if interrupt_source is None
+                else functools.partial(interrupt_source, generator)
+            ),
+            exit_timeout=exit_timeout,
+        )
 
     return wrapper
 
@@ -103,6 +177,11 @@ def _create_generate_wrapper(
 def _create_generate_decorator(
     buffer_maxsize: Optional[int] = None,
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    thread: ThreadMode = "pool",
+    max_concurrency: Optional[int] = None,
+    interrupt: Optional[Callable[[Never], None]] = None,
+    exit_timeout: Optional[float] = None,
 ) -> Callable[
     [Callable[_ParamsT, Generator[_YieldT_co, _SendT_co, None]]],
     Callable[_ParamsT, AsyncGeneratorContext[_YieldT_co, _SendT_co]],
@@ -111,7 +190,14 @@ def _create_generate_decorator(
         fn: Callable[_ParamsT, Generator[_YieldT_co, _SendT_co, None]],
     ) -> Callable[_ParamsT, AsyncGeneratorContext[_YieldT_co, _SendT_co]]:
         return _create_generate_wrapper(
-            fn, buffer_maxsize=buffer_maxsize, executor=executor
+            fn,
+            buffer_maxsize=buffer_maxsize,
+            executor=executor,
+            pool=pool,
+            thread=thread,
+            max_concurrency=max_concurrency,
+            interrupt=interrupt,
+            exit_timeout=exit_timeout,
         )
 
     return decorator
@@ -126,7 +212,10 @@ class ThreadedAsyncGenerator(AsyncGeneratorContext[_YieldT, _SendT]):
         self,
         generator: Generator[_YieldT, _SendT, None],
         buffer_maxsize: Optional[int] = None,
-        executor: Optional[ThreadPoolExecutor] = None,
+        executor: Optional[Executor] = None,
+        limit: Optional[ConcurrencyLimit] = None,
+        interrupt: Optional[Callable[[], None]] = None,
+        exit_timeout: Optional[float] = None,
     ):
         """Initilizes a ThreadedAsyncGenerator from a synchronous generator.
 
@@ -135,24 +224,45 @@ class ThreadedAsyncGenerator(AsyncGeneratorContext[_YieldT, _SendT]):
             buffer_maxsize: Maximum buffer size for background worker to pre-emptively pull
                 data into. Defaults to None (no priming).
             executor: Shared thread pool instance. Defaults to ThreadPoolExecutor().
+            limit: Concurrency limit held from entering the context until the worker thread
+                is released. Defaults to None.
+            interrupt: Called when the context exits before the generator is exhausted, to
+                unblock the worker thread. Errors the generator then raises are suppressed.
+                Defaults to None.
+            exit_timeout: Maximum seconds exiting the context waits for the worker thread
+                before abandoning it with a RuntimeWarning. Without executor, the worker
+                then runs on a daemon thread. Defaults to None (no-limit).
         """
-        self._yield_semaphore = asyncio.Semaphore(0)
-        self._done_event = threading.Event()
-        self._send_queue: queue.Queue[Optional[_SendT]] = queue.Queue()
-        self._yield_queue: queue.Queue[_YieldT] = queue.Queue(buffer_maxsize or 0)
+        # demand is bounded by the sent values, so yields never block the worker
+        self._channel: _Channel[_YieldT] = _Channel()
         if buffer_maxsize:
             for _ in range(buffer_maxsize):
-                self._send_queue.put(None)
+                self._channel.request(None)
         self._generator = generator
-        self._executor = executor
+        self._executor = _stream_executor(executor, exit_timeout)
+        self._limit = limit
+        self._interrupt = interrupt
+        self._exit_timeout = exit_timeout
         self._worker_future: Optional[asyncio.Future[None]] = None
 
     @override
     async def __aenter__(self) -> ThreadedAsyncGenerator[_YieldT, _SendT]:
         self._loop = asyncio.get_running_loop()
-        self._worker_future = self._loop.run_in_executor(
-            self._executor, self.__worker_threadsafe
-        )
+        self._channel.open(self._loop)
+        if self._limit is None:
+            self._worker_future = self._loop.run_in_executor(
+                self._executor, self.__worker_threadsafe
+            )
+            return self
+        await self._limit.acquire()
+        try:
+            self._worker_future = self._loop.run_in_executor(
+                self._executor, self.__worker_threadsafe
+            )
+        except BaseException:
+            self._limit.release()
+            raise
+        self._limit._release_when_done(self._worker_future)
         return self
 
     @override
@@ -165,35 +275,111 @@ class ThreadedAsyncGenerator(AsyncGeneratorContext[_YieldT, _SendT]):
     ) -> None:
         # move to aclose
         assert self._worker_future is not None
-        self._done_event.set()
-        self._yield_semaphore.release()
-        self._send_queue.put(None)
-        await self._worker_future
+        exhausted = self._channel.done
+        self._channel.close()
+        await _join_worker(
+            self._worker_future,
+            None if exhausted else self._interrupt,
+            self._exit_timeout,
+        )
 
     @override
     async def __anext__(self) -> _YieldT:
         assert (
             self._worker_future is not None
         ), "Iteration started before entering context"
-        self._send_queue.put(None)
-        return await self.__get()
+        self._channel.request(None)
+        return await self._channel.next()
 
     @override
     async def asend(self, value: Optional[_SendT]) -> _YieldT:
-        """Send a value to the generator send queue"""
-        self._send_queue.put(value)
-        return await self.__get()
+        """Send a value to the generator"""
+        self._channel.request(value)
+        return await self._channel.next()
+
+    @override
+    async def asend_many(
+        self, values: Iterable[Optional[_SendT]], *, window: Optional[int] = None
+    ) -> list[_YieldT]:
+        """Sends values to the generator without waiting for each yield in between.
+
+        Sends are queued for the worker thread up to window at a time and the items it
+        yields are collected as they arrive, so a batch of sends costs one event loop
+        wakeup per burst of yields rather than a thread round trip per value.
+
+        Args:
+            values: Values to send.
+            window: Maximum number of sends in flight at once, to bound the items the worker
+                can run ahead by. Defaults to None (send every value up front).
+
+        Returns:
+            One item per value, fewer if the generator stops first.
+        """
+        assert (
+            self._worker_future is not None
+        ), "Iteration started before entering context"
+        if window is not None and window < 1:
+            raise ValueError("window must be at least 1")
+        items: list[_YieldT] = []
+        pending = iter(values)
+        in_flight = 0
+        sending = True
+        while True:
+            while sending and (window is None or in_flight < window):
+                try:
+                    value = next(pending)
+                except StopIteration:
+                    sending = False
+                    break
+                self._channel.request(value)
+                in_flight += 1
+            if not in_flight:
+                return items
+            received = len(items)
+            self._channel.drain(items, received + in_flight)
+            in_flight -= len(items) - received
+            if len(items) == received:
+                if self._channel.exhausted():
+                    return items
+                await self._channel.wait()
 
     async def aclose(self) -> None:
         """Closes the generator"""
         self._generator.close()
 
-    async def __get(self) -> _YieldT:
-        if not self._done_event.is_set() or not self._yield_queue.empty():
-            await self._yield_semaphore.acquire()
-            if not self._yield_queue.empty():
-                return self._yield_queue.get(False)
-        raise StopAsyncIteration
+    @override
+    async def batches(
+        self, max_items: int, max_latency: Optional[float] = None
+    ) -> AsyncIterator[list[_YieldT]]:
+        """Iterates over the generator in lists of up to max_items items.
+
+        Sends None for every requested item up front and takes every yielded item from the
+        queue at once. Requests still outstanding when max_latency expires carry over to
+        the next batch.
+
+        Args:
+            max_items: Maximum number of items per batch.
+            max_latency: Maximum seconds to wait for a batch to fill once its first item
+                has arrived. Defaults to None (wait for max_items or the end of the stream).
+
+        Yields:
+            Non-empty lists of items in stream order.
+        """
+        assert (
+            self._worker_future is not None
+        ), "Iteration started before entering context"
+        if max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        outstanding = 0
+        while True:
+            for _ in range(max_items - outstanding):
+                self._channel.request(None)
+            outstanding = max_items
+            batch = await self._channel.batch(max_items, max_latency)
+            outstanding = max(0, outstanding - len(batch))
+            if not batch:
+                return
+            yield batch
 
     @override
     async def athrow(
@@ -209,17 +395,16 @@ class ThreadedAsyncGenerator(AsyncGeneratorContext[_YieldT, _SendT]):
         return self._generator.throw(__typ, __val, __tb)
 
     def __worker_threadsafe(self) -> None:
-        """Stream the synchronous itertor to the queue and notify the async thread."""
+        """Stream the synchronous generator to the channel, one item per sent value."""
         try:
-            while not self._done_event.is_set():
-                sent = self._send_queue.get()
-                if not self._done_event.is_set():
-                    try:
-                        item = self._generator.send(sent)  # type: ignore
-                        self._yield_queue.put(item)
-                        self._loop.call_soon_threadsafe(self._yield_semaphore.release)
-                    except StopIteration:
-                        break
+            while True:
+                sent = self._channel.next_request()
+                if isinstance(sent, _Closed):
+                    break
+                try:
+                    item = self._generator.send(sent)  # type: ignore
+                except StopIteration:
+                    break
+                self._channel.put(item)
         finally:
-            self._done_event.set()
-            self._loop.call_soon_threadsafe(self._yield_semaphore.release)
+            self._channel.finish()
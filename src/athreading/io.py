@@ -0,0 +1,491 @@
+"""Asynchronous file utilities."""
+
+from __future__ import annotations
+
+import asyncio
+import builtins
+import io
+import mmap
+import os
+import sys
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import IO, TYPE_CHECKING, AnyStr, Generic, Literal, Optional, Union, cast
+
+from athreading.aliases import AsyncIteratorContext
+from athreading.executors import _executor_getter
+from athreading.iterator import ThreadedAsyncIterator
+
+if sys.version_info >= (3, 12):
+    from typing import overload, override
+else:  # pragma: not covered
+    from typing_extensions import overload, override
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+__all__ = ["AsyncFile", "mmap_chunks", "open"]
+
+_DEFAULT_CHUNK_SIZE = 64 * 1024
+_DEFAULT_MMAP_CHUNK_SIZE = 1024 * 1024
+
+_BinaryMode = Literal["rb", "wb", "ab", "xb"]
+_TextMode = Literal["r", "w", "a", "x"]
+
+StrOrBytesPath = Union[str, bytes, "os.PathLike[str]", "os.PathLike[bytes]"]
+
+
+@overload
+def open(
+    file: StrOrBytesPath,
+    mode: _BinaryMode,
+    *,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    read_ahead: int = 4,
+    executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+) -> AsyncFile[bytes]:
+    ...
+
+
+@overload
+def open(
+    file: StrOrBytesPath,
+    mode: _TextMode = "r",
+    *,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    read_ahead: int = 4,
+    executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    encoding: Optional[str] = None,
+    errors: Optional[str] = None,
+    newline: Optional[str] = None,
+) -> AsyncFile[str]:
+    ...
+
+
+def open(
+    file: StrOrBytesPath,
+    mode: Union[_BinaryMode, _TextMode] = "r",
+    *,
+    chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    read_ahead: int = 4,
+    executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    encoding: Optional[str] = None,
+    errors: Optional[str] = None,
+    newline: Optional[str] = None,
+) -> Union[AsyncFile[bytes], AsyncFile[str]]:
+    """Opens a file for reading or writing on worker threads.
+
+    The file is opened when the returned context is entered. Files opened for reading are
+    read sequentially in chunks by a worker thread that reads up to read_ahead chunks
+    ahead of the consumer, and files opened for writing buffer writes into chunks that a
+    worker thread writes while the consumer continues.
+
+    Args:
+        file: Path of the file.
+        mode: "r", "w", "a" or "x", optionally followed by "b" for binary mode. Defaults to
+            "r".
+        chunk_size: Bytes, or characters in text mode, per read or write on a worker thread.
+            Defaults to 65536.
+        read_ahead: Maximum number of chunks read ahead of the consumer. Defaults to 4.
+        executor: Defaults to None.
+        pool: Name of an isolated thread pool to use instead of executor, see
+            configure_pool. Defaults to None.
+        encoding: Text mode encoding. Defaults to None (locale encoding).
+        errors: Text mode error handling. Defaults to None ("strict").
+        newline: Text mode newline handling. Defaults to None (universal newlines).
+
+    Returns:
+        Asynchronous file context.
+    """
+    if mode not in ("r", "w", "a", "x", "rb", "wb", "ab", "xb"):
+        raise ValueError(
+            f"mode must be 'r', 'w', 'a' or 'x' with optional 'b', got {mode!r}"
+        )
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if read_ahead < 1:
+        raise ValueError("read_ahead must be at least 1")
+    get_executor = _executor_getter(executor, pool)
+    options = (encoding, errors, newline)
+    if mode.endswith("b"):
+        return AsyncFile(
+            file, mode, b"", chunk_size, read_ahead, get_executor(), *options
+        )
+    return AsyncFile(file, mode, "", chunk_size, read_ahead, get_executor(), *options)
+
+
+def _read_chunks(file: IO[AnyStr], chunk_size: int) -> Iterator[AnyStr]:
+    while chunk := file.read(chunk_size):
+        yield chunk
+
+
+class AsyncFile(Generic[AnyStr]):
+    """File read ahead or written behind by worker threads, returned by open.
+
+    Reads and writes must not be called concurrently.
+    """
+
+    def __init__(
+        self,
+        file: StrOrBytesPath,
+        mode: str,
+        empty: AnyStr,
+        chunk_size: int,
+        read_ahead: int,
+        executor: Optional[Executor] = None,
+        encoding: Optional[str] = None,
+        errors: Optional[str] = None,
+        newline: Optional[str] = None,
+    ):
+        """Initializes an AsyncFile that is opened when entered.
+
+        Args:
+            file: Path of the file.
+            mode: Mode without "+", ending in "b" for binary mode.
+            empty: Empty bytes or str, matching the file mode.
+            chunk_size: Bytes, or characters in text mode, per read or write.
+            read_ahead: Maximum number of chunks read ahead of the consumer.
+            executor: Shared thread pool instance. Defaults to ThreadPoolExecutor().
+            encoding: Text mode encoding. Defaults to None (locale encoding).
+            errors: Text mode error handling. Defaults to None ("strict").
+            newline: Text mode newline handling. Defaults to None (universal newlines).
+        """
+        self._name = file
+        self._mode = mode
+        self._options = (encoding, errors, newline)
+        self._empty: AnyStr = empty
+        self._chunk_size = chunk_size
+        self._read_ahead = read_ahead
+        self._executor = executor
+        self._file: Optional[IO[AnyStr]] = None
+        self._chunks: Optional[ThreadedAsyncIterator[AnyStr]] = None
+        self._chunk: AnyStr = empty
+        self._pos = 0
+        self._eof = False
+        self._pending: list[AnyStr] = []
+        self._pending_size = 0
+        self._write_future: Optional[asyncio.Future[int]] = None
+
+    @property
+    def name(self) -> StrOrBytesPath:
+        """Name of the file, as passed to open."""
+        return self._name
+
+    @property
+    def mode(self) -> str:
+        """Mode the file was opened with."""
+        return self._mode
+
+    @property
+    def closed(self) -> bool:
+        """Whether the file has been closed, or not yet opened."""
+        return self._file is None
+
+    async def __aenter__(self) -> AsyncFile[AnyStr]:
+        loop = asyncio.get_running_loop()
+        self._file = file = await loop.run_in_executor(self._executor, self.__open)
+        if self._mode.startswith("r"):
+            self._chunks = ThreadedAsyncIterator(
+                _read_chunks(file, self._chunk_size),
+                buffer_maxsize=self._read_ahead,
+                executor=self._executor,
+            )
+            try:
+                await self._chunks.__aenter__()
+            except BaseException:
+                await loop.run_in_executor(self._executor, file.close)
+                self._file = None
+                raise
+        return self
+
+    async def __aexit__(
+        self,
+        __exc_type: Optional[type[BaseException]],
+        __val: Optional[BaseException],
+        __tb: Optional[TracebackType],
+        /,
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Writes pending data and closes the file."""
+        file = self._file
+        if file is None:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            if self._chunks is not None:
+                await self._chunks.__aexit__(None, None, None)
+            else:
+                await self.__write_pending()
+                await self.__wait_written()
+        finally:
+            self._file = None
+            await loop.run_in_executor(self._executor, file.close)
+
+    async def read(self, size: int = -1) -> AnyStr:
+        """Reads up to size bytes, or characters in text mode.
+
+        Args:
+            size: Maximum amount to read. Defaults to -1 (read until the end of the file).
+
+        Returns:
+            The data read, empty at the end of the file.
+        """
+        parts: list[AnyStr] = []
+        remaining = size
+        while remaining != 0 and await self.__fill():
+            end = len(self._chunk) if remaining < 0 else self._pos + remaining
+            part = self._chunk[self._pos : end]
+            self._pos += len(part)
+            remaining -= len(part)
+            parts.append(part)
+        return self._empty.join(parts)
+
+    async def readinto(self, buffer: Union[bytearray, memoryview]) -> int:
+        """Reads into a writable buffer, in binary mode.
+
+        Returns:
+            Number of bytes read, 0 at the end of the file.
+        """
+        if not isinstance(self._empty, bytes):
+            raise io.UnsupportedOperation("readinto requires binary mode")
+        view = memoryview(buffer).cast("B")
+        size = 0
+        while size < len(view) and await self.__fill():
+            chunk = cast(bytes, self._chunk)
+            n = min(len(view) - size, len(chunk) - self._pos)
+            view[size : size + n] = chunk[self._pos : self._pos + n]
+            self._pos += n
+            size += n
+        return size
+
+    async def readline(self, size: int = -1) -> AnyStr:
+        """Reads up to and including the next newline.
+
+        Args:
+            size: Maximum amount to read. Defaults to -1 (no limit).
+
+        Returns:
+            The line, empty at the end of the file.
+        """
+        newline = "\n" if isinstance(self._empty, str) else b"\n"
+        parts: list[AnyStr] = []
+        remaining = size
+        while remaining != 0 and await self.__fill():
+            chunk = self._chunk
+            end = chunk.find(cast(AnyStr, newline), self._pos) + 1 or len(chunk)
+            if remaining >= 0:
+                end = min(end, self._pos + remaining)
+                remaining -= end - self._pos
+            parts.append(chunk[self._pos : end])
+            self._pos = end
+            if chunk[end - 1 : end] == newline:
+                break
+        return self._empty.join(parts)
+
+    def __aiter__(self) -> AsyncIterator[AnyStr]:
+        return self
+
+    async def __anext__(self) -> AnyStr:
+        line = await self.readline()
+        if not line:
+            raise StopAsyncIteration
+        return line
+
+    async def write(self, data: AnyStr) -> int:
+        """Writes data, on a worker thread once a chunk has been buffered.
+
+        Errors writing earlier chunks are raised by later calls to write, flush or aclose.
+
+        Returns:
+            Amount of data written.
+        """
+        if self._file is None:
+            raise ValueError("I/O operation on closed file")
+        if self._chunks is not None:
+            raise io.UnsupportedOperation("file is not open for writing")
+        self._pending.append(data)
+        self._pending_size += len(data)
+        if self._pending_size >= self._chunk_size:
+            await self.__write_pending()
+        return len(data)
+
+    async def flush(self) -> None:
+        """Writes pending data and flushes the file on a worker thread."""
+        file = self._file
+        if file is None or self._chunks is not None:
+            return
+        await self.__write_pending()
+        await self.__wait_written()
+        await asyncio.get_running_loop().run_in_executor(self._executor, file.flush)
+
+    def __open(self) -> IO[AnyStr]:
+        encoding, errors, newline = self._options
+        file = builtins.open(
+            self._name, self._mode, encoding=encoding, errors=errors, newline=newline
+        )
+        return cast(IO[AnyStr], file)
+
+    async def __fill(self) -> bool:
+        """Makes the current chunk hold unread data, returning False at the end."""
+        if self._file is None:
+            raise ValueError("I/O operation on closed file")
+        if self._chunks is None:
+            raise io.UnsupportedOperation("file is not open for reading")
+        if self._pos < len(self._chunk):
+            return True
+        if self._eof:
+            return False
+        try:
+            self._chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._eof = True
+            self._chunk = self._empty
+            return False
+        finally:
+            self._pos = 0
+        return True
+
+    async def __write_pending(self) -> None:
+        """Starts writing the buffered data, once the previous write has finished."""
+        if not self._pending:
+            return
+        data = self._empty.join(self._pending)
+        self._pending.clear()
+        self._pending_size = 0
+        await self.__wait_written()
+        assert self._file is not None
+        self._write_future = asyncio.get_running_loop().run_in_executor(
+            self._executor, self._file.write, data
+        )
+
+    async def __wait_written(self) -> None:
+        future, self._write_future = self._write_future, None
+        if future is not None:
+            await future
+
+
+def mmap_chunks(
+    file: StrOrBytesPath,
+    chunk_size: int = _DEFAULT_MMAP_CHUNK_SIZE,
+    *,
+    read_ahead: int = 4,
+    executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+) -> AsyncIteratorContext[memoryview]:
+    """Memory maps a file and streams read-only memoryview windows of it without copying.
+
+    A worker thread maps the file, hints the kernel to prefetch the windows up to
+    read_ahead windows ahead with madvise where available, and touches every page of a
+    window before yielding it, so page faults stall the worker thread rather than the
+    event loop. The mapping is closed when the context exits, or once the last view still
+    held by the consumer is released.
+
+    Args:
+        file: Path of the file.
+        chunk_size: Bytes per window, rounded up to a multiple of mmap.PAGESIZE. Defaults
+            to 1048576.
+        read_ahead: Maximum number of windows prefetched ahead of the consumer. Defaults
+            to 4.
+        executor: Defaults to None.
+        pool: Name of an isolated thread pool to use instead of executor, see
+            configure_pool. Defaults to None.
+
+    Returns:
+        Context of an asynchronous iterator of memoryviews.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if read_ahead < 1:
+        raise ValueError("read_ahead must be at least 1")
+    chunk_size = -(-chunk_size // mmap.PAGESIZE) * mmap.PAGESIZE
+    source = _MappedChunks(file, chunk_size, read_ahead)
+    return _MappedChunkIterator(
+        source,
+        buffer_maxsize=read_ahead,
+        executor=_executor_getter(executor, pool)(),
+    )
+
+
+class _MappedChunks(Iterator[memoryview]):
+    """Iterator of page-aligned windows of a file mapped on the first call."""
+
+    def __init__(self, file: StrOrBytesPath, chunk_size: int, read_ahead: int):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._read_ahead = read_ahead
+        self._mmap: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+        self._offset = 0
+
+    def __next__(self) -> memoryview:
+        if self._view is None:
+            self._view = self.__map()
+        offset = self._offset
+        if offset >= len(self._view):
+            raise StopIteration
+        self._offset += self._chunk_size
+        self.__prefetch(offset + self._read_ahead * self._chunk_size)
+        chunk = self._view[offset : offset + self._chunk_size]
+        # reading a byte of every page faults the window in on this thread
+        bytes(chunk[:: mmap.PAGESIZE])
+        return chunk
+
+    def close(self) -> None:
+        """Unmaps the file, unless views of it are still exported."""
+        if self._view is not None:
+            self._view.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+
+    def __map(self) -> memoryview:
+        with builtins.open(self._file, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return memoryview(b"")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+        self.__prefetch(0, self._read_ahead * self._chunk_size)
+        return memoryview(self._mmap)
+
+    def __prefetch(self, offset: int, length: Optional[int] = None) -> None:
+        """Hints the kernel to read a range of the file ahead of its page faults."""
+        if self._mmap is None or not hasattr(mmap, "MADV_WILLNEED"):
+            return
+        length = min(length or self._chunk_size, len(self._mmap) - offset)
+        if length > 0:
+            self._mmap.madvise(mmap.MADV_WILLNEED, offset, length)
+
+
+class _MappedChunkIterator(ThreadedAsyncIterator[memoryview]):
+    """Streams windows of a mapped file, unmapping it when the context exits."""
+
+    def __init__(
+        self,
+        source: _MappedChunks,
+        buffer_maxsize: int,
+        executor: Optional[Executor] = None,
+    ):
+        self._source = source
+        super().__init__(source, buffer_maxsize=buffer_maxsize, executor=executor)
+
+    @override
+    async def __aexit__(
+        self,
+        __exc_type: Optional[type[BaseException]],
+        __val: Optional[BaseException],
+        __tb: Optional[TracebackType],
+        /,
+    ) -> None:
+        try:
+            await super().__aexit__(__exc_type, __val, __tb)
+        finally:
+            if self._worker_future is not None and self._worker_future.done():
+                self._source.close()
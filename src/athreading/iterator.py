@@ -3,38 +3,34 @@
 from __future__ import annotations
 
 import asyncio
-import dataclasses
 import functools
-import queue
 import sys
-import threading
-from collections.abc import Callable, Iterator
-from concurrent.futures import ThreadPoolExecutor
-from typing import TYPE_CHECKING, Generic, Optional, TypeVar, Union
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, TypeVar, Union, cast
 
 from athreading.aliases import AsyncIteratorContext
+from athreading.channels import _Channel
+from athreading.executors import (
+    Backend,
+    ThreadMode,
+    _executor_getter,
+    _join_worker,
+    _stream_executor,
+)
+from athreading.limits import ConcurrencyLimit, _create_limit
+from athreading.processes import _mark_wrapper, _ProcessSource, _reference
 
 if sys.version_info >= (3, 12):
-    from typing import ParamSpec, overload, override
+    from typing import Never, ParamSpec, overload, override
 else:  # pragma: not covered
-    from typing_extensions import ParamSpec, overload, override
+    from typing_extensions import Never, ParamSpec, overload, override
 
 if TYPE_CHECKING:
     from types import TracebackType
 
 _ParamsT = ParamSpec("_ParamsT")
 _YieldT = TypeVar("_YieldT")
-_T = TypeVar("_T")
-
-
-class _Ok(Generic[_T]):
-    def __init__(self, value: _T):
-        self.value = value
-
-
-class _Err(Generic[_T]):
-    def __init__(self, error: _T):
-        self.error = error
 
 
 @overload
@@ -43,6 +39,12 @@ def iterate(
     *,
     buffer_maxsize: Optional[int] = None,
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    thread: ThreadMode = "pool",
+    backend: Backend = "thread",
+    max_concurrency: Optional[int] = None,
+    interrupt: Optional[Callable[[Never], None]] = None,
+    exit_timeout: Optional[float] = None,
 ) -> Callable[
     [Callable[_ParamsT, Iterator[_YieldT]]],
     Callable[_ParamsT, AsyncIteratorContext[_YieldT]],
@@ -56,6 +58,12 @@ def iterate(
     *,
     buffer_maxsize: Optional[int] = None,
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    thread: ThreadMode = "pool",
+    backend: Backend = "thread",
+    max_concurrency: Optional[int] = None,
+    interrupt: Optional[Callable[[Never], None]] = None,
+    exit_timeout: Optional[float] = None,
 ) -> Callable[_ParamsT, AsyncIteratorContext[_YieldT]]:
     ...
 
@@ -65,6 +73,12 @@ def iterate(
     *,
     buffer_maxsize: Optional[int] = None,
     executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    thread: ThreadMode = "pool",
+    backend: Backend = "thread",
+    max_concurrency: Optional[int] = None,
+    interrupt: Optional[Callable[[Never], None]] = None,
+    exit_timeout: Optional[float] = None,
 ) -> Union[
     Callable[_ParamsT, AsyncIteratorContext[_YieldT]],
     Callable[
@@ -81,15 +95,52 @@ def iterate(
             blocking and putting backpressure on the source. Defaults to None (no-limit).
 
         executor: Defaults to None.
+        pool: Name of an isolated thread pool to use instead of executor, see
+            configure_pool. Defaults to None.
+        thread: "dedicated" runs the worker on a new daemon thread named after fn instead of
+            an executor, for long-lived streams. Defaults to "pool".
+        backend: "process" runs fn in a new child process per stream, which streams pickled
+            items back through a shared memory ring, relayed by the worker thread. The ring
+            and the relayed items together hold at most buffer_maxsize items, which must be
+            at least 2, besides the one item the worker thread carries between them. fn
+            must be importable by name from its module, and its arguments and items
+            picklable. Defaults to "thread".
+        max_concurrency: Maximum number of streams holding a worker thread at once, further
+            streams wait on the event loop when entered. Defaults to None (no-limit).
+        interrupt: Called with the iterator returned by fn when the context exits before
+            the iterator is exhausted, to unblock the worker thread, e.g. by closing a
+            socket. Defaults to None.
+        exit_timeout: Maximum seconds exiting the context waits for the worker thread
+            before abandoning it with a RuntimeWarning. An abandoned thread stays busy until
+            the source returns and keeps its executor from shutting down, so without
+            executor or pool the worker runs on its own daemon thread, which neither
+            asyncio.run nor the interpreter waits for. Defaults to None (no-limit).
 
     Returns:
         Decorated iterator function with lazy argument evaluation.
     """
     return (
-        _create_iterate_decorator(buffer_maxsize=buffer_maxsize, executor=executor)
+        _create_iterate_decorator(
+            buffer_maxsize=buffer_maxsize,
+            executor=executor,
+            pool=pool,
+            thread=thread,
+            backend=backend,
+            max_concurrency=max_concurrency,
+            interrupt=interrupt,
+            exit_timeout=exit_timeout,
+        )
         if fn is None
         else _create_iterate_wrapper(
-            fn, buffer_maxsize=buffer_maxsize, executor=executor
+            fn,
+            buffer_maxsize=buffer_maxsize,
+            executor=executor,
+            pool=pool,
+            thread=thread,
+            backend=backend,
+            max_concurrency=max_concurrency,
+            interrupt=interrupt,
+            exit_timeout=exit_timeout,
         )
     )
 
@@ -99,21 +150,97 @@ def _create_iterate_wrapper(
     *,
     buffer_maxsize: Optional[int],
     executor: Optional[ThreadPoolExecutor],
+    pool: Optional[str],
+    thread: ThreadMode,
+    backend: Backend,
+    max_concurrency: Optional[int],
+    interrupt: Optional[Callable[[Never], None]],
+    exit_timeout: Optional[float],
 ) -> Callable[_ParamsT, AsyncIteratorContext[_YieldT]]:
+    get_executor = _executor_getter(
+        executor, pool, thread, getattr(fn, "__name__", "dedicated")
+    )
+    limit = _create_limit(max_concurrency)
+    interrupt_source = cast(Optional[Callable[[Iterator[_YieldT]], None]], interrupt)
+    if backend == "process":
+        if interrupt is not None:
+            raise ValueError("interrupt is not used with backend='process'")
+        return _create_process_iterate_wrapper(
+            fn,
+            buffer_maxsize=buffer_maxsize,
+            get_executor=get_executor,
+            limit=limit,
+            exit_timeout=exit_timeout,
+        )
+    elif backend != "thread":
+        raise ValueError(f"backend must be 'thread' or 'process', got {backend!r}")
+
     @functools.wraps(fn)
     def wrapper(
         *args: _ParamsT.args, **kwargs: _ParamsT.kwargs
     ) -> AsyncIteratorContext[_YieldT]:
+        iterator = fn(*args, **kwargs)
         return ThreadedAsyncIterator(
-            fn(*args, **kwargs), buffer_maxsize=buffer_maxsize, executor=executor
+            iterator,
+            buffer_maxsize=buffer_maxsize,
+            executor=get_executor(),
+            limit=limit,
+            interrupt=(
+                None
+                if interrupt_source is None
+                else functools.partial(interrupt_source, iterator)
+            ),
+            exit_timeout=exit_timeout,
         )
 
     return wrapper
 
 
+def _create_process_iterate_wrapper(
+    fn: Callable[_ParamsT, Iterator[_YieldT]],
+    *,
+    buffer_maxsize: Optional[int],
+    get_executor: Callable[[], Optional[Executor]],
+    limit: Optional[ConcurrencyLimit],
+    exit_timeout: Optional[float],
+) -> Callable[_ParamsT, AsyncIteratorContext[_YieldT]]:
+    process_fn = _reference(fn)
+    name = getattr(fn, "__name__", "stream")
+    # the ring and the relayed buffer share buffer_maxsize, as one buffer would
+    channel_maxsize = ring_maxsize = buffer_maxsize
+    if buffer_maxsize:
+        if buffer_maxsize < 2:
+            raise ValueError("buffer_maxsize must be at least 2 with backend='process'")
+        channel_maxsize = buffer_maxsize // 2
+        ring_maxsize = buffer_maxsize - channel_maxsize
+
+    @functools.wraps(fn)
+    def wrapper(
+        *args: _ParamsT.args, **kwargs: _ParamsT.kwargs
+    ) -> AsyncIteratorContext[_YieldT]:
+        source = _ProcessSource(process_fn, args, kwargs, ring_maxsize, name)
+        return _ProcessIterator(
+            source,
+            buffer_maxsize=channel_maxsize,
+            executor=get_executor(),
+            limit=limit,
+            interrupt=source.interrupt,
+            exit_timeout=exit_timeout,
+        )
+
+    _mark_wrapper(wrapper)
+    return wrapper
+
+
 def _create_iterate_decorator(
     buffer_maxsize: Optional[int],
     executor: Optional[ThreadPoolExecutor],
+    pool: Optional[str],
+    thread: ThreadMode,
+    backend: Backend,
+    max_concurrency: Optional[int],
+    interrupt: Optional[Callable[[Never], None]],
+    exit_timeout: Optional[float],
 ) -> Callable[
     [Callable[_ParamsT, Iterator[_YieldT]]],
     Callable[_ParamsT, AsyncIteratorContext[_YieldT]],
@@ -122,18 +249,20 @@ def _create_iterate_decorator(
         fn: Callable[_ParamsT, Iterator[_YieldT]],
     ) -> Callable[_ParamsT, AsyncIteratorContext[_YieldT]]:
         return _create_iterate_wrapper(
-            fn, buffer_maxsize=buffer_maxsize, executor=executor
+            fn,
+            buffer_maxsize=buffer_maxsize,
+            executor=executor,
+            pool=pool,
+            thread=thread,
+            backend=backend,
+            max_concurrency=max_concurrency,
+            interrupt=interrupt,
+            exit_timeout=exit_timeout,
         )
 
     return decorator
 
 
-@dataclasses.dataclass
-class _Result(Generic[_T]):
-    value: _T | None
-    error: Exception | None
-
-
 class ThreadedAsyncIterator(AsyncIteratorContext[_YieldT]):
     """Wraps a synchronous iterator with an executor and exposes an AsyncIteratorContext."""
 
@@ -141,7 +270,10 @@ class ThreadedAsyncIterator(AsyncIteratorContext[_YieldT]):
         self,
         iterator: Iterator[_YieldT],
         buffer_maxsize: Optional[int] = None,
-        executor: Optional[ThreadPoolExecutor] = None,
+        executor: Optional[Executor] = None,
+        limit: Optional[ConcurrencyLimit] = None,
+        interrupt: Optional[Callable[[], None]] = None,
+        exit_timeout: Optional[float] = None,
     ):
         """Initilizes a ThreadedAsyncIterator from a synchronous iterator.
 
@@ -150,22 +282,41 @@ class ThreadedAsyncIterator(AsyncIteratorContext[_YieldT]):
             buffer_maxsize: Maximum number of items the background worker will buffer before
                 blocking and putting backpressure on the source. Defaults to None (no-limit).
             executor: Shared thread pool instance. Defaults to ThreadPoolExecutor().
+            limit: Concurrency limit held from entering the context until the worker thread
+                is released. Defaults to None.
+            interrupt: Called when the context exits before the iterator is exhausted, to
+                unblock the worker thread. Errors the iterator then raises are suppressed.
+                Defaults to None.
+            exit_timeout: Maximum seconds exiting the context waits for the worker thread
+                before abandoning it with a RuntimeWarning. Without executor, the worker
+                then runs on a daemon thread. Defaults to None (no-limit).
         """
-        self._yield_semaphore = asyncio.Semaphore(0)
-        self._done_event = threading.Event()
-        self._queue: queue.Queue[_Ok[_YieldT] | _Err[Exception]] = queue.Queue(
-            buffer_maxsize or 0
-        )
+        self._channel: _Channel[_YieldT] = _Channel(buffer_maxsize)
         self._iterator = iterator
-        self._executor = executor
+        self._executor = _stream_executor(executor, exit_timeout)
+        self._limit = limit
+        self._interrupt = interrupt
+        self._exit_timeout = exit_timeout
         self._worker_future: Optional[asyncio.Future[None]] = None
 
     @override
     async def __aenter__(self) -> ThreadedAsyncIterator[_YieldT]:
         self._loop = asyncio.get_running_loop()
-        self._worker_future = self._loop.run_in_executor(
-            self._executor, self.__worker_threadsafe
-        )
+        self._channel.open(self._loop)
+        if self._limit is None:
+            self._worker_future = self._loop.run_in_executor(
+                self._executor, self.__worker_threadsafe
+            )
+            return self
+        await self._limit.acquire()
+        try:
+            self._worker_future = self._loop.run_in_executor(
+                self._executor, self.__worker_threadsafe
+            )
+        except BaseException:
+            self._limit.release()
+            raise
+        self._limit._release_when_done(self._worker_future)
         return self
 
     @override
@@ -177,39 +328,93 @@ class ThreadedAsyncIterator(AsyncIteratorContext[_YieldT]):
         /,
     ) -> None:
         assert self._worker_future is not None
-        self._done_event.set()
-        self._yield_semaphore.release()
-        await self._worker_future
+        exhausted = self._channel.done
+        self._channel.close()
+        await _join_worker(
+            self._worker_future,
+            None if exhausted else self._interrupt,
+            self._exit_timeout,
+        )
 
     async def __anext__(self) -> _YieldT:
         assert (
             self._worker_future is not None
         ), "Iteration started before entering context"
-        if not self._done_event.is_set() or not self._queue.empty():
-            await self._yield_semaphore.acquire()
-            if not self._queue.empty():
-                result = self._queue.get(False)
-                if isinstance(result, _Err):
-                    raise result.error
-                return result.value
-        raise StopAsyncIteration
+        return await self._channel.next()
+
+    @override
+    async def batches(
+        self, max_items: int, max_latency: Optional[float] = None
+    ) -> AsyncIterator[list[_YieldT]]:
+        """Iterates over the stream in lists of up to max_items items, taking every
+        buffered item from the queue at once.
+
+        Args:
+            max_items: Maximum number of items per batch.
+            max_latency: Maximum seconds to wait for a batch to fill once its first item
+                has arrived. Defaults to None (wait for max_items or the end of the stream).
+
+        Yields:
+            Non-empty lists of items in stream order.
+        """
+        assert (
+            self._worker_future is not None
+        ), "Iteration started before entering context"
+        if max_items < 1:
+            raise ValueError("max_items must be at least 1")
+        while True:
+            batch = await self._channel.batch(max_items, max_latency)
+            if not batch:
+                return
+            yield batch
 
     def __worker_threadsafe(self) -> None:
-        """Stream the synchronous iterator to the queue and notify the async thread."""
+        """Stream the synchronous iterator to the channel."""
+        error: Optional[Exception] = None
         try:
             for item in self._iterator:
-                self._queue.put(_Ok(item))
-                self._loop.call_soon_threadsafe(self._yield_semaphore.release)
-
-                while self._queue.full() and not self._done_event.is_set():
-                    with self._queue.not_full:
-                        self._queue.not_full.wait(timeout=0.1)
-
-                if self._done_event.is_set():
+                self._channel.put(item)
+                if self._channel.closed:
                     break
         except Exception as e:  # noqa: BLE001
-            self._queue.put(_Err(e))
-            self._loop.call_soon_threadsafe(self._yield_semaphore.release)
+            error = e
+        finally:
+            self._channel.finish(error)
+
+
+class _ProcessIterator(ThreadedAsyncIterator[_YieldT]):
+    """Relays the items of a child process, freeing its ring when the context exits."""
+
+    def __init__(
+        self,
+        source: _ProcessSource,
+        buffer_maxsize: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        limit: Optional[ConcurrencyLimit] = None,
+        interrupt: Optional[Callable[[], None]] = None,
+        exit_timeout: Optional[float] = None,
+    ):
+        self._source = source
+        super().__init__(
+            cast(Iterator[_YieldT], source),
+            buffer_maxsize=buffer_maxsize,
+            executor=executor,
+            limit=limit,
+            interrupt=interrupt,
+            exit_timeout=exit_timeout,
+        )
+
+    @override
+    async def __aexit__(
+        self,
+        __exc_type: Optional[type[BaseException]],
+        __val: Optional[BaseException],
+        __tb: Optional[TracebackType],
+        /,
+    ) -> None:
+        try:
+            await super().__aexit__(__exc_type, __val, __tb)
         finally:
-            self._done_event.set()
-            self._loop.call_soon_threadsafe(self._yield_semaphore.release)
+            # a worker that stopped early never read the end of the stream, which frees it
+            if self._worker_future is not None and self._worker_future.done():
+                await self._loop.run_in_executor(self._executor, self._source.close)
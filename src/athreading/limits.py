@@ -0,0 +1,81 @@
+"""Concurrency utilities."""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import TYPE_CHECKING, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+__all__ = ["ConcurrencyLimit"]
+
+_T = TypeVar("_T")
+
+
+class ConcurrencyLimit:
+    """Caps how many invocations or streams hold a worker thread at once.
+
+    Callers over the limit wait on the event loop rather than in the executor work queue, so
+    the executor stays free for other functions. The limit applies per event loop.
+    """
+
+    def __init__(self, max_concurrency: int):
+        """Initializes a ConcurrencyLimit.
+
+        Args:
+            max_concurrency: Maximum number of concurrent holders.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._max_concurrency = max_concurrency
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+    @property
+    def max_concurrency(self) -> int:
+        """Maximum number of concurrent holders."""
+        return self._max_concurrency
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(
+                self._max_concurrency
+            )
+        return semaphore
+
+    def locked(self) -> bool:
+        """Whether the limit is reached on the running event loop."""
+        return self._semaphore().locked()
+
+    async def acquire(self) -> None:
+        """Waits for a free slot on the running event loop."""
+        await self._semaphore().acquire()
+
+    def release(self) -> None:
+        """Frees a slot on the running event loop."""
+        self._semaphore().release()
+
+    def _release_when_done(self, future: asyncio.Future[_T]) -> None:
+        """Holds an acquired slot until future completes."""
+        future.add_done_callback(lambda _: self.release())
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(
+        self,
+        __exc_type: Optional[type[BaseException]],
+        __val: Optional[BaseException],
+        __tb: Optional[TracebackType],
+        /,
+    ) -> None:
+        self.release()
+
+
+def _create_limit(max_concurrency: Optional[int]) -> Optional[ConcurrencyLimit]:
+    return None if max_concurrency is None else ConcurrencyLimit(max_concurrency)
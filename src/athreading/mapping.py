@@ -0,0 +1,179 @@
+"""Map utilities."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Generic, Optional, TypeVar
+
+from athreading.aliases import AsyncIteratorContext
+from athreading.executors import _executor_getter
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:  # pragma: not covered
+    from typing_extensions import override
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+__all__ = ["ThreadedAsyncMap", "map"]
+
+_ArgT = TypeVar("_ArgT")
+_ResultT = TypeVar("_ResultT")
+
+# the worker count of a default ThreadPoolExecutor
+_DEFAULT_CONCURRENCY = min(32, (os.cpu_count() or 1) + 4)
+
+
+def map(
+    fn: Callable[[_ArgT], _ResultT],
+    iterable: Iterable[_ArgT],
+    *,
+    concurrency: int = _DEFAULT_CONCURRENCY,
+    ordered: bool = True,
+    executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+) -> AsyncIteratorContext[_ResultT]:
+    """Calls a synchronous function on every item of an iterable with an executor and
+    exposes an AsyncIteratorContext of the results.
+
+    Items are taken from the iterable only as calls complete, so at most concurrency calls
+    and their results are held at once however long the iterable is. Unlike gathering a
+    coroutine per item, neither memory use nor the executor queue grows with the input.
+
+    Args:
+        fn: Synchronous function of one item.
+        iterable: Items to call fn on, taken lazily on the event loop.
+        concurrency: Maximum number of calls in flight. Defaults to the worker count of a
+            default ThreadPoolExecutor.
+        ordered: Whether to yield results in input order, holding up to concurrency
+            completed results back while an earlier call runs, or in completion order.
+            Defaults to True.
+        executor: Defaults to None.
+        pool: Name of an isolated thread pool to use instead of executor, see
+            configure_pool. Defaults to None.
+
+    Returns:
+        Context of an asynchronous iterator of results. Errors raised by fn are raised in
+        place of their results.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    return ThreadedAsyncMap(
+        fn,
+        iterable,
+        concurrency=concurrency,
+        ordered=ordered,
+        executor=_executor_getter(executor, pool)(),
+    )
+
+
+class ThreadedAsyncMap(AsyncIteratorContext[_ResultT], Generic[_ArgT, _ResultT]):
+    """Calls a synchronous function on the items of an iterable with an executor and
+    exposes an AsyncIteratorContext of the results.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[_ArgT], _ResultT],
+        iterable: Iterable[_ArgT],
+        concurrency: int = _DEFAULT_CONCURRENCY,
+        ordered: bool = True,
+        executor: Optional[Executor] = None,
+    ):
+        """Initilizes a ThreadedAsyncMap from a function and an iterable.
+
+        Args:
+            fn: Synchronous function of one item.
+            iterable: Items to call fn on, taken lazily on the event loop.
+            concurrency: Maximum number of calls in flight. Defaults to the worker count of
+                a default ThreadPoolExecutor.
+            ordered: Whether to yield results in input order rather than completion order.
+                Defaults to True.
+            executor: Shared thread pool instance. Defaults to ThreadPoolExecutor().
+        """
+        self._fn = fn
+        self._iterable = iterable
+        self._concurrency = concurrency
+        self._ordered = ordered
+        self._executor = executor
+        self._inputs: Optional[Iterator[_ArgT]] = None
+        # calls in input order, or in completion order once completed if unordered
+        self._running: deque[asyncio.Future[_ResultT]] = deque()
+        self._completed: deque[asyncio.Future[_ResultT]] = deque()
+        self._waiter: Optional[asyncio.Future[None]] = None
+
+    @override
+    async def __aenter__(self) -> ThreadedAsyncMap[_ArgT, _ResultT]:
+        self._loop = asyncio.get_running_loop()
+        self._inputs = iter(self._iterable)
+        self.__submit()
+        return self
+
+    @override
+    async def __aexit__(
+        self,
+        __exc_type: Optional[type[BaseException]],
+        __val: Optional[BaseException],
+        __tb: Optional[TracebackType],
+        /,
+    ) -> None:
+        self._inputs = iter(())
+        in_flight = (*self._running, *self._completed)
+        if in_flight:
+            await asyncio.wait(in_flight)
+        for future in in_flight:
+            # results of abandoned calls, including errors, are discarded
+            if not future.cancelled():
+                future.exception()
+        self._running.clear()
+        self._completed.clear()
+
+    @override
+    async def __anext__(self) -> _ResultT:
+        assert self._inputs is not None, "Iteration started before entering context"
+        if self._ordered:
+            while self._running and not self._running[0].done():
+                await self.__wait()
+            if not self._running:
+                raise StopAsyncIteration
+            future = self._running.popleft()
+        else:
+            while not self._completed:
+                if not self._running:
+                    raise StopAsyncIteration
+                await self.__wait()
+            future = self._completed.popleft()
+        self.__submit()
+        return future.result()
+
+    def __submit(self) -> None:
+        """Starts calls on items taken from the iterable until concurrency are in flight."""
+        assert self._inputs is not None
+        while len(self._running) + len(self._completed) < self._concurrency:
+            try:
+                item = next(self._inputs)
+            except StopIteration:
+                return
+            future = self._loop.run_in_executor(self._executor, self._fn, item)
+            future.add_done_callback(self.__on_done)
+            self._running.append(future)
+
+    def __on_done(self, future: asyncio.Future[_ResultT]) -> None:
+        if not self._ordered:
+            self._running.remove(future)
+            self._completed.append(future)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def __wait(self) -> None:
+        self._waiter = self._loop.create_future()
+        try:
+            await self._waiter
+        finally:
+            self._waiter = None
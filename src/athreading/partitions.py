@@ -0,0 +1,206 @@
+"""Partitioned iteration utilities."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Generic, Optional, TypeVar
+
+from athreading.aliases import AsyncIteratorContext
+from athreading.combinators import _ChannelSource, _wait_any
+from athreading.executors import _executor_getter
+from athreading.iterator import ThreadedAsyncIterator
+from athreading.mapping import _DEFAULT_CONCURRENCY
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:  # pragma: not covered
+    from typing_extensions import override
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+__all__ = ["ThreadedAsyncPartitions", "iterate_partitions"]
+
+_PartitionT = TypeVar("_PartitionT")
+_YieldT = TypeVar("_YieldT")
+
+
+def iterate_partitions(
+    fn: Callable[[_PartitionT], Iterable[_YieldT]],
+    partitions: Iterable[_PartitionT],
+    *,
+    workers: int = _DEFAULT_CONCURRENCY,
+    buffer_maxsize: int = 64,
+    ordered: bool = False,
+    executor: Optional[ThreadPoolExecutor] = None,
+    pool: Optional[str] = None,
+    exit_timeout: Optional[float] = None,
+) -> AsyncIteratorContext[_YieldT]:
+    """Iterates fn(partition) for the partitions of a source on up to workers threads at
+    once and exposes one AsyncIteratorContext of their items.
+
+    Every partition is iterated on its own worker with its own buffer, so a partition that
+    is not being consumed blocks only its own thread. The next partition starts once one
+    ends. Items of a partition always keep their order.
+
+    Args:
+        fn: Synchronous function returning an iterator or iterable of the items of a
+            partition, called on the worker thread.
+        partitions: Partitions, such as file names or key ranges, taken lazily on the
+            event loop.
+        workers: Maximum number of partitions iterated at once. Defaults to the worker
+            count of a default ThreadPoolExecutor.
+        buffer_maxsize: Maximum number of items each partition buffers before blocking its
+            worker. Defaults to 64.
+        ordered: Whether to yield the partitions one after another in input order, while
+            the following partitions fill their buffers, rather than interleaving the items
+            of every partition as they arrive. Defaults to False.
+        executor: Defaults to None.
+        pool: Name of an isolated thread pool to use instead of executor, see
+            configure_pool. Defaults to None.
+        exit_timeout: Maximum seconds exiting the context waits for each worker thread
+            before abandoning it with a RuntimeWarning. Without executor or pool, the
+            workers then run on daemon threads. Defaults to None (no-limit).
+
+    Returns:
+        Context of an asynchronous iterator of items. Errors of a partition are raised in
+        place of its next item, and end that partition only.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if buffer_maxsize < 1:
+        raise ValueError("buffer_maxsize must be at least 1")
+    return ThreadedAsyncPartitions(
+        fn,
+        partitions,
+        workers=workers,
+        buffer_maxsize=buffer_maxsize,
+        ordered=ordered,
+        executor=_executor_getter(executor, pool)(),
+        exit_timeout=exit_timeout,
+    )
+
+
+def _iterate_partition(
+    fn: Callable[[_PartitionT], Iterable[_YieldT]], partition: _PartitionT
+) -> Iterator[_YieldT]:
+    """Calls fn on the first item request, so that it runs on the worker thread."""
+    yield from fn(partition)
+
+
+class ThreadedAsyncPartitions(
+    AsyncIteratorContext[_YieldT], Generic[_PartitionT, _YieldT]
+):
+    """Iterates the partitions of a source on several worker threads and exposes an
+    AsyncIteratorContext of their items.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[_PartitionT], Iterable[_YieldT]],
+        partitions: Iterable[_PartitionT],
+        workers: int = _DEFAULT_CONCURRENCY,
+        buffer_maxsize: int = 64,
+        ordered: bool = False,
+        executor: Optional[Executor] = None,
+        exit_timeout: Optional[float] = None,
+    ):
+        """Initilizes a ThreadedAsyncPartitions from a function and partitions.
+
+        Args:
+            fn: Synchronous function returning the items of a partition.
+            partitions: Partitions, taken lazily on the event loop.
+            workers: Maximum number of partitions iterated at once. Defaults to the worker
+                count of a default ThreadPoolExecutor.
+            buffer_maxsize: Maximum number of items each partition buffers before blocking
+                its worker. Defaults to 64.
+            ordered: Whether to yield the partitions one after another in input order.
+                Defaults to False.
+            executor: Shared thread pool instance. Defaults to ThreadPoolExecutor().
+            exit_timeout: Maximum seconds exiting the context waits for each worker thread
+                before abandoning it with a RuntimeWarning. Defaults to None (no-limit).
+        """
+        self._fn = fn
+        self._partitions = partitions
+        self._workers = workers
+        self._buffer_maxsize = buffer_maxsize
+        self._ordered = ordered
+        self._executor = executor
+        self._exit_timeout = exit_timeout
+        self._pending: Optional[Iterator[_PartitionT]] = None
+        # partitions being iterated, in input order
+        self._streams: list[ThreadedAsyncIterator[_YieldT]] = []
+        self._sources: list[_ChannelSource[_YieldT]] = []
+        self._next = 0
+
+    @override
+    async def __aenter__(self) -> ThreadedAsyncPartitions[_PartitionT, _YieldT]:
+        self._pending = iter(self._partitions)
+        await self.__start()
+        return self
+
+    @override
+    async def __aexit__(
+        self,
+        __exc_type: Optional[type[BaseException]],
+        __val: Optional[BaseException],
+        __tb: Optional[TracebackType],
+        /,
+    ) -> None:
+        self._pending = iter(())
+        streams, self._streams, self._sources = self._streams, [], []
+        for stream in streams:
+            await stream.__aexit__(__exc_type, __val, __tb)
+
+    @override
+    async def __anext__(self) -> _YieldT:
+        assert self._pending is not None, "Iteration started before entering context"
+        while self._sources:
+            sources = self._sources[:1] if self._ordered else self._sources
+            for _ in range(len(sources)):
+                index = self._next % len(sources)
+                try:
+                    item = sources[index].poll()
+                except IndexError:
+                    self._next = index + 1
+                    continue
+                except StopAsyncIteration:
+                    self._next = index
+                    await self.__finish(index)
+                    break
+                except BaseException:
+                    self._next = index
+                    await self.__finish(index)
+                    raise
+                self._next = index + 1
+                return item
+            else:
+                await _wait_any(sources)
+        raise StopAsyncIteration
+
+    async def __start(self) -> None:
+        """Starts partitions until workers are being iterated."""
+        assert self._pending is not None
+        while len(self._streams) < self._workers:
+            try:
+                partition = next(self._pending)
+            except StopIteration:
+                return
+            stream = ThreadedAsyncIterator(
+                _iterate_partition(self._fn, partition),
+                buffer_maxsize=self._buffer_maxsize,
+                executor=self._executor,
+                exit_timeout=self._exit_timeout,
+            )
+            await stream.__aenter__()
+            self._streams.append(stream)
+            self._sources.append(_ChannelSource(stream._channel))
+
+    async def __finish(self, index: int) -> None:
+        """Joins the worker of an ended partition and starts the next partition."""
+        stream = self._streams.pop(index)
+        del self._sources[index]
+        await stream.__aexit__(None, None, None)
+        await self.__start()
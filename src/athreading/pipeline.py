@@ -0,0 +1,363 @@
+"""Pipeline utilities."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import sys
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Generic, Optional, TypeVar, Union, cast
+
+from athreading.aliases import AsyncIteratorContext
+from athreading.executors import _DedicatedThreadExecutor, _join_worker
+from athreading.iterator import ThreadedAsyncIterator
+
+if sys.version_info >= (3, 12):
+    from typing import Never, overload, override
+else:  # pragma: not covered
+    from typing_extensions import Never, overload, override
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+__all__ = ["ThreadedAsyncPipeline", "pipeline"]
+
+_T = TypeVar("_T")
+_T1 = TypeVar("_T1")
+_T2 = TypeVar("_T2")
+_T3 = TypeVar("_T3")
+_T4 = TypeVar("_T4")
+
+_Stage = Callable[[object], object]
+
+
+class _End:
+    """Marks the end of a pipe for one reader."""
+
+    __slots__ = ()
+
+
+_END = _End()
+
+
+@overload
+def pipeline(
+    source: Iterable[_T1],
+    /,
+    *,
+    workers: Union[int, Sequence[int]] = 1,
+    buffer: int = 64,
+    exit_timeout: Optional[float] = None,
+) -> AsyncIteratorContext[_T1]:
+    ...
+
+
+@overload
+def pipeline(
+    source: Iterable[_T1],
+    stage1: Callable[[_T1], _T2],
+    /,
+    *,
+    workers: Union[int, Sequence[int]] = 1,
+    buffer: int = 64,
+    exit_timeout: Optional[float] = None,
+) -> AsyncIteratorContext[_T2]:
+    ...
+
+
+@overload
+def pipeline(
+    source: Iterable[_T1],
+    stage1: Callable[[_T1], _T2],
+    stage2: Callable[[_T2], _T3],
+    /,
+    *,
+    workers: Union[int, Sequence[int]] = 1,
+    buffer: int = 64,
+    exit_timeout: Optional[float] = None,
+) -> AsyncIteratorContext[_T3]:
+    ...
+
+
+@overload
+def pipeline(
+    source: Iterable[_T1],
+    stage1: Callable[[_T1], _T2],
+    stage2: Callable[[_T2], _T3],
+    stage3: Callable[[_T3], _T4],
+    /,
+    *,
+    workers: Union[int, Sequence[int]] = 1,
+    buffer: int = 64,
+    exit_timeout: Optional[float] = None,
+) -> AsyncIteratorContext[_T4]:
+    ...
+
+
+@overload
+def pipeline(
+    source: Iterable[object],
+    /,
+    *stages: Callable[[Never], object],
+    workers: Union[int, Sequence[int]] = 1,
+    buffer: int = 64,
+    exit_timeout: Optional[float] = None,
+) -> AsyncIteratorContext[object]:
+    ...
+
+
+def pipeline(
+    source: Iterable[object],
+    /,
+    *stages: Callable[[Never], object],
+    workers: Union[int, Sequence[int]] = 1,
+    buffer: int = 64,
+    exit_timeout: Optional[float] = None,
+) -> AsyncIteratorContext[object]:
+    """Streams an iterable through synchronous stage functions on worker threads connected
+    by bounded queues and exposes an AsyncIteratorContext of the last stage's results.
+
+    The source and every stage run on their own daemon threads, so stages overlap and items
+    pass between them without returning to the event loop. Only the results of the last
+    stage are handed to the event loop.
+
+    Args:
+        source: Synchronous iterator or iterable.
+        *stages: Functions applied in turn to every item.
+        workers: Number of threads running each stage, or one count per stage. Stages with
+            more than one thread may reorder items. Defaults to 1.
+        buffer: Maximum number of items queued between adjacent stages and for the event
+            loop. Defaults to 64.
+        exit_timeout: Maximum seconds exiting the context waits for each thread before
+            abandoning it with a RuntimeWarning. Defaults to None (no-limit).
+
+    Returns:
+        Context of an asynchronous iterator of results.
+    """
+    counts = [workers] * len(stages) if isinstance(workers, int) else list(workers)
+    if len(counts) != len(stages):
+        raise ValueError(f"workers has {len(counts)} counts for {len(stages)} stages")
+    if any(count < 1 for count in counts):
+        raise ValueError("workers must be at least 1")
+    if buffer < 1:
+        raise ValueError("buffer must be at least 1")
+    return ThreadedAsyncPipeline(
+        source,
+        [cast(_Stage, stage) for stage in stages],
+        counts,
+        buffer=buffer,
+        exit_timeout=exit_timeout,
+    )
+
+
+class _Stop:
+    """Stop flag of a pipeline, waking the threads blocked on its pipes when set."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._wakers: list[Callable[[], None]] = []
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
+    def set(self) -> None:
+        self._event.set()
+        for wake in self._wakers:
+            wake()
+
+    def add_waker(self, wake: Callable[[], None]) -> None:
+        """Calls wake when the flag is set."""
+        self._wakers.append(wake)
+
+
+class _Pipe(Generic[_T]):
+    """Bounded queue between pipeline threads, ended once every writer has finished."""
+
+    def __init__(self, maxsize: int, writers: int, readers: int, stop: _Stop):
+        self._items: deque[Union[_T, _End]] = deque()
+        self._maxsize = maxsize
+        self._writers = writers
+        self._readers = readers
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._stop = stop
+        stop.add_waker(self.wake)
+
+    def put(self, item: Union[_T, _End]) -> bool:
+        """Queues an item, blocking while the pipe is full.
+
+        Returns:
+            False if the pipeline stopped first.
+        """
+        with self._lock:
+            while len(self._items) >= self._maxsize and not self._stop.is_set():
+                self._not_full.wait()
+            if self._stop.is_set():
+                return False
+            self._items.append(item)
+            self._not_empty.notify()
+            return True
+
+    def finish(self) -> None:
+        """Ends the pipe for every reader once the last writer has finished."""
+        with self._lock:
+            self._writers -= 1
+            if self._writers:
+                return
+        for _ in range(self._readers):
+            if not self.put(_END):
+                return
+
+    def wake(self) -> None:
+        """Wakes every thread blocked on the pipe, to notice the pipeline stopped."""
+        with self._lock:
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def __iter__(self) -> Iterator[_T]:
+        """Takes items until the pipe ends or the pipeline stops."""
+        while True:
+            with self._lock:
+                while not self._items and not self._stop.is_set():
+                    self._not_empty.wait()
+                if not self._items:
+                    return
+                item = self._items.popleft()
+                self._not_full.notify()
+            if isinstance(item, _End):
+                return
+            yield item
+
+
+class ThreadedAsyncPipeline(ThreadedAsyncIterator[object]):
+    """Runs an iterable through stage functions on threads connected by bounded queues
+    and exposes an AsyncIteratorContext of the results.
+    """
+
+    def __init__(
+        self,
+        source: Iterable[object],
+        stages: Sequence[Callable[[object], object]],
+        workers: Sequence[int],
+        buffer: int = 64,
+        exit_timeout: Optional[float] = None,
+    ):
+        """Initilizes a ThreadedAsyncPipeline from a source and stage functions.
+
+        Args:
+            source: Synchronous iterator or iterable.
+            stages: Functions applied in turn to every item.
+            workers: Number of threads running each stage.
+            buffer: Maximum number of items queued between adjacent stages and for the
+                event loop. Defaults to 64.
+            exit_timeout: Maximum seconds exiting the context waits for each thread before
+                abandoning it with a RuntimeWarning. Defaults to None (no-limit).
+        """
+        self._stop = _Stop()
+        self._errors: list[BaseException] = []
+        self._threads: list[tuple[Callable[[], None], str]] = []
+        self._thread_futures: list[Future[None]] = []
+        # the last stage runs on the stream worker when it has a single thread
+        tail: Optional[Callable[[object], object]] = None
+        if stages and workers[-1] == 1:
+            *stages, tail = stages
+            workers = workers[:-1]
+        if stages or tail is not None:
+            readers = [*workers, 1]
+            pipe: _Pipe[object] = _Pipe(buffer, 1, readers[0], self._stop)
+            self._threads.append(
+                (functools.partial(self.__run_source, source, pipe), "source")
+            )
+            for stage, count, next_readers in zip(stages, workers, readers[1:]):
+                out: _Pipe[object] = _Pipe(buffer, count, next_readers, self._stop)
+                run = functools.partial(self.__run_stage, stage, pipe, out)
+                name = getattr(stage, "__name__", "stage")
+                self._threads.extend([(run, name)] * count)
+                pipe = out
+            source = self.__tail(pipe, tail)
+        super().__init__(
+            iter(source),
+            buffer_maxsize=buffer,
+            executor=_DedicatedThreadExecutor("athreading-pipeline"),
+            interrupt=self._stop.set,
+            exit_timeout=exit_timeout,
+        )
+
+    @override
+    async def __aenter__(self) -> ThreadedAsyncPipeline:
+        for index, (run, name) in enumerate(self._threads):
+            executor = _DedicatedThreadExecutor(f"athreading-pipeline-{index}-{name}")
+            self._thread_futures.append(executor.submit(run))
+        try:
+            await super().__aenter__()
+        except BaseException:
+            self._stop.set()
+            raise
+        return self
+
+    @override
+    async def __aexit__(
+        self,
+        __exc_type: Optional[type[BaseException]],
+        __val: Optional[BaseException],
+        __tb: Optional[TracebackType],
+        /,
+    ) -> None:
+        try:
+            await super().__aexit__(__exc_type, __val, __tb)
+        finally:
+            self._stop.set()
+            for future in self._thread_futures:
+                await _join_worker(
+                    asyncio.wrap_future(future), None, self._exit_timeout
+                )
+
+    def __run_source(self, source: Iterable[object], out: _Pipe[object]) -> None:
+        iterator = iter(source)
+        try:
+            for item in iterator:
+                if not out.put(item):
+                    return
+            out.finish()
+        except BaseException as e:  # noqa: BLE001
+            self.__fail(e)
+        finally:
+            close: Optional[Callable[[], None]] = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def __run_stage(
+        self, stage: Callable[[object], object], pipe: _Pipe[object], out: _Pipe[object]
+    ) -> None:
+        try:
+            for item in pipe:
+                if not out.put(stage(item)):
+                    return
+            if not self._stop.is_set():
+                out.finish()
+        except BaseException as e:  # noqa: BLE001
+            self.__fail(e)
+
+    def __tail(
+        self, pipe: _Pipe[object], stage: Optional[Callable[[object], object]]
+    ) -> Iterator[object]:
+        """Takes the results of the last pipe, applying the last stage if it has one thread."""
+        try:
+            if stage is None:
+                yield from pipe
+            else:
+                for item in pipe:
+                    yield stage(item)
+        except BaseException:
+            self._stop.set()
+            raise
+        if self._errors:
+            raise self._errors[0]
+
+    def __fail(self, error: BaseException) -> None:
+        self._errors.append(error)
+        self._stop.set()
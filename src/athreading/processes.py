@@ -0,0 +1,506 @@
+"""Process utilities."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import dataclasses
+import functools
+import importlib
+import multiprocessing
+import pickle
+import struct
+import sys
+import threading
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import Executor
+from multiprocessing.process import BaseProcess
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Condition
+from typing import Optional
+
+# buffers smaller than this are cheaper to pickle than to map
+_SHARED_MEMORY_MIN_SIZE = 64 * 1024
+_WRAPPER_MARKER = "__athreading_process_wrapper__"
+
+
+@dataclasses.dataclass(frozen=True)
+class _FunctionRef:
+    """Importable name of a function, which stays valid after decorating it in place."""
+
+    module: str
+    qualname: str
+
+
+@dataclasses.dataclass(frozen=True)
+class _SharedBuffer:
+    """Buffer argument or result copied into a shared memory segment."""
+
+    name: str
+    nbytes: int
+    kind: str
+    dtype: Optional[str] = None
+    shape: tuple[int, ...] = ()
+
+
+@dataclasses.dataclass(frozen=True)
+class _InlineView:
+    """Small memoryview argument or result, copied since memoryviews cannot be pickled."""
+
+    data: bytes
+
+
+def _reference(fn: object) -> object:
+    """Refers to fn by name when it can be imported in a worker process."""
+    module = getattr(fn, "__module__", None)
+    qualname = getattr(fn, "__qualname__", None)
+    if module is None or qualname is None or "<" in qualname:
+        return fn
+    return _FunctionRef(module, qualname)
+
+
+def _mark_wrapper(wrapper: object) -> None:
+    """Marks a process backend wrapper, so workers resolving its name unwrap it."""
+    setattr(wrapper, _WRAPPER_MARKER, True)
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve(ref: _FunctionRef) -> object:
+    """Imports the synchronous function behind a name, which may be bound to its wrapper."""
+    obj: object = importlib.import_module(ref.module)
+    for attr in ref.qualname.split("."):
+        obj = getattr(obj, attr)
+    if getattr(obj, _WRAPPER_MARKER, False):
+        obj = getattr(obj, "__wrapped__")
+    return obj
+
+
+def _buffer_kind(value: object) -> Optional[str]:
+    if isinstance(value, bytes):
+        return "bytes"
+    if isinstance(value, bytearray):
+        return "bytearray"
+    if isinstance(value, memoryview):
+        return "memoryview"
+    # only arrays of an already imported numpy can be passed, so never import it here
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        return "ndarray"
+    return None
+
+
+def _share(value: object, segments: list[SharedMemory]) -> object:
+    """Copies a large buffer into a new shared memory segment appended to segments.
+
+    Returns:
+        A _SharedBuffer for large buffers, an _InlineView for small memoryviews, otherwise
+        value.
+    """
+    kind = _buffer_kind(value)
+    if kind is None:
+        return value
+    dtype: Optional[str] = None
+    shape: tuple[int, ...] = ()
+    if kind == "ndarray":
+        array = sys.modules["numpy"].ascontiguousarray(value)
+        if array.dtype.hasobject:
+            return value
+        dtype, shape, value = array.dtype.str, array.shape, array
+    with memoryview(value) as view:  # type: ignore[arg-type]
+        nbytes = view.nbytes
+        if nbytes < _SHARED_MEMORY_MIN_SIZE:
+            return _InlineView(view.tobytes()) if kind == "memoryview" else value
+        shm = SharedMemory(create=True, size=nbytes)
+        segments.append(shm)
+        buf = shm.buf
+        assert buf is not None
+        with view.cast("B") as data:
+            buf[:nbytes] = data
+    return _SharedBuffer(shm.name, nbytes, kind, dtype, shape)
+
+
+def _receive(value: object, unlink: bool = False) -> object:
+    """Copies a shared buffer out of its segment, returning other values unchanged."""
+    if isinstance(value, _InlineView):
+        return memoryview(value.data)
+    if not isinstance(value, _SharedBuffer):
+        return value
+    shm = SharedMemory(name=value.name)
+    try:
+        buf = shm.buf
+        assert buf is not None
+        with buf[: value.nbytes] as data:
+            if value.kind == "bytes":
+                return bytes(data)
+            if value.kind == "bytearray":
+                return bytearray(data)
+            if value.kind == "memoryview":
+                return memoryview(bytes(data))
+            numpy = importlib.import_module("numpy")
+            return numpy.frombuffer(data, dtype=value.dtype).reshape(value.shape).copy()
+    finally:
+        shm.close()
+        if unlink:
+            shm.unlink()
+
+
+def _release(segments: list[SharedMemory]) -> None:
+    for shm in segments:
+        shm.close()
+        shm.unlink()
+
+
+def _run_in_process(
+    fn: object, args: tuple[object, ...], kwargs: Mapping[str, object]
+) -> object:
+    """Calls fn in a worker process, moving large buffers through shared memory."""
+    func = _resolve(fn) if isinstance(fn, _FunctionRef) else fn
+    if not callable(func):
+        raise TypeError(f"{fn} is not callable")
+    result = func(
+        *(_receive(arg) for arg in args),
+        **{key: _receive(value) for key, value in kwargs.items()},
+    )
+    segments: list[SharedMemory] = []
+    shared = _share(result, segments)
+    # the caller unlinks the segment once it has copied the result
+    for shm in segments:
+        shm.close()
+    return shared
+
+
+def _submit(
+    executor: Executor,
+    fn: object,
+    args: tuple[object, ...],
+    kwargs: Mapping[str, object],
+) -> concurrent.futures.Future[object]:
+    """Submits fn to a process pool executor.
+
+    Shared memory segments are released when the call completes, even if its caller has
+    stopped waiting for it.
+    """
+    segments: list[SharedMemory] = []
+    try:
+        shared_args = tuple(_share(arg, segments) for arg in args)
+        shared_kwargs = {key: _share(value, segments) for key, value in kwargs.items()}
+        inner = executor.submit(_run_in_process, fn, shared_args, shared_kwargs)
+    except BaseException:
+        _release(segments)
+        raise
+    outer: concurrent.futures.Future[object] = concurrent.futures.Future()
+
+    def complete(inner: concurrent.futures.Future[object]) -> None:
+        _release(segments)
+        if inner.cancelled():
+            outer.cancel()
+            return
+        # the caller may cancel outer concurrently, leaving nobody to pass the result to
+        with contextlib.suppress(concurrent.futures.InvalidStateError):
+            try:
+                result = _receive(inner.result(), unlink=True)
+            except BaseException as e:  # noqa: BLE001
+                outer.set_exception(e)
+            else:
+                outer.set_result(result)
+
+    inner.add_done_callback(complete)
+    outer.add_done_callback(lambda f: f.cancelled() and inner.cancel())
+    return outer
+
+
+# ring header: write position, read position, items produced, items released, and flags
+_HEADER = struct.Struct("=QQQQBBB")
+_HEADER_SIZE = 64
+_RECORD = struct.Struct("=QB")
+_ITEM, _END, _ERROR = 0, 1, 2
+_RING_SIZE = 1 << 20
+# how often a blocked side checks that the other process is still alive
+_POLL_INTERVAL = 0.1
+_PROCESS_EXIT_TIMEOUT = 1.0
+
+
+@dataclasses.dataclass
+class _RingState:
+    write_pos: int
+    read_pos: int
+    produced: int
+    released: int
+    producer_waiting: int
+    consumer_waiting: int
+    closed: int
+
+
+class _Ring:
+    """Single producer, single consumer byte ring in shared memory.
+
+    Records are written as a length, a kind and a pickled payload, and may wrap around or
+    be larger than the ring, in which case the producer writes them in parts. Each side only
+    notifies the other when it is waiting, so a busy stream costs one lock acquisition per
+    record and the consumer drains every available byte per wakeup.
+    """
+
+    def __init__(self, shm: SharedMemory, size: int, cond: Condition):
+        buf = shm.buf
+        assert buf is not None
+        self._buf = buf
+        self._size = size
+        self._cond = cond
+
+    def __get(self) -> _RingState:
+        return _RingState(*_HEADER.unpack_from(self._buf))
+
+    def __set(self, state: _RingState) -> None:
+        _HEADER.pack_into(self._buf, 0, *dataclasses.astuple(state))
+
+    def release(self) -> None:
+        self._buf.release()
+
+    def close(self) -> None:
+        """Stops the producer and wakes both sides."""
+        with self._cond:
+            state = self.__get()
+            state.closed = 1
+            self.__set(state)
+            self._cond.notify_all()
+
+    def put(
+        self, kind: int, payload: bytes, maxsize: int, alive: Callable[[], bool]
+    ) -> bool:
+        """Writes a record, blocking while the ring is full or maxsize items are unreleased.
+
+        Returns:
+            False if the consumer closed the ring.
+        """
+        record = memoryview(_RECORD.pack(len(payload), kind) + payload)
+        offset = 0
+        with self._cond:
+            state = self.__get()
+            while True:
+                if state.closed:
+                    return False
+                free = self._size - (state.write_pos - state.read_pos)
+                blocked = free == 0 or (
+                    offset == 0
+                    and kind == _ITEM
+                    and 0 < maxsize <= state.produced - state.released
+                )
+                if blocked:
+                    if not alive():
+                        return False
+                    state.producer_waiting = 1
+                    self.__set(state)
+                    self._cond.wait(_POLL_INTERVAL)
+                    state = self.__get()
+                    state.producer_waiting = 0
+                    continue
+                n = min(free, len(record) - offset)
+                self.__write(state.write_pos, record[offset : offset + n])
+                state.write_pos += n
+                offset += n
+                if offset == len(record):
+                    state.produced += kind == _ITEM
+                    self.__set(state)
+                    if state.consumer_waiting:
+                        self._cond.notify_all()
+                    return True
+                self.__set(state)
+                if state.consumer_waiting:
+                    self._cond.notify_all()
+
+    def take(self, out: bytearray, released: int, alive: Callable[[], bool]) -> bool:
+        """Moves every available byte to out after releasing items handed on.
+
+        Returns:
+            False if the ring was closed.
+
+        Raises:
+            RuntimeError: If the producer process exited without ending the stream.
+        """
+        with self._cond:
+            state = self.__get()
+            state.released += released
+            while True:
+                available = state.write_pos - state.read_pos
+                if available:
+                    out += self.__read(state.read_pos, available)
+                    state.read_pos += available
+                    self.__set(state)
+                    if state.producer_waiting:
+                        self._cond.notify_all()
+                    return True
+                if state.closed:
+                    self.__set(state)
+                    return False
+                if not alive():
+                    raise RuntimeError("stream process exited unexpectedly")
+                state.consumer_waiting = 1
+                self.__set(state)
+                if state.producer_waiting:
+                    self._cond.notify_all()
+                self._cond.wait(_POLL_INTERVAL)
+                state = self.__get()
+                state.consumer_waiting = 0
+
+    def __write(self, pos: int, data: memoryview) -> None:
+        start = pos % self._size
+        first = min(len(data), self._size - start)
+        base = _HEADER_SIZE
+        self._buf[base + start : base + start + first] = data[:first]
+        self._buf[base : base + len(data) - first] = data[first:]
+
+    def __read(self, pos: int, n: int) -> bytes:
+        start = pos % self._size
+        first = min(n, self._size - start)
+        base = _HEADER_SIZE
+        return bytes(self._buf[base + start : base + start + first]) + bytes(
+            self._buf[base : base + n - first]
+        )
+
+
+def _dumps_error(error: BaseException) -> bytes:
+    try:
+        return pickle.dumps(error, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:  # noqa: BLE001
+        return pickle.dumps(RuntimeError(repr(error)), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _produce(
+    fn: object,
+    args: tuple[object, ...],
+    kwargs: Mapping[str, object],
+    shm_name: str,
+    size: int,
+    maxsize: int,
+    cond: Condition,
+) -> None:
+    """Streams the items of fn's iterator into a ring, in a child process."""
+    parent = multiprocessing.parent_process()
+    alive = parent.is_alive if parent is not None else lambda: True
+    shm = SharedMemory(name=shm_name)
+    ring = _Ring(shm, size, cond)
+    try:
+        func = _resolve(fn) if isinstance(fn, _FunctionRef) else fn
+        if not callable(func):
+            raise TypeError(f"{fn} is not callable")
+        for item in func(*args, **kwargs):
+            payload = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+            if not ring.put(_ITEM, payload, maxsize, alive):
+                return
+        ring.put(_END, b"", 0, alive)
+    except Exception as e:  # noqa: BLE001
+        ring.put(_ERROR, _dumps_error(e), 0, alive)
+    finally:
+        ring.release()
+        shm.close()
+
+
+class _ProcessSource(Iterator[object]):
+    """Iterator relaying the items of an iterator that runs in a child process.
+
+    The child is started on the first call to iter, so that a worker thread rather than
+    the event loop pays for starting it.
+    """
+
+    def __init__(
+        self,
+        fn: object,
+        args: tuple[object, ...],
+        kwargs: Mapping[str, object],
+        maxsize: Optional[int],
+        name: str,
+    ):
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self._maxsize = maxsize or 0
+        self._name = name
+        self._lock = threading.Lock()
+        self._closed = False
+        self._shm: Optional[SharedMemory] = None
+        self._ring: Optional[_Ring] = None
+        self._process: Optional[BaseProcess] = None
+        self._pending = bytearray()
+        self._released = 0
+
+    def __iter__(self) -> _ProcessSource:
+        with self._lock:
+            if self._ring is None and not self._closed:
+                ctx = multiprocessing.get_context("spawn")
+                cond = ctx.Condition()
+                self._shm = SharedMemory(create=True, size=_HEADER_SIZE + _RING_SIZE)
+                self._ring = _Ring(self._shm, _RING_SIZE, cond)
+                self._process = ctx.Process(
+                    target=_produce,
+                    args=(
+                        self._fn,
+                        self._args,
+                        self._kwargs,
+                        self._shm.name,
+                        _RING_SIZE,
+                        self._maxsize,
+                        cond,
+                    ),
+                    name=f"athreading-{self._name}",
+                    daemon=True,
+                )
+                self._process.start()
+        return self
+
+    def __next__(self) -> object:
+        if self._ring is None or self._process is None:
+            raise StopIteration
+        while True:
+            if len(self._pending) >= _RECORD.size:
+                length, kind = _RECORD.unpack_from(self._pending)
+                end = _RECORD.size + length
+                if len(self._pending) >= end:
+                    payload = bytes(self._pending[_RECORD.size : end])
+                    del self._pending[:end]
+                    if kind == _ITEM:
+                        self._released += 1
+                        return pickle.loads(payload)
+                    self.__finish()
+                    if kind == _ERROR:
+                        raise pickle.loads(payload)
+                    raise StopIteration
+            try:
+                taken = self._ring.take(
+                    self._pending, self._released, self._process.is_alive
+                )
+            except BaseException:
+                self.__finish()
+                raise
+            self._released = 0
+            if not taken:
+                self.__finish()
+                raise StopIteration
+
+    def interrupt(self) -> None:
+        """Stops the child process, called from any thread."""
+        with self._lock:
+            self._closed = True
+            if self._ring is not None:
+                self._ring.close()
+
+    def close(self) -> None:
+        """Stops the child process, waits for it to exit and frees the ring."""
+        self.interrupt()
+        self.__finish()
+
+    def __finish(self) -> None:
+        """Waits for the child process to exit and frees the ring."""
+        with self._lock:
+            if self._ring is None or self._process is None or self._shm is None:
+                return
+            self._ring.close()
+            self._process.join(_PROCESS_EXIT_TIMEOUT)
+            if self._process.is_alive():
+                # the child is blocked in its source, which only a signal can interrupt
+                self._process.terminate()
+                self._process.join()
+            self._ring.release()
+            self._shm.close()
+            self._shm.unlink()
+            self._ring = None
+            self._closed = True
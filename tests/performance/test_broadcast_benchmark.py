@@ -0,0 +1,50 @@
+import asyncio
+import hashlib
+
+import pytest
+
+import athreading
+
+pytestmark = pytest.mark.integration_test
+
+ITEMS = 5_000
+SUBSCRIBERS = 4
+
+
+def feed():
+    """Source whose items are expensive to produce."""
+    digest = b""
+    for i in range(ITEMS):
+        digest = hashlib.sha256(digest + i.to_bytes(4, "little")).digest() * 32
+        yield digest
+
+
+async def acount(stream) -> int:
+    return sum([1 async for _ in stream])
+
+
+async def aper_consumer() -> int:
+    """Reference fan out running the source once per consumer."""
+
+    async def aconsume() -> int:
+        async with athreading.iterate(feed, buffer_maxsize=64)() as stream:
+            return await acount(stream)
+
+    return sum(await asyncio.gather(*(aconsume() for _ in range(SUBSCRIBERS))))
+
+
+async def abroadcast() -> int:
+    async with athreading.broadcast(feed(), SUBSCRIBERS) as subscribers:
+        return sum(await asyncio.gather(*(acount(s) for s in subscribers)))
+
+
+@pytest.mark.benchmark(group="broadcast", disable_gc=True, warmup=False)
+@pytest.mark.parametrize(
+    "afan_out", [aper_consumer, abroadcast], ids=["per_consumer", "broadcast"]
+)
+def test_broadcast_benchmark(benchmark, afan_out):
+    assert benchmark(lambda: asyncio.run(afan_out())) == ITEMS * SUBSCRIBERS
+    if benchmark.stats is not None:
+        benchmark.extra_info["ns_per_item"] = (
+            benchmark.stats.stats.mean / (ITEMS * SUBSCRIBERS) * 1e9
+        )
@@ -0,0 +1,54 @@
+import asyncio
+import os
+import tracemalloc
+
+import pytest
+
+import athreading
+
+pytestmark = pytest.mark.integration_test
+
+CHUNK_SIZE = 256 * 1024
+FILE_SIZE = 64 * 1024 * 1024
+
+
+@pytest.fixture(scope="module")
+def data_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("buffers") / "data.bin"
+    path.write_bytes(os.urandom(FILE_SIZE))
+    return path
+
+
+@athreading.iterate
+def read_chunks(path):
+    with open(path, "rb", buffering=0) as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+
+@athreading.iterate_buffers(buffer_size=CHUNK_SIZE, pool_size=4)
+def read_buffers(path):
+    return open(path, "rb", buffering=0)
+
+
+async def acount(stream) -> int:
+    async with stream as chunks:
+        return sum([len(chunk) async for chunk in chunks])
+
+
+@pytest.mark.benchmark(group="buffers", disable_gc=True, warmup=False)
+@pytest.mark.parametrize("aread", [read_chunks, read_buffers], ids=["bytes", "buffers"])
+def test_read_file_benchmark(benchmark, data_file, aread):
+    assert benchmark(lambda: asyncio.run(acount(aread(data_file)))) == FILE_SIZE
+    if benchmark.stats is not None:
+        benchmark.extra_info["bytes_per_second"] = (
+            FILE_SIZE / benchmark.stats.stats.mean
+        )
+
+    tracemalloc.start()
+    try:
+        asyncio.run(acount(aread(data_file)))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_traced_bytes"] = peak
@@ -87,3 +87,36 @@ def test_multi_call_benchmark(benchmark, impl, num_tasks, delay):
     results = benchmark(test)
     for result in results:
         assert result == 4
+
+
+PAYLOAD = bytes(range(256)) * 4096
+
+
+def parse(data: bytes) -> int:
+    """CPU-bound stand-in for record parsing, holding the GIL throughout."""
+    total = 0
+    for byte in data[::4]:
+        total = (total * 31 + byte) & 0xFFFFFFFF
+    return total
+
+
+aparse_thread = athreading.call(parse)
+aparse_process = athreading.call(parse, backend="process")
+
+
+@pytest.mark.benchmark(group="call_cpu", disable_gc=True, warmup=True)
+@pytest.mark.parametrize(
+    "impl", [aparse_thread, aparse_process], ids=["thread", "process"]
+)
+@pytest.mark.parametrize("num_tasks", [1, 8])
+def test_cpu_call_benchmark(benchmark, impl, num_tasks):
+    athreading.get_process_pool()
+    expected = parse(PAYLOAD)
+
+    def test():
+        async def atest():
+            return await asyncio.gather(*(impl(PAYLOAD) for _ in range(num_tasks)))
+
+        return asyncio.run(atest())
+
+    assert benchmark(test) == [expected] * num_tasks
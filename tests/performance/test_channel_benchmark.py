@@ -0,0 +1,135 @@
+import asyncio
+import queue
+import sys
+import threading
+from collections.abc import Callable
+
+import pytest
+
+import athreading
+from athreading.channels import _Channel
+
+pytestmark = pytest.mark.integration_test
+
+ITEMS = 100_000
+ITEM = object()
+
+
+class _Ok:
+    def __init__(self, value: object):
+        self.value = value
+
+
+class QueueHandoff:
+    """Reference handoff as streams did before channels, wrapping every item."""
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[_Ok] = queue.Queue()
+
+    def put(self, item: object) -> None:
+        self._queue.put(_Ok(item))
+
+    def pop(self) -> object:
+        if self._queue.empty():
+            raise IndexError
+        return self._queue.get(False).value
+
+
+def blocks_per_item(handoff: Callable[[], object]) -> float:
+    """Memory blocks each buffered item holds, a proxy for allocations per item."""
+    channel = handoff()
+    put = getattr(channel, "put")
+    before = sys.getallocatedblocks()
+    for _ in range(ITEMS):
+        put(ITEM)
+    return (sys.getallocatedblocks() - before) / ITEMS
+
+
+@pytest.mark.benchmark(group="channel", disable_gc=True, warmup=False)
+@pytest.mark.parametrize("handoff", [QueueHandoff, _Channel], ids=["queue", "channel"])
+def test_handoff_benchmark(benchmark, handoff):
+    def transfer():
+        channel = handoff()
+        thread = threading.Thread(
+            target=lambda: [channel.put(ITEM) for _ in range(ITEMS)]
+        )
+        thread.start()
+        received = 0
+        while received < ITEMS:
+            try:
+                channel.pop()
+                received += 1
+            except IndexError:
+                pass
+        thread.join()
+        return received
+
+    assert benchmark(transfer) == ITEMS
+    benchmark.extra_info["allocated_blocks_per_item"] = blocks_per_item(handoff)
+    if benchmark.stats is not None:
+        benchmark.extra_info["ns_per_item"] = benchmark.stats.stats.mean / ITEMS * 1e9
+
+
+def items(n: int):
+    for _ in range(n):
+        yield ITEM
+
+
+def push_items(callback: Callable[[object], None], n: int) -> None:
+    for _ in range(n):
+        callback(ITEM)
+
+
+async def alist(stream) -> int:
+    async with stream as it:
+        return sum([1 async for _ in it])
+
+
+@pytest.mark.benchmark(group="channel-streams", disable_gc=True, warmup=False)
+@pytest.mark.parametrize(
+    "astream",
+    [
+        lambda: athreading.iterate(items)(ITEMS),
+        lambda: athreading.iterate(items, buffer_maxsize=1024)(ITEMS),
+        lambda: athreading.generate(items, buffer_maxsize=1024)(ITEMS),
+        lambda: athreading.iterate_callback(push_items)(ITEMS),
+    ],
+    ids=["iterate", "iterate_bounded", "generate", "iterate_callback"],
+)
+def test_stream_item_benchmark(benchmark, astream):
+    assert benchmark(lambda: asyncio.run(alist(astream()))) == ITEMS
+    if benchmark.stats is not None:
+        benchmark.extra_info["ns_per_item"] = benchmark.stats.stats.mean / ITEMS * 1e9
+
+
+SENDS = 20_000
+
+
+def echo():
+    sent = yield
+    while True:
+        sent = yield sent
+
+
+async def asend_each(stream) -> int:
+    async with stream as generator:
+        await generator.asend(None)
+        return len([await generator.asend(i) for i in range(SENDS)])
+
+
+async def asend_many(stream, window=None) -> int:
+    async with stream as generator:
+        await generator.asend(None)
+        return len(await generator.asend_many(range(SENDS), window=window))
+
+
+@pytest.mark.benchmark(group="channel-sends", disable_gc=True, warmup=False)
+@pytest.mark.parametrize(
+    "asend",
+    [asend_each, asend_many, lambda stream: asend_many(stream, window=64)],
+    ids=["asend", "asend_many", "asend_many_window"],
+)
+def test_send_benchmark(benchmark, asend):
+    assert benchmark(lambda: asyncio.run(asend(athreading.generate(echo)()))) == SENDS
+    if benchmark.stats is not None:
+        benchmark.extra_info["ns_per_send"] = benchmark.stats.stats.mean / SENDS * 1e9
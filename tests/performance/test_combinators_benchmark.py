@@ -0,0 +1,52 @@
+import asyncio
+import contextlib
+
+import pytest
+
+import athreading
+
+pytestmark = pytest.mark.integration_test
+
+ITEMS = 20_000
+STREAMS = 4
+
+
+def streams():
+    return [
+        athreading.iterate(lambda: iter(range(ITEMS)), buffer_maxsize=64)()
+        for _ in range(STREAMS)
+    ]
+
+
+async def await_tasks() -> int:
+    """Reference fan in racing a task per pull of every stream."""
+    async with contextlib.AsyncExitStack() as stack:
+        iterators = [await stack.enter_async_context(s) for s in streams()]
+        pending = {asyncio.ensure_future(it.__anext__()): it for it in iterators}
+        count = 0
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                iterator = pending.pop(task)
+                try:
+                    task.result()
+                except StopAsyncIteration:
+                    continue
+                count += 1
+                pending[asyncio.ensure_future(iterator.__anext__())] = iterator
+        return count
+
+
+async def amerge() -> int:
+    async with athreading.merge(*streams()) as merged:
+        return sum([1 async for _ in merged])
+
+
+@pytest.mark.benchmark(group="merge", disable_gc=True, warmup=False)
+@pytest.mark.parametrize("afan_in", [await_tasks, amerge], ids=["tasks", "merge"])
+def test_merge_benchmark(benchmark, afan_in):
+    assert benchmark(lambda: asyncio.run(afan_in())) == ITEMS * STREAMS
+    if benchmark.stats is not None:
+        benchmark.extra_info["ns_per_item"] = (
+            benchmark.stats.stats.mean / (ITEMS * STREAMS) * 1e9
+        )
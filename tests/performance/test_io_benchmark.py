@@ -0,0 +1,64 @@
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+import athreading
+
+pytestmark = pytest.mark.integration_test
+
+CHUNK_SIZE = 256 * 1024
+FILE_SIZE = 64 * 1024 * 1024
+
+
+@pytest.fixture(scope="module")
+def data_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("io") / "data.bin"
+    path.write_bytes(os.urandom(FILE_SIZE))
+    return path
+
+
+async def hash_per_read(path) -> str:
+    """Reference scan awaiting one executor round trip per chunk, without read-ahead."""
+    loop = asyncio.get_running_loop()
+    digest = hashlib.sha256()
+    f = await loop.run_in_executor(None, open, path, "rb")
+    try:
+        while chunk := await loop.run_in_executor(None, f.read, CHUNK_SIZE):
+            digest.update(chunk)
+    finally:
+        await loop.run_in_executor(None, f.close)
+    return digest.hexdigest()
+
+
+async def hash_read_ahead(path) -> str:
+    digest = hashlib.sha256()
+    async with athreading.io.open(path, "rb", chunk_size=CHUNK_SIZE, read_ahead=4) as f:
+        while chunk := await f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def hash_mmap(path) -> str:
+    digest = hashlib.sha256()
+    async with athreading.io.mmap_chunks(path, CHUNK_SIZE, read_ahead=4) as chunks:
+        async for chunk in chunks:
+            digest.update(chunk)
+            chunk.release()
+    return digest.hexdigest()
+
+
+@pytest.mark.benchmark(group="io", disable_gc=True, warmup=False)
+@pytest.mark.parametrize(
+    "ahash",
+    [hash_per_read, hash_read_ahead, hash_mmap],
+    ids=["per_read", "read_ahead", "mmap"],
+)
+def test_hash_file_benchmark(benchmark, data_file, ahash):
+    expected = hashlib.sha256(data_file.read_bytes()).hexdigest()
+    assert benchmark(lambda: asyncio.run(ahash(data_file))) == expected
+    if benchmark.stats is not None:
+        benchmark.extra_info["bytes_per_second"] = (
+            FILE_SIZE / benchmark.stats.stats.mean
+        )
@@ -1,4 +1,5 @@
 import asyncio
+import itertools
 import time
 from collections.abc import Iterable
 
@@ -56,3 +57,104 @@ def test_iterate_benchmark(benchmark, impl, num_streams: int, stream_length: int
     results = benchmark(lambda: asyncio.run(atask()))
     for result in results:
         assert expected == result
+
+
+def small_items(length: int):
+    yield from range(length)
+
+
+async def alist_per_item_wakeup(length: int):
+    """Reference stream waking the event loop once per item, as iterate did before
+    wakeups were coalesced."""
+    loop = asyncio.get_running_loop()
+    items: asyncio.Queue[int | None] = asyncio.Queue()
+
+    def worker():
+        for item in small_items(length):
+            loop.call_soon_threadsafe(items.put_nowait, item)
+        loop.call_soon_threadsafe(items.put_nowait, None)
+
+    future = loop.run_in_executor(executor, worker)
+    output = []
+    while (item := await items.get()) is not None:
+        output.append(item)
+    await future
+    return output
+
+
+@athreading.iterate(executor=executor)
+def asmall_items_athreading(length: int):
+    yield from small_items(length)
+
+
+async def alist_athreading(length: int):
+    async with asmall_items_athreading(length) as it:
+        return [v async for v in it]
+
+
+@pytest.mark.benchmark(group="iterate-throughput", disable_gc=True, warmup=False)
+@pytest.mark.parametrize("impl", [alist_per_item_wakeup, alist_athreading])
+@pytest.mark.parametrize("stream_length", [50_000])
+def test_iterate_throughput_benchmark(benchmark, impl, stream_length: int):
+    results = benchmark(lambda: asyncio.run(impl(stream_length)))
+    assert results == list(range(stream_length))
+    if benchmark.stats is not None:
+        benchmark.extra_info["items_per_second"] = (
+            stream_length / benchmark.stats.stats.mean
+        )
+
+
+@athreading.iterate(buffer_maxsize=1, executor=executor)
+def acount_buffered():
+    yield from itertools.count()
+
+
+async def aexit_full_buffer():
+    """Exit a stream while its worker is blocked on a full buffer."""
+    async with acount_buffered() as it:
+        await it.__anext__()
+        await asyncio.sleep(0.001)
+        start = time.perf_counter()
+    # the worker future is awaited on exit, so the pool thread is released here
+    return time.perf_counter() - start
+
+
+@pytest.mark.benchmark(group="iterate-exit", disable_gc=True, warmup=False)
+def test_iterate_exit_benchmark(benchmark):
+    async def atask():
+        return [await aexit_full_buffer() for _ in range(10)]
+
+    exit_latencies = benchmark(lambda: asyncio.run(atask()))
+    benchmark.extra_info["max_exit_latency_s"] = max(exit_latencies)
+
+
+def decode_records(n: int):
+    """CPU-bound source, holding the GIL while decoding each record."""
+    for i in range(n):
+        yield sum(
+            int(field) for field in ",".join(map(str, range(i, i + 2000))).split(",")
+        )
+
+
+adecode_thread = athreading.iterate(decode_records, buffer_maxsize=64)
+adecode_process = athreading.iterate(
+    decode_records, buffer_maxsize=64, backend="process"
+)
+
+
+@pytest.mark.benchmark(group="iterate_cpu", disable_gc=True, warmup=False)
+@pytest.mark.parametrize(
+    "impl", [adecode_thread, adecode_process], ids=["thread", "process"]
+)
+@pytest.mark.parametrize("num_streams", [1, 4])
+def test_iterate_cpu_benchmark(benchmark, impl, num_streams: int):
+    async def alist():
+        async with impl(200) as stream:
+            return [v async for v in stream]
+
+    async def atask():
+        return await asyncio.gather(*(alist() for _ in range(num_streams)))
+
+    expected = list(decode_records(200))
+    results = benchmark(lambda: asyncio.run(atask()))
+    assert results == [expected] * num_streams
@@ -0,0 +1,45 @@
+import asyncio
+import tracemalloc
+
+import pytest
+
+import athreading
+
+pytestmark = pytest.mark.integration_test
+
+ITEMS = 10_000
+
+
+def increment(x: int) -> int:
+    return x + 1
+
+
+async def agather() -> int:
+    """Reference fan out creating a coroutine per item up front."""
+    call = athreading.call(increment)
+    return len(await asyncio.gather(*[call(x) for x in range(ITEMS)]))
+
+
+async def amap(ordered: bool) -> int:
+    async with athreading.map(increment, range(ITEMS), ordered=ordered) as results:
+        return sum([1 async for _ in results])
+
+
+@pytest.mark.benchmark(group="map", disable_gc=True, warmup=False)
+@pytest.mark.parametrize(
+    "afan_out",
+    [agather, lambda: amap(True), lambda: amap(False)],
+    ids=["gather", "map_ordered", "map_unordered"],
+)
+def test_map_benchmark(benchmark, afan_out):
+    assert benchmark(lambda: asyncio.run(afan_out())) == ITEMS
+    if benchmark.stats is not None:
+        benchmark.extra_info["ns_per_item"] = benchmark.stats.stats.mean / ITEMS * 1e9
+
+    tracemalloc.start()
+    try:
+        asyncio.run(afan_out())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    benchmark.extra_info["peak_traced_bytes"] = peak
@@ -0,0 +1,52 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import athreading
+
+pytestmark = pytest.mark.integration_test
+
+PARTITIONS = 16
+ROWS = 50
+WORKERS = 8
+
+executor = ThreadPoolExecutor(WORKERS)
+
+
+def rows(partition: int):
+    """Partition whose rows each wait on I/O."""
+    for i in range(ROWS):
+        time.sleep(0.001)
+        yield partition * ROWS + i
+
+
+def chained():
+    for partition in range(PARTITIONS):
+        yield from rows(partition)
+
+
+async def aiterate() -> int:
+    """Reference ingest of every partition on one thread."""
+    async with athreading.iterate(chained, executor=executor)() as stream:
+        return sum([1 async for _ in stream])
+
+
+async def aiterate_partitions() -> int:
+    async with athreading.iterate_partitions(
+        rows, range(PARTITIONS), workers=WORKERS, executor=executor
+    ) as stream:
+        return sum([1 async for _ in stream])
+
+
+@pytest.mark.benchmark(group="partitions", disable_gc=True, warmup=False)
+@pytest.mark.parametrize(
+    "aingest", [aiterate, aiterate_partitions], ids=["iterate", "iterate_partitions"]
+)
+def test_partitions_benchmark(benchmark, aingest):
+    assert benchmark(lambda: asyncio.run(aingest())) == PARTITIONS * ROWS
+    if benchmark.stats is not None:
+        benchmark.extra_info["rows_per_second"] = (
+            PARTITIONS * ROWS / benchmark.stats.stats.mean
+        )
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+import athreading
+
+pytestmark = pytest.mark.integration_test
+
+ITEMS = 20_000
+
+
+def parse(line: str) -> int:
+    return int(line)
+
+
+def enrich(x: int) -> tuple[int, int]:
+    return x, x * x
+
+
+def lines():
+    for i in range(ITEMS):
+        yield str(i)
+
+
+@athreading.iterate(buffer_maxsize=64)
+def aread():
+    yield from lines()
+
+
+async def achained() -> int:
+    """Reference chain of stages, each item crossing the event loop at every stage."""
+    aparse = athreading.call(parse)
+    aenrich = athreading.call(enrich)
+    count = 0
+    async with aread() as read:
+        async for line in read:
+            await aenrich(await aparse(line))
+            count += 1
+    return count
+
+
+async def apipeline() -> int:
+    async with athreading.pipeline(lines(), parse, enrich) as results:
+        return sum([1 async for _ in results])
+
+
+@pytest.mark.benchmark(group="pipeline", disable_gc=True, warmup=False)
+@pytest.mark.parametrize("arun", [achained, apipeline], ids=["chained", "pipeline"])
+def test_pipeline_benchmark(benchmark, arun):
+    assert benchmark(lambda: asyncio.run(arun())) == ITEMS
+    if benchmark.stats is not None:
+        benchmark.extra_info["ns_per_item"] = benchmark.stats.stats.mean / ITEMS * 1e9
@@ -0,0 +1,70 @@
+"""Throughput of CPU-bound calls and streams as worker threads are added.
+
+Each benchmark runs a fixed amount of pure Python work split over num_workers threads, so
+on a free-threaded build running without the GIL the time falls as workers are added, up
+to the number of CPUs, while with the GIL it stays flat. Compare runs on both builds with
+pytest-benchmark's --benchmark-compare, grouping by the gil_enabled extra info.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import athreading
+
+pytestmark = pytest.mark.integration_test
+
+TOTAL_TASKS = 32
+WORK = 20_000
+NUM_WORKERS = [1, 2, 4, 8]
+
+
+def spin(n: int) -> int:
+    total = 0
+    for i in range(n):
+        total += i * i % 7
+    return total
+
+
+def spin_items(count: int, n: int):
+    for _ in range(count):
+        yield spin(n)
+
+
+@pytest.fixture
+def scaling_info(benchmark):
+    benchmark.extra_info["gil_enabled"] = athreading.gil_enabled()
+    benchmark.extra_info["cpu_count"] = os.cpu_count()
+
+
+@pytest.mark.benchmark(group="scaling_call", disable_gc=True, warmup=True)
+@pytest.mark.parametrize("num_workers", NUM_WORKERS)
+def test_call_scaling_benchmark(benchmark, scaling_info, num_workers: int):
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        aspin = athreading.call(spin, executor=executor)
+
+        async def atask():
+            return await asyncio.gather(*(aspin(WORK) for _ in range(TOTAL_TASKS)))
+
+        results = benchmark(lambda: asyncio.run(atask()))
+    assert results == [spin(WORK)] * TOTAL_TASKS
+
+
+@pytest.mark.benchmark(group="scaling_iterate", disable_gc=True, warmup=True)
+@pytest.mark.parametrize("num_workers", NUM_WORKERS)
+def test_iterate_scaling_benchmark(benchmark, scaling_info, num_workers: int):
+    count = TOTAL_TASKS // num_workers
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        aspin_items = athreading.iterate(spin_items, executor=executor)
+
+        async def alist():
+            async with aspin_items(count, WORK) as stream:
+                return [item async for item in stream]
+
+        async def atask():
+            return await asyncio.gather(*(alist() for _ in range(num_workers)))
+
+        results = benchmark(lambda: asyncio.run(atask()))
+    assert results == [[spin(WORK)] * count] * num_workers
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import athreading
+
+custom_executor = ThreadPoolExecutor()
+
+
+class BulkSquare:
+    """Bulk function recording the arguments of each call."""
+
+    def __init__(self, worker_delay: float = 0.0):
+        self.calls: list[list[float]] = []
+        self._worker_delay = worker_delay
+        self._lock = threading.Lock()
+
+    def __call__(self, xs: list[float]) -> list[float]:
+        with self._lock:
+            self.calls.append(xs)
+        time.sleep(self._worker_delay)
+        return [x * x for x in xs]
+
+
+DECORATORS = [
+    lambda fn: athreading.batch_call(fn),
+    lambda fn: athreading.batch_call()(fn),
+    lambda fn: athreading.batch_call(executor=custom_executor)(fn),
+    lambda fn: athreading.batch_call(pool="batch")(fn),
+]
+DECORATOR_IDS = ["simplest", "simpler", "executor", "pool"]
+
+
+@pytest.mark.parametrize("decorator", DECORATORS, ids=DECORATOR_IDS)
+@pytest.mark.asyncio
+async def test_batch_call_coalesces(decorator):
+    bulk = BulkSquare()
+    asquare = decorator(bulk)
+    results = await asyncio.gather(*(asquare(x) for x in range(10)))
+    assert results == [x * x for x in range(10)]
+    assert bulk.calls == [list(range(10))]
+
+
+@pytest.mark.asyncio
+async def test_batch_call_max_batch():
+    bulk = BulkSquare()
+    asquare = athreading.batch_call(max_batch=4, max_wait=1.0)(bulk)
+    results = await asyncio.gather(*(asquare(x) for x in range(10)))
+    assert results == [x * x for x in range(10)]
+    assert sorted(map(len, bulk.calls)) == [2, 4, 4]
+
+
+@pytest.mark.asyncio
+async def test_batch_call_max_wait():
+    bulk = BulkSquare()
+    asquare = athreading.batch_call(max_wait=0.01)(bulk)
+    first = asyncio.ensure_future(asquare(1))
+    await asyncio.sleep(0.1)
+    assert bulk.calls == [[1]]
+    assert await asyncio.gather(first, asquare(2)) == [1, 4]
+    assert bulk.calls == [[1], [2]]
+
+
+@pytest.mark.asyncio
+async def test_batch_call_cancel():
+    bulk = BulkSquare()
+    asquare = athreading.batch_call(max_wait=0.05)(bulk)
+    tasks = [asyncio.ensure_future(asquare(x)) for x in range(4)]
+    await asyncio.sleep(0)
+    tasks[1].cancel()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert isinstance(results[1], asyncio.CancelledError)
+    assert [results[0], *results[2:]] == [0, 4, 9]
+    assert bulk.calls == [[0, 2, 3]]
+
+
+def bulk_divide(xs: list[float]) -> list[float]:
+    return [1.0 / x for x in xs]
+
+
+@pytest.mark.asyncio
+async def test_batch_call_exception():
+    adivide = athreading.batch_call(bulk_divide)
+    results = await asyncio.gather(adivide(1), adivide(0), return_exceptions=True)
+    assert all(isinstance(result, ZeroDivisionError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_batch_call_result_count():
+    afirst = athreading.batch_call(lambda xs: xs[:1])
+    with pytest.raises(ValueError, match="2 arguments"):
+        await asyncio.gather(afirst(1), afirst(2))
+
+
+@pytest.mark.asyncio
+async def test_batch_call_multiple_loops():
+    bulk = BulkSquare(worker_delay=0.01)
+    asquare = athreading.batch_call(bulk)
+
+    async def run():
+        return await asyncio.gather(*(asquare(x) for x in range(3)))
+
+    other = await asyncio.to_thread(asyncio.run, run())
+    assert await run() == other == [0, 1, 4]
+    assert bulk.calls == [[0, 1, 2], [0, 1, 2]]
+
+
+def test_batch_call_invalid():
+    with pytest.raises(ValueError, match="max_batch"):
+        athreading.batch_call(max_batch=0)(bulk_divide)
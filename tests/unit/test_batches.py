@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Generator
+from typing import Callable, Optional, Union
+
+import pytest
+
+import athreading
+from athreading.aliases import AsyncIteratorContext
+
+TestData = Union[int, str, float, None]
+TEST_VALUES: list[TestData] = [1, None, "", 2.0]
+
+
+def generator(delay=0.0) -> Generator[TestData, Optional[TestData], None]:
+    for item in TEST_VALUES:
+        time.sleep(delay)
+        yield item
+
+
+def iterate_with_callback(callback: Callable[[TestData], None], delay=0.0) -> None:
+    for item in generator(delay):
+        callback(item)
+
+
+class AsyncListContext(AsyncIteratorContext[TestData]):
+    """Minimal context using the default batches implementation."""
+
+    def __init__(self, delay=0.0):
+        self._items = iter(TEST_VALUES)
+        self._delay = delay
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+    async def __anext__(self) -> TestData:
+        await asyncio.sleep(self._delay)
+        try:
+            return next(self._items)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+STREAMCONTEXTS = [
+    lambda delay: AsyncListContext(delay),
+    lambda delay: athreading.iterate(generator)(delay),
+    lambda delay: athreading.generate(generator)(delay),
+    lambda delay: athreading.iterate_callback(iterate_with_callback)(delay),
+]
+STREAMCONTEXT_IDS = ["default", "iterate", "generate", "iterate_callback"]
+
+
+@pytest.mark.parametrize(
+    ("max_items", "expected"),
+    [
+        (1, [[1], [None], [""], [2.0]]),
+        (2, [[1, None], ["", 2.0]]),
+        (3, [[1, None, ""], [2.0]]),
+        (8, [TEST_VALUES]),
+    ],
+)
+@pytest.mark.parametrize("streamcontext", STREAMCONTEXTS, ids=STREAMCONTEXT_IDS)
+@pytest.mark.asyncio
+async def test_batches_max_items(streamcontext, max_items, expected):
+    async with streamcontext(0.0) as stream:
+        # let the worker finish so batches are only limited by max_items
+        await asyncio.sleep(0.1)
+        output = [batch async for batch in stream.batches(max_items)]
+    assert output == expected
+
+
+@pytest.mark.parametrize("streamcontext", STREAMCONTEXTS, ids=STREAMCONTEXT_IDS)
+@pytest.mark.asyncio
+async def test_batches_max_latency(streamcontext):
+    worker_delay = 0.1
+    async with streamcontext(worker_delay) as stream:
+        output = [
+            batch async for batch in stream.batches(len(TEST_VALUES), worker_delay / 4)
+        ]
+    assert [item for batch in output for item in batch] == TEST_VALUES
+    assert len(output) > 1
+
+
+@pytest.mark.parametrize("streamcontext", STREAMCONTEXTS, ids=STREAMCONTEXT_IDS)
+@pytest.mark.asyncio
+async def test_batches_then_anext(streamcontext):
+    async with streamcontext(0.0) as stream:
+        batches = stream.batches(2)
+        first = await batches.__anext__()
+        await batches.aclose()
+        rest = [item async for item in stream]
+    assert first + rest == TEST_VALUES
+
+
+@pytest.mark.parametrize("streamcontext", STREAMCONTEXTS, ids=STREAMCONTEXT_IDS)
+@pytest.mark.asyncio
+async def test_batches_invalid_max_items(streamcontext):
+    async with streamcontext(0.0) as stream:
+        with pytest.raises(ValueError, match="max_items"):
+            await stream.batches(0).__anext__()
+
+
+class _ReciprocalIterator:
+    def __init__(self, iterator):
+        self._iter = iterator
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return 1.0 / next(self._iter)
+
+
+@pytest.mark.asyncio
+async def test_batches_background_exception():
+    output = []
+    async with athreading.iterate(_ReciprocalIterator)(iter(range(-2, 2))) as stream:
+        await asyncio.sleep(0.1)
+        with pytest.raises(ZeroDivisionError):
+            async for batch in stream.batches(8):
+                output.append(batch)  # noqa: PERF401
+    assert output == [[-0.5, -1.0]]
+
+
+def raise_with_callback(callback: Callable[[TestData], None]) -> None:
+    callback(1)
+    raise ValueError(2)
+
+
+@pytest.mark.asyncio
+async def test_batches_callback_exception():
+    output = []
+    async with athreading.iterate_callback(raise_with_callback)() as stream:
+        await asyncio.sleep(0.1)
+        with pytest.raises(ValueError, match="2"):
+            async for batch in stream.batches(8):
+                output.append(batch)  # noqa: PERF401
+    assert output == [[1]]
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+
+import pytest
+
+import athreading
+
+
+async def alist(subscriber, delay: float = 0.0) -> list[int]:
+    items = []
+    async for item in subscriber:
+        items.append(item)
+        await asyncio.sleep(delay)
+    return items
+
+
+@pytest.mark.parametrize("buffer_maxsize", [1, 4, 64])
+@pytest.mark.asyncio
+async def test_broadcast(buffer_maxsize):
+    pulled = []
+
+    def source():
+        for i in range(100):
+            pulled.append(threading.current_thread().name)
+            yield i
+
+    feed = athreading.broadcast(source(), 3, buffer_maxsize=buffer_maxsize)
+    async with feed as subscribers:
+        results = await asyncio.gather(*(alist(s) for s in subscribers))
+    assert results == [list(range(100))] * 3
+    assert len(pulled) == 100
+    assert len(feed._buffer) == 0
+
+
+@pytest.mark.asyncio
+async def test_broadcast_shares_items():
+    items = [object() for _ in range(10)]
+    async with athreading.broadcast(items, 2) as (a, b):
+        first, second = await asyncio.gather(alist(a), alist(b))
+    assert all(x is y is z for x, y, z in zip(first, second, items))
+
+
+@pytest.mark.asyncio
+async def test_broadcast_block():
+    async with athreading.broadcast(range(50), 2, buffer_maxsize=4) as (fast, slow):
+        fast_items = []
+
+        async def afast():
+            async for item in fast:
+                fast_items.append(item)
+
+        task = asyncio.create_task(afast())
+        await asyncio.sleep(0.05)
+        assert fast_items == [0, 1, 2, 3]
+        slow_items = await alist(slow, delay=0.001)
+        await task
+    assert fast_items == slow_items == list(range(50))
+
+
+@pytest.mark.asyncio
+async def test_broadcast_drop():
+    async with athreading.broadcast(range(50), 2, buffer_maxsize=4, slow="drop") as (
+        fast,
+        slow,
+    ):
+        assert await fast.__anext__() == 0
+        assert await slow.__anext__() == 0
+        fast_items = [item async for item in fast]
+        slow_items = await alist(slow)
+    assert fast_items == list(range(1, 50))
+    assert slow_items == list(range(46, 50))
+    assert slow.dropped == 45
+    assert fast.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_broadcast_disconnect():
+    async with athreading.broadcast(
+        range(50), 2, buffer_maxsize=4, slow="disconnect"
+    ) as (fast, slow):
+        fast_items = [item async for item in fast]
+        with pytest.raises(RuntimeError, match="disconnected"):
+            await slow.__anext__()
+    assert fast_items == list(range(50))
+    assert slow.disconnected
+
+
+@pytest.mark.asyncio
+async def test_broadcast_unsubscribe():
+    async with athreading.broadcast(range(50), 2, buffer_maxsize=2) as (a, b):
+        assert await b.__anext__() == 0
+        await b.aclose()
+        assert await alist(a) == list(range(50))
+        with pytest.raises(StopAsyncIteration):
+            await b.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_error():
+    def source():
+        yield 1
+        raise ValueError("source")
+
+    async with athreading.broadcast(source(), 2) as subscribers:
+        for subscriber in subscribers:
+            assert await subscriber.__anext__() == 1
+            with pytest.raises(ValueError, match="source"):
+                await subscriber.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_exit_early():
+    def endless():
+        while True:
+            yield 1
+
+    async with athreading.broadcast(endless(), 2) as (a, b):
+        assert await a.__anext__() == 1
+    with pytest.raises(StopAsyncIteration):
+        await b.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_cancelled_pull():
+    event = threading.Event()
+
+    def source():
+        event.wait(1.0)
+        yield from range(3)
+
+    async with athreading.broadcast(source(), 2) as (a, b):
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(a.__anext__(), 0.01)
+        event.set()
+        assert await alist(a) == await alist(b) == [0, 1, 2]
+
+
+def test_broadcast_invalid():
+    with pytest.raises(ValueError, match="subscribers"):
+        athreading.broadcast(range(5), 0)
+    with pytest.raises(ValueError, match="buffer_maxsize"):
+        athreading.broadcast(range(5), 2, buffer_maxsize=0)
+    with pytest.raises(ValueError, match="policy"):
+        athreading.broadcast(range(5), 2, slow="skip")
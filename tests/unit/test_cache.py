@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import athreading
+
+
+class Lookup:
+    """Function counting its calls and returning a new version per call."""
+
+    def __init__(self, worker_delay: float = 0.0):
+        self.calls = 0
+        self._worker_delay = worker_delay
+        self._lock = threading.Lock()
+
+    def __call__(self, key: str, suffix: str = "") -> str:
+        with self._lock:
+            self.calls += 1
+            version = self.calls
+        time.sleep(self._worker_delay)
+        return f"{key}{suffix}{version}"
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_and_misses():
+    cache = athreading.CallCache()
+    lookup = Lookup()
+    alookup = athreading.call(cache=cache)(lookup)
+    assert await alookup("a") == "a1"
+    assert await alookup("a") == "a1"
+    assert await alookup("b") == "b2"
+    assert await alookup("a", suffix="-") == "a-3"
+    assert await alookup("a", suffix="-") == "a-3"
+    assert (cache.hits, cache.misses, len(cache)) == (2, 3, 3)
+    cache.clear()
+    assert (cache.hits, cache.misses, len(cache)) == (0, 0, 0)
+    assert await alookup("a") == "a4"
+
+
+@pytest.mark.asyncio
+async def test_cache_single_flight():
+    cache = athreading.CallCache()
+    lookup = Lookup(worker_delay=0.1)
+    alookup = athreading.call(cache=cache)(lookup)
+    results = await asyncio.gather(*(alookup("a") for _ in range(10)))
+    assert results == ["a1"] * 10
+    assert lookup.calls == 1
+    assert cache.misses == 10
+
+
+@pytest.mark.asyncio
+async def test_cache_single_flight_cancel():
+    lookup = Lookup(worker_delay=0.1)
+    alookup = athreading.call(cache=athreading.CallCache())(lookup)
+    first = asyncio.ensure_future(alookup("a"))
+    second = asyncio.ensure_future(alookup("a"))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    assert await second == "a1"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_cache_lru():
+    cache = athreading.CallCache(maxsize=2)
+    lookup = Lookup()
+    alookup = athreading.call(cache=cache)(lookup)
+    await alookup("a")
+    await alookup("b")
+    await alookup("a")
+    await alookup("c")
+    assert len(cache) == 2
+    assert await alookup("a") == "a1"
+    assert await alookup("b") == "b4"
+
+
+@pytest.mark.asyncio
+async def test_cache_ttl():
+    lookup = Lookup()
+    alookup = athreading.call(cache=athreading.CallCache(ttl=0.05))(lookup)
+    assert await alookup("a") == "a1"
+    assert await alookup("a") == "a1"
+    await asyncio.sleep(0.1)
+    assert await alookup("a") == "a2"
+
+
+@pytest.mark.asyncio
+async def test_cache_stale_while_revalidate():
+    cache = athreading.CallCache(ttl=0.05, stale_ttl=1.0)
+    lookup = Lookup(worker_delay=0.05)
+    alookup = athreading.call(cache=cache)(lookup)
+    assert await alookup("a") == "a1"
+    await asyncio.sleep(0.1)
+    assert await alookup("a") == "a1"
+    assert await alookup("a") == "a1"
+    await asyncio.sleep(0.1)
+    assert await alookup("a") == "a2"
+    assert lookup.calls == 2
+
+
+def divide(x: float) -> float:
+    return 1.0 / x
+
+
+@pytest.mark.asyncio
+async def test_cache_exception():
+    cache = athreading.CallCache()
+    adivide = athreading.call(cache=cache)(divide)
+    results = await asyncio.gather(adivide(0), adivide(0), return_exceptions=True)
+    assert all(isinstance(result, ZeroDivisionError) for result in results)
+    assert len(cache) == 0
+    with pytest.raises(TypeError, match="unhashable"):
+        await athreading.call(cache=cache)(len)([])
+
+
+@pytest.mark.asyncio
+async def test_cache_shared():
+    cache = athreading.CallCache()
+    ahex = athreading.call(cache=cache)(hex)
+    aoct = athreading.call(cache=cache)(oct)
+    assert await ahex(8) == "0x8"
+    assert await aoct(8) == "0o10"
+    assert len(cache) == 2
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"maxsize": 0}, {"ttl": 0}, {"stale_ttl": 1.0}, {"ttl": 1.0, "stale_ttl": -1}],
+    ids=["maxsize", "ttl", "stale_ttl_without_ttl", "stale_ttl"],
+)
+def test_cache_invalid(kwargs):
+    with pytest.raises(ValueError):
+        athreading.CallCache(**kwargs)
@@ -0,0 +1,100 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import Optional
+
+import pytest
+
+import athreading
+
+
+class Worker:
+    """Long-running function that polls the current cancellation token."""
+
+    def __init__(self) -> None:
+        self.started = threading.Event()
+        self.stopped = threading.Event()
+        self.cancelled: Optional[bool] = None
+
+    def __call__(self, duration: float) -> int:
+        token = athreading.current_token()
+        assert token is not None
+        self.started.set()
+        try:
+            steps = 0
+            deadline = time.monotonic() + duration
+            while time.monotonic() < deadline and not token.wait(0.001):
+                steps += 1
+            self.cancelled = token.cancelled
+            return steps
+        finally:
+            self.stopped.set()
+
+
+DECORATORS = [
+    lambda fn: athreading.call(cancellable=True)(fn),
+    lambda fn: athreading.call(cancellable=True, max_concurrency=1)(fn),
+    lambda fn: athreading.call(cancellable=True, pool="cancellation")(fn),
+]
+DECORATOR_IDS = ["default", "max_concurrency", "pool"]
+
+
+@pytest.mark.parametrize("decorator", DECORATORS, ids=DECORATOR_IDS)
+@pytest.mark.asyncio
+async def test_cancellable_call_cancel(decorator):
+    worker = Worker()
+    task = asyncio.ensure_future(decorator(worker)(10.0))
+    assert await asyncio.to_thread(worker.started.wait, 1.0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert await asyncio.to_thread(worker.stopped.wait, 1.0)
+    assert worker.cancelled is True
+
+
+@pytest.mark.parametrize("decorator", DECORATORS, ids=DECORATOR_IDS)
+@pytest.mark.asyncio
+async def test_cancellable_call_timeout(decorator):
+    worker = Worker()
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(decorator(worker)(10.0), 0.05)
+    assert await asyncio.to_thread(worker.stopped.wait, 1.0)
+    assert worker.cancelled is True
+
+
+@pytest.mark.parametrize("decorator", DECORATORS, ids=DECORATOR_IDS)
+@pytest.mark.asyncio
+async def test_cancellable_call_complete(decorator):
+    worker = Worker()
+    assert await decorator(worker)(0.01) > 0
+    assert worker.cancelled is False
+
+
+@pytest.mark.asyncio
+async def test_cancellable_call_token_per_call():
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    worker = Worker()
+    aworker = athreading.call(cancellable=True, executor=executor)(worker)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(aworker(10.0), 0.05)
+    assert await aworker(0.01) > 0
+    assert worker.cancelled is False
+    assert await athreading.call(athreading.current_token, executor=executor)() is None
+    executor.shutdown()
+
+
+def test_current_token_outside_call():
+    assert athreading.current_token() is None
+
+
+def test_cancellation_token():
+    token = athreading.CancellationToken()
+    assert not token.cancelled
+    assert not token.wait(0.0)
+    token.raise_if_cancelled()
+    token.cancel()
+    assert token.cancelled
+    assert token.wait()
+    with pytest.raises(concurrent.futures.CancelledError):
+        token.raise_if_cancelled()
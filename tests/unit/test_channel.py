@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from athreading.channels import _Channel, _Closed
+
+
+@pytest.fixture(params=[True, False], ids=["gil", "nogil"])
+def gil(request, monkeypatch):
+    monkeypatch.setattr("athreading.channels.gil_enabled", lambda: request.param)
+    return request.param
+
+
+async def areceive(channel: _Channel[int]) -> list[int]:
+    items = []
+    while True:
+        try:
+            items.append(channel.pop())
+        except IndexError:
+            if channel.exhausted():
+                return items
+            await channel.wait()
+
+
+@pytest.mark.parametrize("maxsize", [None, 1, 16])
+@pytest.mark.asyncio
+async def test_channel_stream(gil, maxsize):
+    channel = _Channel(maxsize)
+    assert channel._locked is not gil
+    channel.open(asyncio.get_running_loop())
+
+    def produce():
+        for i in range(10_000):
+            channel.put(i)
+            assert not maxsize or len(channel) <= maxsize
+        channel.finish()
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    assert await areceive(channel) == list(range(10_000))
+    thread.join()
+
+
+@pytest.mark.asyncio
+async def test_channel_error_after_items(gil):
+    channel = _Channel()
+    channel.open(asyncio.get_running_loop())
+    channel.put(1)
+    channel.finish(ValueError("failed"))
+    assert channel.take_error() is None
+    assert await areceive(channel) == [1]
+    assert isinstance(channel.take_error(), ValueError)
+    assert channel.take_error() is None
+
+
+@pytest.mark.asyncio
+async def test_channel_close_releases_producer(gil):
+    channel = _Channel(1)
+    channel.open(asyncio.get_running_loop())
+    channel.put(0)
+    thread = threading.Thread(target=channel.put, args=(1,))
+    thread.start()
+    await asyncio.sleep(0.05)
+    assert thread.is_alive()
+    channel.close()
+    thread.join(1.0)
+    assert not thread.is_alive()
+    assert await areceive(channel) == [0]
+
+
+@pytest.mark.asyncio
+async def test_channel_requests(gil):
+    channel = _Channel()
+    channel.open(asyncio.get_running_loop())
+    received = []
+
+    def respond():
+        while not isinstance(request := channel.next_request(), _Closed):
+            received.append(request)
+            channel.put(len(received))
+
+    thread = threading.Thread(target=respond)
+    thread.start()
+    for value in range(3):
+        channel.request(value)
+        await channel.wait()
+        assert channel.pop() == value + 1
+    channel.close()
+    thread.join(1.0)
+    assert received == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_channel_wait_timeout(gil):
+    channel = _Channel()
+    channel.open(asyncio.get_running_loop())
+    start = time.perf_counter()
+    assert not await channel.wait(0.05)
+    assert not await channel.wait(0)
+    assert time.perf_counter() - start >= 0.05
+    channel.put(0)
+    assert await channel.wait(0)
+
+
+@pytest.mark.asyncio
+async def test_channel_watch(gil):
+    loop = asyncio.get_running_loop()
+    channels = [_Channel(), _Channel()]
+    for channel in channels:
+        channel.open(loop)
+    waiter = loop.create_future()
+    assert not any(channel.watch(waiter) for channel in channels)
+    thread = threading.Thread(target=channels[1].put, args=(1,))
+    thread.start()
+    await asyncio.wait_for(waiter, 1.0)
+    thread.join()
+    for channel in channels:
+        channel.unwatch()
+    assert channels[0].watch(loop.create_future()) is False
+    channels[0].unwatch()
+    assert channels[1].watch(loop.create_future()) is True
+    assert channels[1].pop() == 1
+
+
+@pytest.mark.asyncio
+async def test_channel_next_and_batch(gil):
+    channel = _Channel()
+    channel.open(asyncio.get_running_loop())
+    for i in range(5):
+        channel.put(i)
+    channel.finish(ValueError("failed"))
+    assert await channel.next() == 0
+    assert await channel.batch(3) == [1, 2, 3]
+    assert await channel.batch(3, max_latency=0.01) == [4]
+    with pytest.raises(ValueError, match="failed"):
+        await channel.batch(3)
+    with pytest.raises(StopAsyncIteration):
+        await channel.next()
+
+
+@pytest.mark.asyncio
+async def test_channel_batch_latency(gil):
+    channel = _Channel()
+    channel.open(asyncio.get_running_loop())
+    channel.put(0)
+    start = time.perf_counter()
+    assert await channel.batch(3, max_latency=0.05) == [0]
+    assert time.perf_counter() - start >= 0.05
@@ -0,0 +1,192 @@
+import asyncio
+import contextlib
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+
+import pytest
+
+import athreading
+
+
+@athreading.iterate
+def numbers(start: int, stop: int, delay: float = 0.0) -> Iterator[int]:
+    for i in range(start, stop):
+        time.sleep(delay)
+        yield i
+
+
+@athreading.iterate
+def failing(items: int) -> Iterator[int]:
+    yield from range(items)
+    raise ValueError("failed")
+
+
+@athreading.iterate
+def forever(value: int, stop: threading.Event) -> Iterator[int]:
+    while not stop.is_set():
+        yield value
+        time.sleep(0.001)
+
+
+@athreading.iterate_callback
+def callbacks(callback: Callable[[int], None], items: int) -> None:
+    for i in range(items):
+        callback(i)
+
+
+@contextlib.asynccontextmanager
+async def native(items: int, delay: float = 0.0) -> AsyncIterator[AsyncIterator[int]]:
+    async def generate() -> AsyncIterator[int]:
+        for i in range(items):
+            await asyncio.sleep(delay)
+            yield -i
+
+    yield generate()
+
+
+@pytest.mark.asyncio
+async def test_merge():
+    async with athreading.merge(
+        numbers(0, 100), numbers(100, 150, 0.001), numbers(150, 200)
+    ) as merged:
+        items = [item async for item in merged]
+    assert sorted(items) == list(range(200))
+
+
+@pytest.mark.asyncio
+async def test_merge_keeps_stream_order():
+    async with athreading.merge(numbers(0, 50), numbers(100, 150, 0.001)) as merged:
+        items = [item async for item in merged]
+    assert [item for item in items if item < 100] == list(range(50))
+    assert [item for item in items if item >= 100] == list(range(100, 150))
+
+
+@pytest.mark.asyncio
+async def test_merge_round_robin():
+    async with athreading.merge(
+        numbers(0, 5), numbers(10, 15), numbers(20, 25)
+    ) as merged:
+        # let every worker buffer its whole stream
+        await asyncio.sleep(0.2)
+        items = [item async for item in merged]
+    assert items == [0, 10, 20, 1, 11, 21, 2, 12, 22, 3, 13, 23, 4, 14, 24]
+
+
+@pytest.mark.asyncio
+async def test_merge_waits_without_tasks():
+    async with athreading.merge(
+        numbers(0, 20, 0.002), numbers(20, 40, 0.003)
+    ) as merged:
+        tasks = set()
+        items = []
+        async for item in merged:
+            tasks.update(asyncio.all_tasks())
+            items.append(item)
+    assert sorted(items) == list(range(40))
+    assert tasks == {asyncio.current_task()}
+
+
+@pytest.mark.asyncio
+async def test_merge_error():
+    async with athreading.merge(failing(2), numbers(10, 20, 0.005)) as merged:
+        items = []
+        with pytest.raises(ValueError, match="failed"):
+            async for item in merged:
+                items.append(item)
+        assert [item for item in items if item < 10] == [0, 1]
+        items.extend([item async for item in merged])
+    assert sorted(items) == [0, 1, *range(10, 20)]
+
+
+@pytest.mark.asyncio
+async def test_merge_early_exit():
+    stop = threading.Event()
+    async with athreading.merge(forever(1, stop), forever(2, stop)) as merged:
+        items = [await merged.__anext__() for _ in range(10)]
+        stop.set()
+    assert set(items) == {1, 2}
+
+
+@pytest.mark.asyncio
+async def test_merge_callbacks():
+    async with athreading.merge(callbacks(10), numbers(10, 20)) as merged:
+        items = [item async for item in merged]
+    assert sorted(items) == list(range(20))
+
+
+@pytest.mark.asyncio
+async def test_merge_other_streams():
+    async with athreading.merge(native(10, 0.001), numbers(0, 10)) as merged:
+        items = [item async for item in merged]
+    assert sorted(items) == [*range(-9, 1), *range(10)]
+
+
+@pytest.mark.asyncio
+async def test_merge_nothing():
+    async with athreading.merge() as merged:
+        assert [item async for item in merged] == []
+
+
+@pytest.mark.asyncio
+async def test_merge_enter_error():
+    stop = threading.Event()
+
+    class Broken(contextlib.AbstractAsyncContextManager):
+        async def __aenter__(self):
+            raise RuntimeError("enter")
+
+        async def __aexit__(self, *exc_info):
+            pass  # pragma: no cover
+
+    with pytest.raises(RuntimeError, match="enter"):
+        async with athreading.merge(forever(1, stop), Broken()):
+            pass  # pragma: no cover
+    stop.set()
+
+
+@pytest.mark.asyncio
+async def test_zip():
+    async with athreading.zip(numbers(0, 10), numbers(10, 15, 0.001)) as zipped:
+        items = [item async for item in zipped]
+    assert items == list(zip(range(0, 10), range(10, 15)))
+
+
+@pytest.mark.asyncio
+async def test_zip_three():
+    async with athreading.zip(numbers(0, 5), callbacks(5), native(5, 0.001)) as zipped:
+        items = [item async for item in zipped]
+    assert items == [(i, i, -i) for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_zip_nothing():
+    async with athreading.zip() as zipped:
+        assert [item async for item in zipped] == []
+
+
+@pytest.mark.asyncio
+async def test_zip_error():
+    async with athreading.zip(failing(2), numbers(0, 10)) as zipped:
+        assert await zipped.__anext__() == (0, 0)
+        assert await zipped.__anext__() == (1, 1)
+        with pytest.raises(ValueError, match="failed"):
+            await zipped.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_zip_keeps_items_on_cancel():
+    release = threading.Event()
+
+    @athreading.iterate
+    def slow() -> Iterator[str]:
+        assert release.wait(1.0)
+        yield "a"
+        yield "b"
+
+    async with athreading.zip(numbers(0, 2), slow()) as zipped:
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(zipped.__anext__(), 0.05)
+        release.set()
+        items = [item async for item in zipped]
+    assert items == [(0, "a"), (1, "b")]
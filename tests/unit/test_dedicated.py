@@ -0,0 +1,83 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import pytest
+
+import athreading
+
+
+def thread_generator():
+    thread = threading.current_thread()
+    yield thread.name
+    yield thread.daemon
+
+
+def thread_callback(callback: Callable[[object], None]) -> None:
+    for item in thread_generator():
+        callback(item)
+
+
+STREAMFNS = [
+    lambda **kwargs: athreading.iterate(**kwargs)(thread_generator),
+    lambda **kwargs: athreading.generate(**kwargs)(thread_generator),
+    lambda **kwargs: athreading.iterate_callback(**kwargs)(thread_callback),
+]
+STREAMFN_IDS = ["iterate", "generate", "iterate_callback"]
+
+
+@pytest.mark.parametrize("streamfn", STREAMFNS, ids=STREAMFN_IDS)
+@pytest.mark.asyncio
+async def test_dedicated_thread(streamfn):
+    astream = streamfn(thread="dedicated")
+    for _ in range(2):
+        async with astream() as stream:
+            name, daemon = [item async for item in stream]
+        assert name.startswith("athreading-thread_")
+        assert daemon is True
+    assert threading.current_thread().name != name
+
+
+release = threading.Event()
+
+
+def blocking_generator():
+    yield 0
+    release.wait()
+
+
+def blocking_callback(callback: Callable[[int], None]) -> None:
+    callback(0)
+    release.wait()
+
+
+@pytest.mark.parametrize(
+    "astream",
+    [
+        athreading.iterate(thread="dedicated")(blocking_generator),
+        athreading.generate(thread="dedicated")(blocking_generator),
+        athreading.iterate_callback(thread="dedicated")(blocking_callback),
+    ],
+    ids=STREAMFN_IDS,
+)
+@pytest.mark.asyncio
+async def test_dedicated_thread_keeps_executor_free(astream):
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1)
+    loop.set_default_executor(executor)
+    release.clear()
+    async with astream() as stream:
+        assert await stream.__anext__() == 0
+        # the only default executor thread is still free for calls
+        assert await asyncio.wait_for(athreading.call(threading.get_ident)(), 1.0)
+        release.set()
+    executor.shutdown()
+
+
+@pytest.mark.parametrize("streamfn", STREAMFNS, ids=STREAMFN_IDS)
+def test_dedicated_thread_invalid(streamfn):
+    with pytest.raises(ValueError, match="dedicated"):
+        streamfn(thread="dedicated", pool="dedicated")
+    with pytest.raises(ValueError, match="thread"):
+        streamfn(thread="process")
@@ -0,0 +1,109 @@
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import pytest
+
+import athreading
+from athreading.callback_single import await_callback
+
+
+def thread_name() -> str:
+    return threading.current_thread().name
+
+
+def iterate_thread_name():
+    yield thread_name()
+
+
+def callback_thread_name(callback: Callable[[str], None]) -> None:
+    callback(thread_name())
+
+
+async def alist(streamcontext):
+    async with streamcontext as stream:
+        return [value async for value in stream]
+
+
+@pytest.mark.parametrize(
+    "athread_name",
+    [
+        lambda pool: athreading.call(thread_name, pool=pool)(),
+        lambda pool: athreading.call(pool=pool)(thread_name)(),
+        lambda pool: athreading.single_callback(callback_thread_name, pool=pool)(),
+        lambda pool: await_callback(callback_thread_name, pool=pool)(),
+        lambda pool: alist(athreading.iterate(iterate_thread_name, pool=pool)()),
+        lambda pool: alist(athreading.generate(iterate_thread_name, pool=pool)()),
+        lambda pool: alist(
+            athreading.iterate_callback(callback_thread_name, pool=pool)()
+        ),
+    ],
+    ids=[
+        "call",
+        "call_lazy",
+        "single_callback",
+        "await_callback",
+        "iterate",
+        "generate",
+        "callback",
+    ],
+)
+@pytest.mark.asyncio
+async def test_named_pool_thread_name(athread_name):
+    result = await athread_name("test_named_pool_thread_name")
+    name = result[0] if isinstance(result, list) else result
+    assert name.startswith("athreading-test_named_pool_thread_name")
+
+
+@pytest.mark.asyncio
+async def test_configure_pool():
+    athreading.configure_pool(
+        "test_configure_pool", max_workers=1, thread_name_prefix="custom"
+    )
+
+    @athreading.call(pool="test_configure_pool")
+    def sleep_thread_name(delay: float) -> str:
+        time.sleep(delay)
+        return thread_name()
+
+    start = time.perf_counter()
+    names = await asyncio.gather(sleep_thread_name(0.1), sleep_thread_name(0.1))
+    assert time.perf_counter() - start >= 0.2
+    assert names[0] == names[1]
+    assert names[0].startswith("custom")
+
+    with pytest.raises(RuntimeError, match="already running"):
+        athreading.configure_pool("test_configure_pool", max_workers=2)
+
+
+def test_get_pool_is_lazy_and_isolated():
+    pool = athreading.get_pool("test_get_pool")
+    assert athreading.get_pool("test_get_pool") is pool
+    assert athreading.get_pool("test_get_pool_other") is not pool
+
+
+def test_shutdown_pools():
+    pool = athreading.get_pool("test_shutdown_pools")
+    athreading.shutdown_pools()
+    with pytest.raises(RuntimeError):
+        pool.submit(thread_name)
+    assert athreading.get_pool("test_shutdown_pools") is not pool
+
+
+def test_pool_and_executor_exclusive():
+    with pytest.raises(ValueError, match="mutually exclusive"):
+        athreading.call(thread_name, executor=ThreadPoolExecutor(), pool="pool")
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_gil_enabled(monkeypatch, enabled):
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: enabled, raising=False)
+    assert athreading.gil_enabled() is enabled
+
+
+def test_gil_enabled_before_free_threading(monkeypatch):
+    monkeypatch.delattr(sys, "_is_gil_enabled", raising=False)
+    assert athreading.gil_enabled()
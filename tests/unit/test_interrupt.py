@@ -0,0 +1,126 @@
+import asyncio
+import collections.abc
+import threading
+import time
+
+import pytest
+
+import athreading
+
+
+class BlockingSource:
+    """Iterator yielding one item then blocking until closed, like a socket reader."""
+
+    def __init__(self):
+        self.interrupts = 0
+        self._closed = threading.Event()
+        self._first = True
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._first:
+            self._first = False
+            return 0
+        self._closed.wait()
+        raise OSError("closed")
+
+    def close(self):
+        self.interrupts += 1
+        self._closed.set()
+
+
+class BlockingGenerator(BlockingSource, collections.abc.Generator[int, None, None]):
+    def send(self, value):
+        return self.__next__()
+
+    def throw(self, typ, val=None, tb=None):
+        raise typ
+
+
+STREAMFNS = [
+    lambda **kwargs: athreading.iterate(**kwargs)(BlockingGenerator),
+    # prime the generator so that its worker blocks in the source
+    lambda **kwargs: athreading.generate(buffer_maxsize=1, **kwargs)(BlockingGenerator),
+]
+STREAMFN_IDS = ["iterate", "generate"]
+
+
+@pytest.mark.parametrize("streamfn", STREAMFNS, ids=STREAMFN_IDS)
+@pytest.mark.asyncio
+async def test_interrupt_blocked_source(streamfn):
+    sources = []
+
+    def interrupt(source):
+        sources.append(source)
+        source.close()
+
+    start = time.perf_counter()
+    async with streamfn(interrupt=interrupt)() as stream:
+        assert await stream.__anext__() == 0
+        await asyncio.sleep(0.05)
+    assert time.perf_counter() - start < 0.5
+    assert len(sources) == 1
+    assert sources[0].interrupts == 1
+
+
+def finite_generator():
+    yield 0
+
+
+@pytest.mark.parametrize(
+    "streamfn",
+    [
+        lambda **kwargs: athreading.iterate(**kwargs)(lambda: iter([0])),
+        lambda **kwargs: athreading.generate(**kwargs)(finite_generator),
+    ],
+    ids=STREAMFN_IDS,
+)
+@pytest.mark.asyncio
+async def test_interrupt_exhausted_source(streamfn):
+    sources = []
+    async with streamfn(interrupt=sources.append)() as stream:
+        assert [item async for item in stream] == [0]
+    assert sources == []
+
+
+@pytest.mark.parametrize("streamfn", STREAMFNS, ids=STREAMFN_IDS)
+@pytest.mark.asyncio
+async def test_exit_timeout(streamfn):
+    sources = []
+    start = time.perf_counter()
+    with pytest.warns(RuntimeWarning, match="abandoned"):
+        async with streamfn(interrupt=sources.append, exit_timeout=0.05)() as stream:
+            assert await stream.__anext__() == 0
+            await asyncio.sleep(0.05)
+    assert time.perf_counter() - start < 0.5
+    # the hook did not unblock the source, so release the abandoned thread
+    sources[0].close()
+    await asyncio.wait_for(asyncio.get_running_loop().shutdown_default_executor(), 1.0)
+
+
+@pytest.mark.parametrize("streamfn", STREAMFNS, ids=STREAMFN_IDS)
+def test_exit_timeout_asyncio_run(streamfn):
+    sources = []
+
+    async def consume():
+        async with streamfn(interrupt=sources.append, exit_timeout=0.05)() as stream:
+            assert await stream.__anext__() == 0
+            await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    with pytest.warns(RuntimeWarning, match="abandoned"):
+        asyncio.run(consume())
+    assert time.perf_counter() - start < 0.5
+    sources[0].close()
+
+
+@pytest.mark.asyncio
+async def test_interrupt_class():
+    source = BlockingSource()
+    async with athreading.ThreadedAsyncIterator(
+        source, interrupt=source.close, exit_timeout=1.0
+    ) as stream:
+        assert await stream.__anext__() == 0
+    assert source.interrupts == 1
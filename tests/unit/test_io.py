@@ -0,0 +1,218 @@
+import asyncio
+import io
+import mmap
+
+import pytest
+
+import athreading
+
+DATA = bytes(range(256)) * 10
+TEXT = "".join(f"line {i}\n" for i in range(100)) + "last"
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(DATA)
+    return path
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text(TEXT)
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 10_000])
+@pytest.mark.asyncio
+async def test_read(data_file, chunk_size):
+    async with athreading.io.open(data_file, "rb", chunk_size=chunk_size) as f:
+        assert not f.closed
+        assert await f.read(3) == DATA[:3]
+        assert await f.read(0) == b""
+        assert await f.read(250) == DATA[3:253]
+        assert await f.read() == DATA[253:]
+        assert await f.read() == b""
+    assert f.closed
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 10_000])
+@pytest.mark.asyncio
+async def test_readinto(data_file, chunk_size):
+    buffer = bytearray(1000)
+    chunks = []
+    async with athreading.io.open(data_file, "rb", chunk_size=chunk_size) as f:
+        while size := await f.readinto(buffer):
+            chunks.append(bytes(buffer[:size]))
+    assert b"".join(chunks) == DATA
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 560]
+
+
+@pytest.mark.asyncio
+async def test_readinto_text(text_file):
+    async with athreading.io.open(text_file) as f:
+        with pytest.raises(io.UnsupportedOperation):
+            await f.readinto(bytearray(10))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 10_000])
+@pytest.mark.asyncio
+async def test_readline(text_file, chunk_size):
+    async with athreading.io.open(text_file, chunk_size=chunk_size) as f:
+        assert await f.readline() == "line 0\n"
+        assert await f.readline(3) == "lin"
+        assert await f.readline() == "e 1\n"
+        lines = [line async for line in f]
+        assert await f.readline() == ""
+    assert lines == TEXT.splitlines(keepends=True)[2:]
+
+
+@pytest.mark.asyncio
+async def test_readline_binary(data_file):
+    async with athreading.io.open(data_file, "rb", chunk_size=100) as f:
+        lines = [line async for line in f]
+    assert b"".join(lines) == DATA
+    assert lines[0] == DATA[: DATA.index(b"\n") + 1]
+
+
+@pytest.mark.asyncio
+async def test_read_ahead(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(100))
+    async with athreading.io.open(path, "rb", chunk_size=10, read_ahead=2) as f:
+        assert await f.read(1) == bytes(1)
+        await asyncio.sleep(0.1)
+        assert f._chunks is not None
+        assert len(f._chunks._channel) == 2
+        assert await f.read() == bytes(99)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 10_000])
+@pytest.mark.asyncio
+async def test_write(tmp_path, chunk_size):
+    path = tmp_path / "out.bin"
+    async with athreading.io.open(path, "wb", chunk_size=chunk_size) as f:
+        for i in range(0, len(DATA), 100):
+            assert await f.write(DATA[i : i + 100]) == len(DATA[i : i + 100])
+    assert path.read_bytes() == DATA
+
+
+@pytest.mark.asyncio
+async def test_write_text_append(text_file):
+    async with athreading.io.open(text_file, "a", chunk_size=4) as f:
+        await f.write("\nmore")
+        await f.flush()
+        assert text_file.read_text() == TEXT + "\nmore"
+        await f.write("!")
+    assert text_file.read_text() == TEXT + "\nmore!"
+
+
+@pytest.mark.asyncio
+async def test_write_error(tmp_path):
+    async with athreading.io.open(tmp_path / "out.txt", "w", chunk_size=1) as f:
+        await f.write("\udc80")
+        with pytest.raises(UnicodeEncodeError):
+            await f.flush()
+
+
+@pytest.mark.asyncio
+async def test_unsupported_operations(data_file, tmp_path):
+    async with athreading.io.open(data_file, "rb") as f:
+        with pytest.raises(io.UnsupportedOperation):
+            await f.write(b"data")
+    async with athreading.io.open(tmp_path / "out.bin", "xb") as f:
+        with pytest.raises(io.UnsupportedOperation):
+            await f.read()
+    with pytest.raises(ValueError, match="closed"):
+        await f.write(b"data")
+    with pytest.raises(ValueError, match="closed"):
+        await f.read()
+
+
+@pytest.mark.asyncio
+async def test_open_missing(tmp_path):
+    f = athreading.io.open(tmp_path / "missing.bin", "rb")
+    with pytest.raises(FileNotFoundError):
+        async with f:
+            pass
+    assert f.closed
+
+
+@pytest.mark.asyncio
+async def test_exit_early(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(1 << 20))
+    async with athreading.io.open(path, "rb", chunk_size=1024, read_ahead=1) as f:
+        assert await f.read(10) == bytes(10)
+    assert f.closed
+    await f.aclose()
+
+
+@pytest.mark.asyncio
+async def test_open_pool(data_file):
+    async with athreading.io.open(data_file, "rb", pool="io-test") as f:
+        assert await f.read() == DATA
+    athreading.shutdown_pools()
+
+
+def test_open_invalid(data_file):
+    with pytest.raises(ValueError, match="mode"):
+        athreading.io.open(data_file, "r+")
+    with pytest.raises(ValueError, match="chunk_size"):
+        athreading.io.open(data_file, chunk_size=0)
+    with pytest.raises(ValueError, match="read_ahead"):
+        athreading.io.open(data_file, read_ahead=0)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4096, 10_000, 1 << 20])
+@pytest.mark.asyncio
+async def test_mmap_chunks(tmp_path, chunk_size):
+    path = tmp_path / "data.bin"
+    data = DATA * 100
+    path.write_bytes(data)
+    async with athreading.io.mmap_chunks(path, chunk_size) as stream:
+        chunks = [view async for view in stream]
+    assert all(isinstance(view, memoryview) and view.readonly for view in chunks)
+    assert b"".join(chunks) == data
+    assert all(len(view) % mmap.PAGESIZE == 0 for view in chunks[:-1])
+    assert len(chunks[0]) >= min(chunk_size, len(data))
+
+
+@pytest.mark.asyncio
+async def test_mmap_chunks_unmaps(data_file):
+    async with athreading.io.mmap_chunks(data_file) as stream:
+        assert sum([len(view) async for view in stream]) == len(DATA)
+    assert stream._source._mmap.closed
+
+
+@pytest.mark.asyncio
+async def test_mmap_chunks_keeps_exported_views(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(3 * mmap.PAGESIZE))
+    async with athreading.io.mmap_chunks(path, mmap.PAGESIZE, read_ahead=1) as stream:
+        view = await stream.__anext__()
+    assert not stream._source._mmap.closed
+    assert bytes(view) == bytes(mmap.PAGESIZE)
+
+
+@pytest.mark.asyncio
+async def test_mmap_chunks_empty(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    async with athreading.io.mmap_chunks(path) as stream:
+        assert [view async for view in stream] == []
+
+
+@pytest.mark.asyncio
+async def test_mmap_chunks_missing(tmp_path):
+    async with athreading.io.mmap_chunks(tmp_path / "missing.bin") as stream:
+        with pytest.raises(FileNotFoundError):
+            await stream.__anext__()
+
+
+def test_mmap_chunks_invalid(data_file):
+    with pytest.raises(ValueError, match="chunk_size"):
+        athreading.io.mmap_chunks(data_file, 0)
+    with pytest.raises(ValueError, match="read_ahead"):
+        athreading.io.mmap_chunks(data_file, read_ahead=0)
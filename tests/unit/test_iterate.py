@@ -221,3 +221,23 @@ async def test_iterate_background_exception_suppress():
         with pytest.raises(ZeroDivisionError, match="float division by zero"):
             await ait.__anext__()
         assert await ait.__anext__() == 1
+
+
+def generate_infinite_values():
+    value = 0
+    while True:
+        yield value
+        value += 1
+
+
+@pytest.mark.asyncio
+async def test_iterate_exit_full_buffer_latency():
+    """test the worker is released promptly when exiting with a full buffer"""
+    async with athreading.iterate(
+        generate_infinite_values, buffer_maxsize=1
+    )() as stream:
+        assert await stream.__anext__() == 0
+        await asyncio.sleep(0.1)
+        start = time.perf_counter()
+    assert time.perf_counter() - start < 0.05
+    await asyncio.wait_for(asyncio.get_running_loop().shutdown_default_executor(), 1.0)
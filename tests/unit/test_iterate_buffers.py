@@ -0,0 +1,128 @@
+import asyncio
+import ctypes
+import io
+import os
+import threading
+import time
+
+import pytest
+
+import athreading
+
+DATA = bytes(range(256)) * 10
+
+
+class BlockingReader(io.RawIOBase):
+    """Reader returning chunks until it is closed."""
+
+    def __init__(self):
+        self.reads = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        self.reads += 1
+        buffer[:] = bytes(len(buffer))
+        return len(buffer)
+
+
+@athreading.iterate_buffers(buffer_size=100, pool_size=2)
+def read_data(data: bytes) -> io.BytesIO:
+    return io.BytesIO(data)
+
+
+@pytest.mark.asyncio
+async def test_iterate_buffers():
+    chunks = []
+    buffers = set()
+    reader = io.BytesIO(DATA)
+    async with athreading.iterate_buffers(lambda: reader, buffer_size=100)() as stream:
+        async for view in stream:
+            assert isinstance(view, memoryview)
+            buffers.add(id(view.obj))
+            chunks.append(bytes(view))
+    assert b"".join(chunks) == DATA
+    assert [len(chunk) for chunk in chunks[-2:]] == [100, len(DATA) % 100]
+    assert len(buffers) <= 4
+    assert reader.closed
+
+
+@pytest.mark.asyncio
+async def test_iterate_buffers_releases_views():
+    async with read_data(DATA) as stream:
+        first = await stream.__anext__()
+        assert bytes(first) == DATA[:100]
+        second = await stream.__anext__()
+        with pytest.raises(ValueError):
+            bytes(first)
+        assert bytes(second) == DATA[100:200]
+
+
+@pytest.mark.asyncio
+async def test_iterate_buffers_replaces_exported_buffer():
+    async with read_data(DATA) as stream:
+        view = await stream.__anext__()
+        exported = (ctypes.c_char * 100).from_buffer(view)
+        chunks = [bytes(view) async for view in stream]
+    assert exported.raw == DATA[:100]
+    assert b"".join(chunks) == DATA[100:]
+
+
+@pytest.mark.parametrize("max_items", [1, 2, 8])
+@pytest.mark.asyncio
+async def test_iterate_buffers_batches(max_items):
+    chunks = []
+    async with read_data(DATA) as stream:
+        async for batch in stream.batches(max_items):
+            assert len(batch) <= min(max_items, 2)
+            chunks.extend(bytes(view) for view in batch)
+    assert b"".join(chunks) == DATA
+
+
+@pytest.mark.asyncio
+async def test_iterate_buffers_bounded_and_early_exit():
+    reader = BlockingReader()
+    async with athreading.iterate_buffers(lambda: reader, pool_size=3)() as stream:
+        await stream.__anext__()
+        await asyncio.sleep(0.05)
+        assert reader.reads == 3
+        start = time.perf_counter()
+    assert time.perf_counter() - start < 0.05
+    assert reader.closed
+    assert not [t for t in threading.enumerate() if t.name.startswith("athreading")]
+
+
+@pytest.mark.asyncio
+async def test_iterate_buffers_reader_error():
+    class FailingReader(io.RawIOBase):
+        def readinto(self, buffer):
+            raise OSError("read failed")
+
+    reader = FailingReader()
+    with pytest.raises(OSError, match="read failed"):
+        async with athreading.iterate_buffers(lambda: reader)() as stream:
+            await stream.__anext__()
+    assert reader.closed
+
+
+@pytest.mark.asyncio
+async def test_iterate_buffers_non_blocking_reader():
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    reader = open(read_fd, "rb", buffering=0)
+    try:
+        with pytest.raises(ValueError, match="blocking"):
+            async with athreading.iterate_buffers(lambda: reader)() as stream:
+                await stream.__anext__()
+        assert reader.closed
+    finally:
+        os.close(write_fd)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"buffer_size": 0}, {"pool_size": 0}], ids=["buffer_size", "pool_size"]
+)
+def test_iterate_buffers_invalid(kwargs):
+    with pytest.raises(ValueError, match="at least 1"):
+        athreading.iterate_buffers(**kwargs)
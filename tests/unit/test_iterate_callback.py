@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 import functools
 import sys
+import threading
 import time
 from collections.abc import AsyncGenerator
 from concurrent.futures import ThreadPoolExecutor
@@ -163,3 +164,146 @@ async def test_callback_iterate_exception():
                 yielded.append(res)  # noqa: PERF401
 
     assert yielded == TEST_VALUES[:3]
+
+
+@pytest.mark.parametrize("buffer_maxsize", [1, 2, 3])
+@pytest.mark.asyncio
+async def test_callback_iterate_buffer_maxsize(buffer_maxsize: int):
+    """test the callback blocks the producer once the buffer is full"""
+    pushed = []
+
+    def push(callback: Callable[[TestData], None]) -> None:
+        for item in TEST_VALUES:
+            callback(item)
+            pushed.append(item)
+
+    async with athreading.iterate_callback(
+        push, buffer_maxsize=buffer_maxsize
+    )() as stream:
+        await asyncio.sleep(0.1)
+        assert pushed == TEST_VALUES[:buffer_maxsize]
+        output = [value async for value in stream]
+
+    assert output == TEST_VALUES
+    assert pushed == TEST_VALUES
+    await asyncio.wait_for(asyncio.get_running_loop().shutdown_default_executor(), 1.0)
+
+
+@pytest.mark.asyncio
+async def test_callback_iterate_exit_full_buffer():
+    """test exiting unblocks the producer and drops later values"""
+    pushed = []
+
+    def push_forever(callback: Callable[[int], None]) -> None:
+        for item in range(1000):
+            callback(item)
+            pushed.append(item)
+
+    async with athreading.iterate_callback(push_forever, buffer_maxsize=1)() as stream:
+        assert await stream.__anext__() == 0
+        await asyncio.sleep(0.1)
+        start = time.perf_counter()
+    assert time.perf_counter() - start < 0.05
+
+    await asyncio.wait_for(asyncio.get_running_loop().shutdown_default_executor(), 1.0)
+    assert pushed == list(range(1000))
+
+
+@pytest.mark.parametrize("buffer_maxsize", [1, 2, 8])
+@pytest.mark.asyncio
+async def test_callback_iterate_multiple_producers(buffer_maxsize: int):
+    """test several producer threads blocked on a full buffer are all released"""
+    producers = 4
+
+    def push_from_threads(callback: Callable[[int], None]) -> None:
+        def push(i: int) -> None:
+            for j in range(200):
+                callback(i * 1000 + j)
+
+        threads = [threading.Thread(target=push, args=(i,)) for i in range(producers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    async with athreading.iterate_callback(
+        push_from_threads, buffer_maxsize=buffer_maxsize
+    )() as stream:
+        output = await asyncio.wait_for(asyncio.ensure_future(alist(stream)), 5.0)
+
+    assert sorted(output) == [
+        i * 1000 + j for i in range(producers) for j in range(200)
+    ]
+    for i in range(producers):
+        assert [v for v in output if v // 1000 == i] == [
+            i * 1000 + j for j in range(200)
+        ]
+
+
+async def alist(stream) -> list[int]:
+    return [value async for value in stream]
+
+
+def push_range(callback: Callable[[int], None], n: int = 10) -> None:
+    for item in range(n):
+        callback(item)
+
+
+@pytest.mark.parametrize(
+    ("overflow", "buffer_maxsize", "conflate_key", "expected"),
+    [
+        ("drop_newest", 2, None, [0, 1]),
+        ("drop_oldest", 2, None, [8, 9]),
+        ("conflate", None, None, [9]),
+        ("conflate", None, lambda v: v % 3, [9, 7, 8]),
+        ("conflate", 2, lambda v: v % 3, [8, 9]),
+    ],
+    ids=["drop_newest", "drop_oldest", "conflate", "conflate_key", "conflate_bounded"],
+)
+@pytest.mark.asyncio
+async def test_callback_iterate_overflow(
+    overflow, buffer_maxsize, conflate_key, expected
+):
+    """test overflow policies never block the producer and count dropped values"""
+    stream = athreading.iterate_callback(
+        push_range,
+        buffer_maxsize=buffer_maxsize,
+        overflow=overflow,
+        conflate_key=conflate_key,
+    )()
+    async with stream:
+        await asyncio.sleep(0.1)
+        output = [value async for value in stream]
+
+    assert output == expected
+    assert isinstance(stream, CallbackThreadedAsyncIterator)
+    assert stream.dropped == 10 - len(expected)
+    await asyncio.wait_for(asyncio.get_running_loop().shutdown_default_executor(), 1.0)
+
+
+@pytest.mark.parametrize(
+    ("overflow", "buffer_maxsize", "match"),
+    [
+        ("drop_newest", None, "requires buffer_maxsize"),
+        ("drop_oldest", 0, "requires buffer_maxsize"),
+        ("latest", 1, "unknown overflow policy"),
+    ],
+)
+def test_callback_iterate_overflow_invalid(overflow, buffer_maxsize, match):
+    with pytest.raises(ValueError, match=match):
+        CallbackThreadedAsyncIterator(
+            push_range, buffer_maxsize=buffer_maxsize, overflow=overflow
+        )
+
+
+@pytest.mark.asyncio
+async def test_callback_iterate_without_gil(monkeypatch):
+    """test unbounded streams hand values off under a lock on free-threaded builds"""
+    monkeypatch.setattr("athreading.channels.gil_enabled", lambda: False)
+
+    async with athreading.iterate_callback(push_range)(1000) as stream:
+        assert isinstance(stream, CallbackThreadedAsyncIterator)
+        assert stream._channel._locked
+        output = [value async for value in stream]
+
+    assert output == list(range(1000))
@@ -0,0 +1,143 @@
+import asyncio
+import itertools
+import threading
+import time
+from collections.abc import Iterator
+
+import pytest
+
+import athreading
+
+
+def rows(partition: range) -> Iterator[int]:
+    for i in partition:
+        time.sleep(0.0001 * (i % 3))
+        yield i
+
+
+PARTITIONS = [range(start, start + 20) for start in range(0, 200, 20)]
+
+
+@pytest.mark.parametrize("workers", [1, 3, 100])
+@pytest.mark.asyncio
+async def test_iterate_partitions(workers):
+    async with athreading.iterate_partitions(
+        rows, PARTITIONS, workers=workers
+    ) as stream:
+        items = [item async for item in stream]
+    assert sorted(items) == list(range(200))
+    for partition in PARTITIONS:
+        assert [item for item in items if item in partition] == list(partition)
+
+
+@pytest.mark.parametrize("workers", [1, 3, 100])
+@pytest.mark.asyncio
+async def test_iterate_partitions_ordered(workers):
+    async with athreading.iterate_partitions(
+        rows, PARTITIONS, workers=workers, buffer_maxsize=4, ordered=True
+    ) as stream:
+        assert [item async for item in stream] == list(range(200))
+
+
+@pytest.mark.asyncio
+async def test_iterate_partitions_workers():
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+    threads = set()
+
+    def slow(partition: int) -> Iterator[int]:
+        nonlocal running, peak
+        threads.add(threading.current_thread())
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        yield partition
+        with lock:
+            running -= 1
+
+    async with athreading.iterate_partitions(slow, range(12), workers=3) as stream:
+        assert sorted([item async for item in stream]) == list(range(12))
+    assert peak == 3
+    assert threading.main_thread() not in threads
+
+
+@pytest.mark.asyncio
+async def test_iterate_partitions_backpressure():
+    produced = [0, 0]
+
+    def endless(partition: int) -> Iterator[int]:
+        for i in itertools.count():
+            produced[partition] += 1
+            yield i
+
+    async with athreading.iterate_partitions(
+        endless, range(2), workers=2, buffer_maxsize=4, ordered=True
+    ) as stream:
+        assert [await stream.__anext__() for _ in range(100)] == list(range(100))
+        await asyncio.sleep(0.05)
+        assert produced[0] <= 100 + 5
+        assert 0 < produced[1] <= 5
+
+
+@pytest.mark.asyncio
+async def test_iterate_partitions_lazy():
+    taken = []
+
+    def partitions() -> Iterator[int]:
+        for i in range(100):
+            taken.append(i)
+            yield i
+
+    async with athreading.iterate_partitions(
+        lambda partition: [partition], partitions(), workers=4, ordered=True
+    ) as stream:
+        assert taken == [0, 1, 2, 3]
+        assert await stream.__anext__() == 0
+        assert taken == [0, 1, 2, 3]
+        assert await stream.__anext__() == 1
+        assert taken == [0, 1, 2, 3, 4]
+    assert len(taken) == 5
+
+
+@pytest.mark.asyncio
+async def test_iterate_partitions_error():
+    def failing(partition: int) -> Iterator[int]:
+        yield partition
+        if partition == 1:
+            raise ValueError("failed")
+
+    async with athreading.iterate_partitions(failing, range(3), workers=1) as stream:
+        assert await stream.__anext__() == 0
+        assert await stream.__anext__() == 1
+        with pytest.raises(ValueError, match="failed"):
+            await stream.__anext__()
+        assert [item async for item in stream] == [2]
+
+
+@pytest.mark.asyncio
+async def test_iterate_partitions_early_exit():
+    def endless(partition: int) -> Iterator[int]:
+        yield from itertools.repeat(partition)
+
+    async with athreading.iterate_partitions(
+        endless, range(4), workers=2, buffer_maxsize=2, exit_timeout=1.0
+    ) as stream:
+        items = [await stream.__anext__() for _ in range(10)]
+    assert set(items) == {0, 1}
+
+
+@pytest.mark.asyncio
+async def test_iterate_partitions_empty():
+    async with athreading.iterate_partitions(rows, []) as stream:
+        assert [item async for item in stream] == []
+    async with athreading.iterate_partitions(rows, [range(0), range(2)]) as stream:
+        assert [item async for item in stream] == [0, 1]
+
+
+def test_iterate_partitions_invalid():
+    with pytest.raises(ValueError, match="workers must be at least 1"):
+        athreading.iterate_partitions(rows, PARTITIONS, workers=0)
+    with pytest.raises(ValueError, match="buffer_maxsize must be at least 1"):
+        athreading.iterate_partitions(rows, PARTITIONS, buffer_maxsize=0)
@@ -0,0 +1,144 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Iterator
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+import athreading
+from athreading.processes import _END, _HEADER_SIZE, _ITEM, _RECORD, _RING_SIZE, _Ring
+
+
+@athreading.iterate(backend="process", buffer_maxsize=4)
+def process_range(n: int) -> Iterator[tuple[int, int]]:
+    for i in range(n):
+        yield os.getpid(), i
+
+
+@athreading.iterate(backend="process")
+def process_blobs(n: int, size: int) -> Iterator[bytes]:
+    for i in range(n):
+        yield bytes([i]) * size
+
+
+@athreading.iterate(backend="process")
+def process_fail(n: int) -> Iterator[int]:
+    yield from range(n)
+    raise ValueError("source failed")
+
+
+@athreading.iterate(backend="process", buffer_maxsize=2)
+def process_count() -> Iterator[int]:
+    i = 0
+    while True:
+        yield i
+        i += 1
+
+
+@pytest.mark.asyncio
+async def test_iterate_process():
+    async with process_range(100) as stream:
+        items = [item async for item in stream]
+    assert [i for _, i in items] == list(range(100))
+    assert all(pid != os.getpid() for pid, _ in items)
+
+
+@pytest.mark.asyncio
+async def test_iterate_process_larger_than_ring():
+    size = _RING_SIZE + _RING_SIZE // 3
+    async with process_blobs(3, size) as stream:
+        items = [item async for item in stream]
+    assert items == [bytes([i]) * size for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_iterate_process_exception():
+    items = []
+    with pytest.raises(ValueError, match="source failed"):
+        async with process_fail(3) as stream:
+            async for item in stream:
+                items.append(item)
+    assert items == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_iterate_process_early_exit():
+    async with process_count() as stream:
+        items = [await stream.__anext__() for _ in range(5)]
+        source = stream._iterator
+        shm_name = source._shm.name
+        process = source._process
+    assert items == list(range(5))
+    # exiting frees the ring and joins the child, though the source was not exhausted
+    assert source._ring is None
+    assert not process.is_alive() and process.exitcode is not None
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=shm_name)
+
+
+@pytest.mark.asyncio
+async def test_iterate_process_buffer_maxsize():
+    async with process_range(5) as stream:
+        # the ring and the relayed buffer share buffer_maxsize
+        assert stream._channel._maxsize + stream._iterator._maxsize == 4
+        assert [i async for _, i in stream] == list(range(5))
+
+
+@pytest.mark.asyncio
+async def test_iterate_process_batches():
+    async with process_range(50) as stream:
+        batches = [batch async for batch in stream.batches(max_items=16)]
+    assert all(len(batch) <= 16 for batch in batches)
+    assert [i for batch in batches for _, i in batch] == list(range(50))
+
+
+def test_ring_backpressure() -> None:
+    cond = multiprocessing.get_context("spawn").Condition()
+    shm = SharedMemory(create=True, size=_HEADER_SIZE + 64)
+    ring = _Ring(shm, 64, cond)
+    written: list[int] = []
+    record = _RECORD.size + 20
+
+    def produce():
+        for i in range(10):
+            ring.put(_ITEM, bytes([i]) * 20, 2, lambda: True)
+            written.append(i)
+        ring.put(_END, b"", 0, lambda: True)
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    try:
+        time.sleep(0.05)
+        assert written == [0, 1]
+        out = bytearray()
+        released = 0
+        while len(out) < 10 * record + _RECORD.size:
+            seen = min(len(out) // record, 10)
+            assert ring.take(out, seen - released, lambda: True)
+            released = seen
+        thread.join(1.0)
+        assert written == list(range(10))
+    finally:
+        ring.close()
+        thread.join()
+        ring.release()
+        shm.close()
+        shm.unlink()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"interrupt": lambda source: None},
+        {"backend": "interpreter"},
+        {"buffer_maxsize": 1},
+    ],
+    ids=["interrupt", "backend", "buffer_maxsize"],
+)
+def test_iterate_process_invalid(kwargs):
+    kwargs.setdefault("backend", "process")
+    with pytest.raises(ValueError, match="backend"):
+        athreading.iterate(process_range.__wrapped__, **kwargs)
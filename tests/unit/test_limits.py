@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+from typing import Callable
+
+import pytest
+
+import athreading
+
+
+class ActiveCounter:
+    """Thread-safe count of concurrently active workers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def __enter__(self):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def __exit__(self, *exc_info):
+        with self._lock:
+            self.active -= 1
+
+
+def sleep_call(counter: ActiveCounter, delay: float) -> float:
+    with counter:
+        time.sleep(delay)
+    return delay
+
+
+def sleep_iterate(counter: ActiveCounter, delay: float):
+    with counter:
+        time.sleep(delay)
+        yield delay
+
+
+def sleep_callback(callback: Callable[[float], None], counter: ActiveCounter, delay):
+    with counter:
+        time.sleep(delay)
+        callback(delay)
+
+
+async def alist(streamcontext):
+    async with streamcontext as stream:
+        return [value async for value in stream]
+
+
+def stream_call(streamfn):
+    return lambda *args: alist(streamfn(*args))
+
+
+@pytest.mark.parametrize(
+    "acall",
+    [
+        lambda max_concurrency: athreading.call(
+            sleep_call, max_concurrency=max_concurrency
+        ),
+        lambda max_concurrency: stream_call(
+            athreading.iterate(sleep_iterate, max_concurrency=max_concurrency)
+        ),
+        lambda max_concurrency: stream_call(
+            athreading.generate(sleep_iterate, max_concurrency=max_concurrency)
+        ),
+        lambda max_concurrency: stream_call(
+            athreading.iterate_callback(sleep_callback, max_concurrency=max_concurrency)
+        ),
+    ],
+    ids=["call", "iterate", "generate", "iterate_callback"],
+)
+@pytest.mark.parametrize("max_concurrency", [1, 2, 3])
+@pytest.mark.asyncio
+async def test_max_concurrency(acall, max_concurrency: int):
+    counter = ActiveCounter()
+    fn = acall(max_concurrency)
+    results = await asyncio.gather(*(fn(counter, 0.05) for _ in range(6)))
+    assert all(result in (0.05, [0.05]) for result in results)
+    assert counter.max_active == max_concurrency
+    await asyncio.wait_for(asyncio.get_running_loop().shutdown_default_executor(), 1.0)
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_cancel_holds_slot():
+    """test a cancelled call keeps its slot until its worker thread finishes"""
+    counter = ActiveCounter()
+    fn = athreading.call(sleep_call, max_concurrency=1)
+    task = asyncio.create_task(fn(counter, 0.2))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    start = time.perf_counter()
+    await fn(counter, 0.0)
+    assert time.perf_counter() - start >= 0.1
+    assert counter.max_active == 1
+
+
+def test_max_concurrency_multiple_loops():
+    counter = ActiveCounter()
+    fn = athreading.call(sleep_call, max_concurrency=1)
+    assert asyncio.run(fn(counter, 0.0)) == 0.0
+    assert asyncio.run(fn(counter, 0.0)) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_context():
+    limit = athreading.ConcurrencyLimit(1)
+    assert limit.max_concurrency == 1
+    async with limit:
+        assert limit.locked()
+    assert not limit.locked()
+
+
+def test_max_concurrency_invalid():
+    with pytest.raises(ValueError, match="max_concurrency"):
+        athreading.call(sleep_call, max_concurrency=0)
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import athreading
+
+
+def square(x: int) -> int:
+    time.sleep(0.001 * (x % 3))
+    return x * x
+
+
+@pytest.mark.parametrize("concurrency", [1, 4, 100])
+@pytest.mark.asyncio
+async def test_map_ordered(concurrency):
+    async with athreading.map(square, range(50), concurrency=concurrency) as results:
+        assert [result async for result in results] == [x * x for x in range(50)]
+
+
+@pytest.mark.parametrize("concurrency", [1, 4, 100])
+@pytest.mark.asyncio
+async def test_map_unordered(concurrency):
+    async with athreading.map(
+        square, range(50), concurrency=concurrency, ordered=False
+    ) as results:
+        unordered = [result async for result in results]
+    assert sorted(unordered) == [x * x for x in range(50)]
+
+
+@pytest.mark.asyncio
+async def test_map_completion_order():
+    events = [threading.Event() for _ in range(3)]
+
+    def wait(i: int) -> int:
+        assert events[i].wait(1.0)
+        return i
+
+    async with athreading.map(wait, range(3), ordered=False) as results:
+        events[2].set()
+        assert await results.__anext__() == 2
+        events[0].set()
+        assert await results.__anext__() == 0
+        events[1].set()
+        assert await results.__anext__() == 1
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+@pytest.mark.asyncio
+async def test_map_bounded(ordered):
+    taken = []
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def items():
+        for i in range(1_000_000):
+            taken.append(i)
+            yield i
+
+    def track(x: int) -> int:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.001)
+        with lock:
+            running -= 1
+        return x
+
+    async with athreading.map(
+        track, items(), concurrency=3, ordered=ordered
+    ) as results:
+        for _ in range(20):
+            await results.__anext__()
+            assert len(taken) <= 23
+    assert peak <= 3
+    assert len(taken) <= 23
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+@pytest.mark.asyncio
+async def test_map_error(ordered):
+    def fail_on_two(x: int) -> int:
+        if x == 2:
+            raise ValueError(x)
+        return x
+
+    results = []
+    async with athreading.map(fail_on_two, range(5), ordered=ordered) as stream:
+        while True:
+            try:
+                results.append(await stream.__anext__())
+            except ValueError as e:
+                assert e.args == (2,)
+            except StopAsyncIteration:
+                break
+    assert sorted(results) == [0, 1, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_map_exit_waits_for_calls():
+    finished = []
+
+    def slow(x: int) -> int:
+        time.sleep(0.05)
+        finished.append(x)
+        if x:
+            raise ValueError(x)
+        return x
+
+    async with athreading.map(slow, range(10), concurrency=3) as results:
+        assert await results.__anext__() == 0
+    assert sorted(finished) == [0, 1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_map_cancelled_next():
+    event = threading.Event()
+    async with athreading.map(event.wait, [1.0], concurrency=1) as results:
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(results.__anext__(), 0.01)
+        event.set()
+        assert await results.__anext__() is True
+
+
+@pytest.mark.asyncio
+async def test_map_pool():
+    async with athreading.map(square, range(5), pool="map-test") as results:
+        assert [result async for result in results] == [0, 1, 4, 9, 16]
+    athreading.shutdown_pools()
+
+
+@pytest.mark.asyncio
+async def test_map_batches():
+    async with athreading.map(square, range(10), concurrency=4) as results:
+        batches = [batch async for batch in results.batches(4)]
+    assert sum(batches, []) == [x * x for x in range(10)]
+
+
+def test_map_invalid():
+    with pytest.raises(ValueError, match="concurrency"):
+        athreading.map(square, range(5), concurrency=0)
@@ -0,0 +1,144 @@
+import asyncio
+import itertools
+import threading
+import time
+
+import pytest
+
+import athreading
+
+
+def parse(line: str) -> int:
+    return int(line)
+
+
+def double(x: int) -> int:
+    return 2 * x
+
+
+def slow_double(x: int) -> int:
+    time.sleep(0.001 * (x % 3))
+    return 2 * x
+
+
+async def alist(stream) -> list[object]:
+    async with stream as items:
+        return [item async for item in items]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_source_only():
+    assert await alist(athreading.pipeline(range(5))) == list(range(5))
+
+
+@pytest.mark.parametrize("buffer", [1, 64])
+@pytest.mark.asyncio
+async def test_pipeline_stages(buffer):
+    lines = (str(i) for i in range(1000))
+    results = await alist(athreading.pipeline(lines, parse, double, buffer=buffer))
+    assert results == [2 * i for i in range(1000)]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stage_threads():
+    names = {}
+
+    def record(stage):
+        def run(x):
+            names.setdefault(stage, set()).add(threading.current_thread().name)
+            return x
+
+        return run
+
+    stream = athreading.pipeline(range(100), record("a"), record("b"), record("c"))
+    assert await alist(stream) == list(range(100))
+    assert threading.current_thread().name not in set.union(*names.values())
+    assert len(set.union(*names.values())) == 3
+
+
+@pytest.mark.parametrize("workers", [3, [1, 3, 1], [3, 3, 3], [1, 1, 4]])
+@pytest.mark.asyncio
+async def test_pipeline_workers(workers):
+    stream = athreading.pipeline(
+        range(200), slow_double, slow_double, double, workers=workers
+    )
+    results = await alist(stream)
+    assert sorted(results) == [8 * i for i in range(200)]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_bounded():
+    taken = []
+
+    def source():
+        for i in range(10_000):
+            taken.append(i)
+            yield i
+
+    async with athreading.pipeline(source(), double, double, buffer=4) as stream:
+        assert await stream.__anext__() == 0
+        await asyncio.sleep(0.1)
+        # one item per pipe, channel and stage in flight on top of the buffers
+        assert len(taken) <= 4 * 4 + 4
+
+
+@pytest.mark.parametrize("failing", [0, 1, 2])
+@pytest.mark.asyncio
+async def test_pipeline_error(failing):
+    def source():
+        yield from range(10)
+        if failing == 0:
+            raise ValueError("source")
+
+    def fail(x: int) -> int:
+        if x >= 5:
+            raise ValueError("stage")
+        return x
+
+    stages = [double if i + 1 != failing else fail for i in range(2)]
+    results = []
+    with pytest.raises(ValueError):
+        async with athreading.pipeline(source(), *stages) as stream:
+            async for item in stream:
+                results.append(item)
+    assert len(results) <= 10
+
+
+@pytest.mark.asyncio
+async def test_pipeline_early_exit():
+    stopped = threading.Event()
+
+    def endless():
+        try:
+            while True:
+                yield 1
+        finally:
+            stopped.set()
+
+    async with athreading.pipeline(endless(), double, double, workers=2) as stream:
+        assert await stream.__anext__() == 4
+    assert stopped.wait(1.0)
+    assert all(future.done() for future in stream._thread_futures)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.asyncio
+async def test_pipeline_exit_full_buffer_latency(workers):
+    """test blocked threads are released promptly when exiting with full pipes"""
+    async with athreading.pipeline(
+        itertools.count(), double, double, workers=workers, buffer=1
+    ) as stream:
+        assert await stream.__anext__() == 0
+        await asyncio.sleep(0.1)
+        start = time.perf_counter()
+    assert time.perf_counter() - start < 0.02
+    assert all(future.done() for future in stream._thread_futures)
+
+
+def test_pipeline_invalid():
+    with pytest.raises(ValueError, match="counts"):
+        athreading.pipeline(range(5), double, workers=[1, 2])
+    with pytest.raises(ValueError, match="workers"):
+        athreading.pipeline(range(5), double, workers=0)
+    with pytest.raises(ValueError, match="buffer"):
+        athreading.pipeline(range(5), double, buffer=0)
@@ -0,0 +1,126 @@
+import asyncio
+import os
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+import athreading
+from athreading.processes import (
+    _SHARED_MEMORY_MIN_SIZE,
+    _receive,
+    _release,
+    _share,
+    _SharedBuffer,
+)
+
+LARGE = _SHARED_MEMORY_MIN_SIZE * 2
+
+
+@athreading.call(backend="process")
+def process_square(x: float) -> tuple[int, float]:
+    return os.getpid(), x * x
+
+
+def reverse(data, *, repeat: int = 1):
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return type(data)(bytes(data)[::-1] * repeat)
+    return data[::-1]
+
+
+areverse = athreading.call(reverse, backend="process")
+
+
+@athreading.call(backend="process")
+def process_head(data: bytes, n: int) -> memoryview:
+    return memoryview(data)[:n]
+
+
+@athreading.call(backend="process")
+def process_divide(x: float) -> float:
+    return 1.0 / x
+
+
+@pytest.mark.asyncio
+async def test_process_call():
+    results = await asyncio.gather(*(process_square(x) for x in range(4)))
+    assert [square for _, square in results] == [0, 1, 4, 9]
+    assert all(pid != os.getpid() for pid, _ in results)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"ab" * 10,
+        b"ab" * LARGE,
+        bytearray(b"ab" * LARGE),
+        memoryview(b"ab" * LARGE),
+        memoryview(b"ab" * 10),
+    ],
+    ids=["small", "bytes", "bytearray", "memoryview", "small_memoryview"],
+)
+@pytest.mark.asyncio
+async def test_process_call_buffers(data):
+    result = await areverse(data, repeat=2)
+    assert type(result) is type(data)
+    assert bytes(result) == bytes(data)[::-1] * 2
+
+
+@pytest.mark.asyncio
+async def test_process_call_small_memoryview_result():
+    result = await process_head(b"ab" * LARGE, 10)
+    assert type(result) is memoryview
+    assert bytes(result) == b"ab" * 5
+
+
+@pytest.mark.asyncio
+async def test_process_call_numpy():
+    numpy = pytest.importorskip("numpy")
+    array = numpy.arange(LARGE, dtype=numpy.int32).reshape(2, -1)
+    result = await areverse(array)
+    assert (result == array[::-1]).all()
+
+
+@pytest.mark.asyncio
+async def test_process_call_exception():
+    with pytest.raises(ZeroDivisionError):
+        await process_divide(0)
+
+
+@pytest.mark.asyncio
+async def test_process_call_max_concurrency_and_cache():
+    cache = athreading.CallCache()
+    asquare = athreading.call(backend="process", max_concurrency=1, cache=cache)(
+        process_square.__wrapped__
+    )
+    first, second = await asyncio.gather(asquare(3), asquare(3))
+    assert first == second
+    assert first[1] == 9
+
+
+def test_share_segments() -> None:
+    segments: list[SharedMemory] = []
+    assert _share(b"small", segments) == b"small"
+    shared = _share(b"x" * LARGE, segments)
+    assert isinstance(shared, _SharedBuffer)
+    assert len(segments) == 1
+    assert _receive(shared) == b"x" * LARGE
+    _release(segments)
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=shared.name)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"pool": "process"}, {"cancellable": True}, {"backend": "interpreter"}],
+    ids=["pool", "cancellable", "backend"],
+)
+def test_process_call_invalid(kwargs):
+    kwargs.setdefault("backend", "process")
+    with pytest.raises(ValueError, match="backend"):
+        athreading.call(reverse, **kwargs)
+
+
+def test_configure_process_pool_running():
+    athreading.get_process_pool()
+    with pytest.raises(RuntimeError, match="running"):
+        athreading.configure_process_pool(max_workers=1)
@@ -62,3 +62,59 @@ async def test_send_all(streamcontext, worker_delay, main_delay):
             outputs.append(await stream.asend(v))
 
     assert outputs == [0, 1, 2, 4, 8, 3, 6, 12, 24]
+
+
+def codec(stop: int) -> Generator[int, Optional[int], None]:
+    """
+    Responds to each sent value with its square, stopping after stop responses.
+    """
+    sent = yield -1
+    for _ in range(stop):
+        assert sent is not None
+        sent = yield sent * sent
+
+
+@pytest.mark.parametrize("window", [None, 1, 3, 1000])
+@pytest.mark.asyncio
+async def test_asend_many(window):
+    async with athreading.generate(doubler)(0.0) as stream:
+        outputs = await stream.asend_many([None, 1, None, None], window=window)
+        outputs += await stream.asend_many(iter([None, 3, None]), window=window)
+        outputs.append(await stream.asend(None))
+        assert await stream.asend_many([], window=window) == []
+    assert outputs == [0, 1, 2, 4, 8, 3, 6, 12]
+
+
+@pytest.mark.parametrize("window", [None, 7])
+@pytest.mark.asyncio
+async def test_asend_many_stops(window):
+    async with athreading.generate(codec)(100) as stream:
+        assert await stream.asend(None) == -1
+        squares = await stream.asend_many(range(1000), window=window)
+    assert squares == [i * i for i in range(100)]
+
+
+@pytest.mark.asyncio
+async def test_asend_many_window():
+    async with athreading.generate(codec)(100) as stream:
+        await stream.asend(None)
+
+        def values():
+            for i in range(100):
+                assert len(stream._channel._requests) < 2
+                yield i
+
+        assert await stream.asend_many(values(), window=2) == [
+            i * i for i in range(100)
+        ]
+
+
+@pytest.mark.asyncio
+async def test_asend_many_fallback():
+    stream = athreading.AsyncGeneratorContext.asend_many
+    async with athreading.generate(doubler)(0.0) as generator:
+        assert await stream(generator, [None, 5, None]) == [0, 5, 10]
+        with pytest.raises(ValueError, match="window"):
+            await generator.asend_many([None], window=0)
+        with pytest.raises(ValueError, match="window"):
+            await stream(generator, [None], window=0)